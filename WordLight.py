@@ -1,25 +1,95 @@
+import time
+_IMPORT_STARTED = time.perf_counter()
+
 import subprocess
 import numpy as np
 import soundfile as sf
-from scipy.io import wavfile
 import os
 import json
-import torch
-from whisper_timestamped import load_model, transcribe
 import re
 import sys
 import datetime
 from PIL import Image, ImageDraw, ImageFont
 import io
-import winreg
+import importlib
+import importlib.util
 import traceback
 import tempfile
 import gc
+import argparse
+import math
+import shutil
+import functools
+import inspect
+import hashlib
+import contextlib
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait as futures_wait
+from concurrent.futures.process import BrokenProcessPool
+from collections import OrderedDict, deque, namedtuple
+
+# Startup budget: importing this module (and showing the launch prompt) must
+# stay fast, so heavy libraries are only imported when a stage needs them.
+STARTUP_BUDGET_SECONDS = 1.5
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access, so
+    torch, Whisper, Gradio, Tk and the denoisers cost nothing at startup
+    (and nothing at all in runs that never use them).
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+def module_available(lazy_module):
+    """True if a LazyModule imports cleanly (this imports it on the first call)."""
+    try:
+        lazy_module._load()
+        return True
+    except ImportError:
+        return False
+
+def module_installed(name):
+    """Cheap check that a top-level package is installed, without importing it."""
+    return importlib.util.find_spec(name) is not None
+
+torch = LazyModule("torch")
+whisper_timestamped = LazyModule("whisper_timestamped")
+faster_whisper = LazyModule("faster_whisper")
+wavfile = LazyModule("scipy.io.wavfile")
+scipy_signal = LazyModule("scipy.signal")
+nr = LazyModule("noisereduce")
+voicefixer_lib = LazyModule("voicefixer")
+df_enhance_lib = LazyModule("df.enhance")
+demucs_pretrained = LazyModule("demucs.pretrained")
+demucs_apply = LazyModule("demucs.apply")
+demucs_audio = LazyModule("demucs.audio")
+pyrnnoise = LazyModule("pyrnnoise")
+tk = LazyModule("tkinter")
+ttk = LazyModule("tkinter.ttk")
+tkfont = LazyModule("tkinter.font")
+filedialog = LazyModule("tkinter.filedialog")
+messagebox = LazyModule("tkinter.messagebox")
+colorchooser = LazyModule("tkinter.colorchooser")
+gr = LazyModule("gradio")
+yaml = LazyModule("yaml")
 
 def get_windows_font_map():
-    font_dir = os.path.join(os.environ['WINDIR'], 'Fonts')
     font_map = {}
     try:
+        import winreg
+        font_dir = os.path.join(os.environ['WINDIR'], 'Fonts')
         reg = winreg.ConnectRegistry(None, winreg.HKEY_LOCAL_MACHINE)
         key = winreg.OpenKey(reg, r"SOFTWARE\Microsoft\Windows NT\CurrentVersion\Fonts")
         for i in range(0, winreg.QueryInfoKey(key)[1]):
@@ -35,8 +105,10 @@ def get_windows_font_map():
         print("Font registry read error:", e)
     return font_map
 
-font_name_to_path = get_windows_font_map()
-# FONT_CHOICES = sorted(font_name_to_path.keys())
+@functools.lru_cache(maxsize=1)
+def get_font_map():
+    """Font name -> file path from the Windows registry, read on first use ({} elsewhere)."""
+    return get_windows_font_map() if os.name == "nt" else {}
 
 
 def render_font_preview(fontname, fontsize, color="#000000"):
@@ -150,44 +222,6 @@ Dialogue: 0,0:00:00.00,0:00:04.00,Default,,0,0,0,,{text}
 
 
 
-# --- NOISEREDUCE MOD ---
-import noisereduce as nr
-
-from scipy.signal import butter, lfilter
-
-try:
-    from voicefixer import VoiceFixer
-except ImportError:
-    VoiceFixer = None
-
-try:
-    from df.enhance import enhance as df_enhance, init_df as df_init, load_audio as df_load_audio, save_audio as df_save_audio
-    _DFN_AVAILABLE = True
-except ImportError:
-    _DFN_AVAILABLE = False
-
-# ---- pyrnnoise import and check ----
-try:
-    import pyrnnoise
-    _PYRNNOISE_AVAILABLE = True
-except ImportError:
-    _PYRNNOISE_AVAILABLE = False
-
-try:
-    import tkinter as tk
-except ImportError:
-    import Tkinter as tk
-from tkinter import filedialog, messagebox, BooleanVar, Checkbutton, Button, IntVar, DoubleVar, StringVar
-from tkinter import ttk
-from tkinter import font as tkfont
-from tkinter import colorchooser
-
-try:
-    import gradio as gr
-    _GRADIO_AVAILABLE = True
-except ImportError:
-    _GRADIO_AVAILABLE = False
-
 dt = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
 
 DEMUC_MODELS = [
@@ -206,10 +240,68 @@ DEMUC_MODELS = [
 
 VOICEFIXER_MODES = ["0", "1", "2", "all"]
 
+# Demucs speed/quality presets. shifts = number of randomly shifted passes
+# averaged together (the big cost), overlap = fraction shared between split
+# windows, segment = window length in seconds (None = model default),
+# jobs = CPU worker threads (None = all cores when running on CPU).
+DEMUCS_PRESETS = {
+    "fast":     {"shifts": 1,  "overlap": 0.1,  "segment": None, "jobs": None},
+    "balanced": {"shifts": 5,  "overlap": 0.25, "segment": None, "jobs": None},
+    "best":     {"shifts": 20, "overlap": 0.25, "segment": None, "jobs": 0},
+}
+DEMUCS_DEFAULT_PRESET = "best"  # what WordLight always used (--shifts 20)
+
+# DeepFilterNet chunking: long inputs are enhanced in overlapping blocks that
+# are crossfaded together, so memory stays bounded and chunk edges don't click.
+DFN_CHUNK_SECONDS = 300
+DFN_SAMPLE_RATE = 48000     # every released DeepFilterNet model runs at 48 kHz
+DFN_OVERLAP_SECONDS = 1.0
+DFN_IDLE_TIMEOUT = 15 * 60  # seconds before the shared DeepFilterNet engine is released
+DEMUCS_IDLE_TIMEOUT = 15 * 60  # seconds before the warm Demucs model is released
+DFN_WORKERS = 1               # >1 enhances chunks in parallel worker processes
+DFN_THREADS_PER_WORKER = 0    # torch threads per worker; 0 = split the CPU cores evenly
+STREAM_STAGE_MIN_SECONDS = 20 * 60  # longer audio goes through DeepFilterNet block by block on disk
+
+# Segmented caption burn: >1 splits the video at keyframes and burns the
+# pieces in parallel ffmpeg workers (mind NVENC's concurrent-session limit).
+BURN_WORKERS = 1
+BURN_MIN_SEGMENT_SECONDS = 20  # don't split into pieces shorter than this
+
+# Scheduling: how many web-UI jobs run at once, and how many of them may be
+# inside a GPU-heavy stage (Whisper, Demucs, VoiceFixer), a CPU-heavy stage
+# (DeepFilterNet, noisereduce, ...) or a video encode at the same time. A
+# parallel caption burn occupies min(BURN_WORKERS, encode) slots as one stage.
+GRADIO_CONCURRENT_JOBS = 2
+GRADIO_QUEUE_SIZE = 32
+STAGE_LIMITS = {"gpu": 1, "cpu": 2, "encode": 1}
+BATCH_JOBS = 3  # videos in flight at once when several files are processed without merging
+
+# Whisper model pool: keep recently used models warm between jobs.
+WHISPER_POOL_MAX_MODELS = 1          # how many (model_size, device) entries may stay loaded
+WHISPER_POOL_IDLE_TIMEOUT = 15 * 60  # seconds before an unused model is unloaded
+WHISPER_POOL_MEMORY_BUDGET_MB = None # optional cap on the summed weight size of pooled models
+
+# Persistent caches (under ./Cache next to the script). 0 disables a cache.
+TRANSCRIPT_CACHE_MAX_MB = 256   # word lists from transcribe_video
+TRANSCRIPT_CACHE_VERSION = 1    # bump when the word-list format changes
+STAGE_CACHE_MAX_MB = 4096       # Demucs/DeepFilterNet/VoiceFixer outputs (.flac)
+STAGE_CACHE_VERSION = 1         # bump when a stage's processing code changes
+
+# Resumable jobs: a job that fails keeps its workspace under Cache/jobs, and a
+# rerun of the same input video resumes from the first stage that didn't finish.
+JOB_RESUME_ENABLED = True
+JOB_RESUME_MAX_AGE_DAYS = 7     # kept workspaces older than this are deleted
+JOB_MANIFEST_VERSION = 1        # bump when main()'s stages or artifacts change
+
 def get_outputs_folder():
     folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Outputs")
     os.makedirs(folder, exist_ok=True)
     return folder
+
+def get_cache_folder(name):
+    folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Cache", name)
+    os.makedirs(folder, exist_ok=True)
+    return folder
     
 def free_vram(tag=""):
     """
@@ -217,7 +309,8 @@ def free_vram(tag=""):
     Safe to call on CPU-only systems.
     """
     try:
-        if torch.cuda.is_available():
+        # Nothing to release if no stage has imported torch yet
+        if "torch" in sys.modules and torch.cuda.is_available():
             # Clear PyTorch's caching allocator and collect inter-process handles
             torch.cuda.empty_cache()
             torch.cuda.ipc_collect()
@@ -228,7 +321,341 @@ def free_vram(tag=""):
         gc.collect()
     except Exception as e:
         print(f"[free_vram] gc.collect error ({tag}): {e}")
-    
+
+
+def estimate_model_bytes(model):
+    """Best-effort size of a model's weights (parameters + buffers) in bytes."""
+    total = 0
+    try:
+        for t in list(model.parameters()) + list(model.buffers()):
+            total += t.numel() * t.element_size()
+    except Exception:
+        pass
+    return total
+
+
+_MODEL_POOLS = []
+
+
+class ModelPool:
+    """
+    Process-wide registry of loaded models keyed by any hashable key
+    (e.g. (model_size, device)). Models stay warm between jobs; the least
+    recently used idle entry is unloaded when the pool holds more than
+    `max_models`, exceeds `memory_budget_mb`, or sits idle for longer than
+    `idle_timeout` seconds. Callers borrow a model with `lease()`, and a
+    leased model is never unloaded. Thread-safe, so the Gradio server and
+    batch runs can share it.
+    """
+
+    def __init__(self, name, max_models=1, idle_timeout=None, memory_budget_mb=None):
+        self.name = name
+        self.max_models = max_models
+        self.idle_timeout = idle_timeout
+        self.memory_budget_mb = memory_budget_mb
+        self._entries = OrderedDict()  # key -> {"model", "bytes", "last_used", "refs", "evict"}
+        self._loading = {}             # key -> Event set when its in-flight load finishes
+        self._lock = threading.RLock()
+        self._reaper = None
+        _MODEL_POOLS.append(self)
+
+    @contextlib.contextmanager
+    def lease(self, key, loader):
+        """
+        Borrow the pooled model for `key` for the duration of the with-block,
+        calling `loader()` on a miss. Loading happens outside the pool lock;
+        concurrent leases of the same key wait for that one load.
+        """
+        model = self._acquire(key, loader)
+        try:
+            yield model
+        finally:
+            self._release(key)
+
+    def _acquire(self, key, loader):
+        self._evict_idle()
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    entry["refs"] += 1
+                    entry["last_used"] = time.monotonic()
+                    print(f"[{self.name}] Reusing warm model {key}")
+                    return entry["model"]
+                loading = self._loading.get(key)
+                if loading is None:
+                    loading = self._loading[key] = threading.Event()
+                    break
+            # Someone else is loading this key; take their model when it lands
+            loading.wait()
+
+        print(f"[{self.name}] Loading model {key}...")
+        try:
+            model = loader()
+        except BaseException:
+            with self._lock:
+                del self._loading[key]
+            loading.set()
+            raise
+        with self._lock:
+            self._entries[key] = {
+                "model": model,
+                "bytes": estimate_model_bytes(model),
+                "last_used": time.monotonic(),
+                "refs": 1,
+                "evict": False,
+            }
+            del self._loading[key]
+            victims = self._over_limit_keys()
+        loading.set()
+        for victim in victims:
+            self.evict(victim)
+        self._start_reaper()
+        return model
+
+    def _release(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry["refs"] -= 1
+            entry["last_used"] = time.monotonic()
+            drop = entry["refs"] == 0 and entry["evict"]
+            victims = [] if drop else self._over_limit_keys()
+        for victim in ([key] if drop else victims):
+            self.evict(victim)
+
+    def evict(self, key):
+        """Unload `key` now, or as soon as its last lease ends."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            if entry["refs"] > 0:
+                entry["evict"] = True
+                return
+            del self._entries[key]
+        print(f"[{self.name}] Unloading model {key}")
+        del entry
+        free_vram(tag=f"{self.name}_evict")
+
+    def clear(self):
+        """Unload every pooled model (explicit shutdown); leased ones go when released."""
+        with self._lock:
+            keys = list(self._entries.keys())
+        for key in keys:
+            self.evict(key)
+
+    def _over_limit_keys(self):
+        # LRU idle entries to drop so the pool fits max_models / memory_budget_mb.
+        # Leased models don't count as candidates, so the pool can briefly run over.
+        budget = self.memory_budget_mb * 1024 * 1024 if self.memory_budget_mb else None
+        count = len(self._entries)
+        total = sum(e["bytes"] for e in self._entries.values())
+        victims = []
+        for key, entry in self._entries.items():
+            if count <= 1:
+                break
+            over_count = self.max_models is not None and count > self.max_models
+            over_budget = budget is not None and total > budget
+            if not (over_count or over_budget):
+                break
+            if entry["refs"] > 0:
+                continue
+            victims.append(key)
+            count -= 1
+            total -= entry["bytes"]
+        return victims
+
+    def _evict_idle(self):
+        if not self.idle_timeout:
+            return
+        now = time.monotonic()
+        with self._lock:
+            stale = [k for k, e in self._entries.items()
+                     if e["refs"] == 0 and now - e["last_used"] > self.idle_timeout]
+        for key in stale:
+            self.evict(key)
+
+    def _start_reaper(self):
+        # A daemon thread enforces the idle timeout even when no new jobs arrive.
+        if not self.idle_timeout or (self._reaper is not None and self._reaper.is_alive()):
+            return
+        self._reaper = threading.Thread(target=self._reap_loop, name=f"{self.name}-reaper", daemon=True)
+        self._reaper.start()
+
+    def _reap_loop(self):
+        interval = max(1.0, min(self.idle_timeout / 2.0, 60.0))
+        while True:
+            time.sleep(interval)
+            self._evict_idle()
+            with self._lock:
+                if not self._entries:
+                    self._reaper = None
+                    return
+
+
+WHISPER_POOL = ModelPool(
+    "WhisperPool",
+    max_models=WHISPER_POOL_MAX_MODELS,
+    idle_timeout=WHISPER_POOL_IDLE_TIMEOUT,
+    memory_budget_mb=WHISPER_POOL_MEMORY_BUDGET_MB,
+)
+
+
+def lease_whisper_model(model_size, device):
+    return WHISPER_POOL.lease((model_size, device), lambda: whisper_timestamped.load_model(model_size, device=device))
+
+
+def shutdown_model_pools():
+    """Explicitly unload every pooled model (Whisper, DeepFilterNet, ...) and the DeepFilterNet workers."""
+    for pool in _MODEL_POOLS:
+        pool.clear()
+    shutdown_dfn_process_pools()
+
+
+def cache_key(*parts):
+    """Stable sha256 hex digest of JSON-serialisable key parts."""
+    blob = json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+def hash_audio(audio):
+    """
+    sha256 of an audio buffer's shape, dtype and samples. A WAV path hashes
+    like its float32 samples would, read a block at a time.
+    """
+    if isinstance(audio, str):
+        with sf.SoundFile(audio) as src:
+            shape = (src.frames,) if src.channels == 1 else (src.frames, src.channels)
+            h = hashlib.sha256(f"{shape}|float32".encode("utf-8"))
+            for block in src.blocks(1 << 20, dtype="float32"):
+                h.update(memoryview(np.ascontiguousarray(block)).cast("B"))
+        return h.hexdigest()
+    data = np.ascontiguousarray(audio)
+    h = hashlib.sha256(f"{data.shape}|{data.dtype}".encode("utf-8"))
+    h.update(memoryview(data).cast("B"))
+    return h.hexdigest()
+
+class DiskCache:
+    """
+    Size-bounded on-disk artifact store. Each entry is one file named by its
+    key inside Cache/<subfolder>; `reader(f)` / `writer(f, value)` handle the
+    (binary) file format. A hit refreshes the file's mtime, and once the
+    folder grows past `max_mb` the least recently used files are deleted.
+    Entries bigger than `max_entry_fraction` of the quota are not kept (they
+    would only evict everything else); `estimate_size(value)` lets store()
+    skip those before writing anything. Writes go through a temp file +
+    os.replace, so concurrent jobs never see a half-written entry.
+    """
+
+    def __init__(self, name, subfolder, max_mb, suffix, reader, writer,
+                 max_entry_fraction=0.5, estimate_size=None):
+        self.name = name
+        self.subfolder = subfolder
+        self.max_mb = max_mb
+        self.suffix = suffix
+        self.reader = reader
+        self.writer = writer
+        self.max_entry_fraction = max_entry_fraction
+        self.estimate_size = estimate_size
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return bool(self.max_mb)
+
+    def _path(self, key):
+        return os.path.join(get_cache_folder(self.subfolder), key + self.suffix)
+
+    def load(self, key):
+        """Return the cached value for `key`, or None on a miss."""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = self.reader(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"⚠️ [{self.name}] Dropping unreadable entry {os.path.basename(path)}: {e}")
+            with contextlib.suppress(OSError):
+                os.remove(path)
+            return None
+        with contextlib.suppress(OSError):
+            os.utime(path)  # mark as recently used
+        return value
+
+    @property
+    def max_entry_bytes(self):
+        return self.max_mb * 1024 * 1024 * self.max_entry_fraction
+
+    def _skip_oversized(self, size):
+        print(f"[{self.name}] Not caching a {size / 1024 / 1024:.0f} MB entry "
+              f"(limit {self.max_entry_bytes / 1024 / 1024:.0f} MB per entry)")
+
+    def store(self, key, value):
+        if not self.enabled:
+            return
+        if self.estimate_size is not None:
+            size = self.estimate_size(value)
+            if size > self.max_entry_bytes:
+                self._skip_oversized(size)
+                return
+        path = self._path(key)
+        fd, tmp_path = tempfile.mkstemp(prefix=key[:16] + "_", suffix=".tmp", dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                self.writer(f, value)
+            size = os.path.getsize(tmp_path)
+            if size > self.max_entry_bytes:
+                os.remove(tmp_path)
+                self._skip_oversized(size)
+                return
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"⚠️ [{self.name}] Could not write cache entry: {e}")
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            return
+        self._enforce_quota()
+
+    def _enforce_quota(self):
+        folder = get_cache_folder(self.subfolder)
+        budget = self.max_mb * 1024 * 1024
+        with self._lock:
+            entries = []
+            for name in os.listdir(folder):
+                if not name.endswith(self.suffix):
+                    continue
+                try:
+                    st = os.stat(os.path.join(folder, name))
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, name))
+            total = sum(size for _, size, _ in entries)
+            for _, size, name in sorted(entries):
+                if total <= budget:
+                    break
+                with contextlib.suppress(OSError):
+                    os.remove(os.path.join(folder, name))
+                    total -= size
+                    print(f"[{self.name}] Evicted {name}")
+
+def package_version(dist):
+    """Installed version of a distribution, or 'unknown' (used in cache keys)."""
+    try:
+        from importlib.metadata import version
+        return version(dist)
+    except Exception:
+        return "unknown"
+
+def _read_json(f):
+    return json.loads(f.read().decode("utf-8"))
+
+def _write_json(f, value):
+    f.write(json.dumps(value).encode("utf-8"))
 
 def timestamped_filename(basename, ext):
     dt = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -239,6 +666,239 @@ def list_output_files():
     return [os.path.join(outputs_dir, f) for f in os.listdir(outputs_dir)
             if os.path.isfile(os.path.join(outputs_dir, f))]
 
+@contextlib.contextmanager
+def job_workspace(prefix="wordlight_job_", dir=None):
+    """
+    Private scratch directory for one pipeline run. Every intermediate file
+    goes in here, so concurrent jobs never share filenames, and the whole
+    directory is removed on exit even if the job raised.
+    """
+    work_dir = tempfile.mkdtemp(prefix=prefix, dir=dir)
+    try:
+        yield work_dir
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+def file_fingerprint(path, sample_bytes=4 << 20):
+    """
+    Size plus a sha256 of the first, middle and last `sample_bytes` of a
+    file. Every copy of a file gets the same fingerprint wherever it lives
+    (a Gradio upload, a re-merged video), and it stays cheap for multi-GB
+    inputs because only those samples are read.
+    """
+    size = os.path.getsize(path)
+    h = hashlib.sha256(str(size).encode("utf-8"))
+    with open(path, "rb") as f:
+        for offset in sorted({0, max(0, size // 2 - sample_bytes // 2), max(0, size - sample_bytes)}):
+            f.seek(offset)
+            h.update(f.read(sample_bytes))
+    return h.hexdigest()
+
+def resume_key(stage, parent, **params):
+    """
+    Key of one job stage: its name, the key of the stage it consumes and the
+    parameters that shape its output. Changing a setting therefore also
+    invalidates every stage downstream of it.
+    """
+    return cache_key(JOB_MANIFEST_VERSION, stage, parent, params)
+
+class JobManifest:
+    """
+    manifest.json inside a job workspace: for every stage that finished, its
+    resume_key() and the workspace files it produced. A rerun asks
+    completed(stage, key) and skips the stage when the key still matches and
+    the files are still there. Records are written atomically and may come
+    from the transcription thread while the main thread encodes.
+    """
+
+    def __init__(self, work_dir):
+        self.work_dir = work_dir
+        self.path = os.path.join(work_dir, "manifest.json")
+        self._lock = threading.Lock()
+        self.stages = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.stages = json.load(f).get("stages", {})
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Ignoring unreadable job manifest {self.path}: {e}")
+
+    def lookup(self, stage, key):
+        """The stage's record if it completed with `key` and its artifacts exist, else None."""
+        with self._lock:
+            entry = self.stages.get(stage)
+        if not entry or entry.get("key") != key:
+            return None
+        if not all(os.path.exists(os.path.join(self.work_dir, a)) for a in entry.get("artifacts", [])):
+            return None
+        return entry
+
+    def completed(self, stage, key):
+        if self.lookup(stage, key) is None:
+            return False
+        print(f"[Resume] {stage}: reusing the output of an earlier run")
+        return True
+
+    def data(self, stage):
+        with self._lock:
+            return self.stages[stage].get("data", {})
+
+    def record(self, stage, key, artifacts=(), **data):
+        with self._lock:
+            self.stages[stage] = {
+                "key": key,
+                "artifacts": [os.path.basename(a) for a in artifacts],
+                "data": data,
+                "finished": datetime.datetime.now().isoformat(timespec="seconds"),
+            }
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": JOB_MANIFEST_VERSION, "stages": self.stages}, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+def lock_workspace(work_dir):
+    """
+    Take an exclusive, non-blocking OS lock on work_dir/.lock. Returns the
+    open handle, or None if another job (in this or any other process)
+    holds it. The OS drops the lock when the handle closes or the process
+    dies, so a crash never leaves a stale lock behind.
+    """
+    handle = open(os.path.join(work_dir, ".lock"), "a+b")
+    try:
+        if os.name == "nt":
+            import msvcrt
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return None
+    return handle
+
+def unlock_workspace(handle):
+    if os.name == "nt":
+        import msvcrt
+        try:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass
+    handle.close()
+
+def prune_job_workspaces(root, max_age_days=JOB_RESUME_MAX_AGE_DAYS):
+    """Delete kept job workspaces nobody has touched for `max_age_days` (skipping locked ones)."""
+    cutoff = time.time() - max_age_days * 86400
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        try:
+            if not os.path.isdir(path) or os.path.getmtime(path) >= cutoff:
+                continue
+            handle = lock_workspace(path)
+        except OSError:
+            continue
+        if handle is None:
+            continue  # a job is using it right now
+        unlock_workspace(handle)
+        shutil.rmtree(path, ignore_errors=True)
+
+def claim_resumable_workspace(input_video):
+    """
+    (Cache/jobs/<key>, lock handle) for `input_video`, keyed by the file's
+    content (file_fingerprint), or (None, None) when resuming is off, the input isn't a local
+    file, or another job - in this process or another one, e.g. the Gradio
+    server next to a --batch run - holds the workspace's lock.
+    """
+    if not JOB_RESUME_ENABLED or not input_video or not os.path.isfile(input_video):
+        return None, None
+    root = get_cache_folder("jobs")
+    prune_job_workspaces(root)
+    work_dir = os.path.join(root, cache_key("job", file_fingerprint(input_video))[:16])
+    os.makedirs(work_dir, exist_ok=True)
+    handle = lock_workspace(work_dir)
+    if handle is None:
+        print(f"[Resume] {input_video} is already being processed; using a fresh workspace.")
+        return None, None
+    os.utime(work_dir)
+    if os.path.exists(os.path.join(work_dir, "manifest.json")):
+        print(f"[Resume] Found an unfinished run of {input_video} in {work_dir}")
+    return work_dir, handle
+
+def release_resumable_workspace(work_dir, handle, keep):
+    unlock_workspace(handle)
+    if keep:
+        print(f"⚠️ Job failed; intermediates kept in {work_dir}. Run the same video again to resume.")
+    else:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+def run_in_job_workspace(func):
+    """
+    Decorator: call `func` with a job workspace as `work_dir`, unless the
+    caller passes its own work_dir (and then owns its cleanup). The workspace
+    is the input video's resumable one when available, kept for a rerun only
+    if `func` raises (a crash, an ffmpeg/auto-editor error, a cancel) and
+    deleted whenever it returns, including the None of a job that ended with
+    nothing to render; otherwise a throwaway job_workspace().
+    """
+    @functools.wraps(func)
+    def wrapper(*args, work_dir=None, **kwargs):
+        if work_dir is not None:
+            return func(*args, work_dir=work_dir, **kwargs)
+        job_dir, lock = claim_resumable_workspace(kwargs.get("input_video", args[0] if args else None))
+        if job_dir is None:
+            with job_workspace() as job_dir:
+                return func(*args, work_dir=job_dir, **kwargs)
+        try:
+            result = func(*args, work_dir=job_dir, **kwargs)
+        except BaseException:
+            release_resumable_workspace(job_dir, lock, keep=True)
+            raise
+        release_resumable_workspace(job_dir, lock, keep=False)
+        return result
+    return wrapper
+
+class JobCancelled(Exception):
+    """Raised at the next stage boundary after a job was cancelled."""
+
+def check_cancelled(cancel_event):
+    if cancel_event is not None and cancel_event.is_set():
+        raise JobCancelled("Job cancelled")
+
+_STAGE_IN_USE = {}
+_STAGE_LOCK = threading.Lock()
+_STAGE_FREED = threading.Condition(_STAGE_LOCK)
+
+def configure_stage_limits(**limits):
+    """Set how many jobs may be inside each kind of stage at once, e.g. gpu=1, cpu=4."""
+    with _STAGE_LOCK:
+        for kind, count in limits.items():
+            if count is None:
+                continue
+            STAGE_LIMITS[kind] = max(1, int(count))
+        _STAGE_FREED.notify_all()
+
+@contextlib.contextmanager
+def stage_slot(kind, count=1):
+    """
+    Hold `count` of STAGE_LIMITS[kind] slots for the duration of a stage
+    (blocks until they are all free). `count` is capped at the limit, and
+    the slots are taken together so two multi-slot stages can't deadlock.
+    """
+    with _STAGE_LOCK:
+        count = max(1, min(int(count), STAGE_LIMITS.get(kind, 1)))
+        is_free = lambda: _STAGE_IN_USE.get(kind, 0) + count <= STAGE_LIMITS.get(kind, 1)
+        if not is_free():
+            print(f"[Scheduler] Waiting for a free {kind} slot...")
+            _STAGE_FREED.wait_for(is_free)
+        _STAGE_IN_USE[kind] = _STAGE_IN_USE.get(kind, 0) + count
+    try:
+        yield
+    finally:
+        with _STAGE_LOCK:
+            _STAGE_IN_USE[kind] -= count
+            _STAGE_FREED.notify_all()
+
 def select_files_and_options():
     root = tk.Tk()
     root.withdraw()
@@ -261,15 +921,18 @@ def select_files_and_options():
     # Additional UI for merge/concat option
     opt_root = tk.Tk()
     opt_root.title("Processing Options")
-    bypass_auto_var = BooleanVar(value=False)
-    edit_transcript_var = BooleanVar(value=False)
-    use_demucs_var = BooleanVar(value=True)
-    use_noisereduce_var = BooleanVar(value=False)
-    use_lowpass_var = BooleanVar(value=False)
-    use_voicefixer_var = BooleanVar(value=False)
-    use_deepfilternet_var = BooleanVar(value=True)
-    use_pyrnnoise_var = BooleanVar(value=False)
-    merge_videos_var = BooleanVar(value=True if len(video_files) > 1 else False)
+    bypass_auto_var = tk.BooleanVar(value=False)
+    edit_transcript_var = tk.BooleanVar(value=False)
+    use_demucs_var = tk.BooleanVar(value=True)
+    use_noisereduce_var = tk.BooleanVar(value=False)
+    use_lowpass_var = tk.BooleanVar(value=False)
+    use_voicefixer_var = tk.BooleanVar(value=False)
+    use_deepfilternet_var = tk.BooleanVar(value=True)
+    use_pyrnnoise_var = tk.BooleanVar(value=False)
+    merge_videos_var = tk.BooleanVar(value=True if len(video_files) > 1 else False)
+    single_pass_var = tk.BooleanVar(value=False)
+    highlight_mode_var = tk.StringVar(value="layers")
+    silence_backend_var = tk.StringVar(value="native")
 
     fonts = sorted(set(tkfont.families(opt_root)))
     default_font = "Arial" if "Arial" in fonts else fonts[0]
@@ -286,9 +949,9 @@ def select_files_and_options():
     font_menu.pack(anchor="w", pady=(0, 2))
 
     # --- ASS subtitle extra style variables ---
-    secondary_color_var = StringVar(value="#FF0000")
-    outline_color_var = StringVar(value="#000000")
-    back_color_var = StringVar(value="#000000")
+    secondary_color_var = tk.StringVar(value="#FF0000")
+    outline_color_var = tk.StringVar(value="#000000")
+    back_color_var = tk.StringVar(value="#000000")
     def pick_secondary_color():
         color = colorchooser.askcolor(title="Select Secondary Color", initialcolor=secondary_color_var.get())
         if color[1]:
@@ -318,20 +981,20 @@ def select_files_and_options():
     secondary_color_var.trace_add("write", update_secondary_btn)
     outline_color_var.trace_add("write", update_outline_btn)
     back_color_var.trace_add("write", update_back_btn)    
-    bold_var = IntVar(value=0)
-    italic_var = IntVar(value=0)
-    underline_var = IntVar(value=0)
-    strikeout_var = IntVar(value=0)
-    scale_x_var = IntVar(value=100)
-    scale_y_var = IntVar(value=100)
-    spacing_var = IntVar(value=0)
-    angle_var = IntVar(value=0)
-    border_style_var = IntVar(value=1)
-    outline_var = IntVar(value=3)
-    shadow_var = IntVar(value=1)
-    alignment_var = IntVar(value=2)
-    marginl_var = IntVar(value=10)
-    marginr_var = IntVar(value=10)
+    bold_var = tk.IntVar(value=0)
+    italic_var = tk.IntVar(value=0)
+    underline_var = tk.IntVar(value=0)
+    strikeout_var = tk.IntVar(value=0)
+    scale_x_var = tk.IntVar(value=100)
+    scale_y_var = tk.IntVar(value=100)
+    spacing_var = tk.IntVar(value=0)
+    angle_var = tk.IntVar(value=0)
+    border_style_var = tk.IntVar(value=1)
+    outline_var = tk.IntVar(value=3)
+    shadow_var = tk.IntVar(value=1)
+    alignment_var = tk.IntVar(value=2)
+    marginl_var = tk.IntVar(value=10)
+    marginr_var = tk.IntVar(value=10)
 
     extra_style_frame = tk.LabelFrame(left_frame, text="Advanced Subtitle Style Options")
     extra_style_frame.pack(anchor="w", fill="x", pady=(12,8))
@@ -392,73 +1055,49 @@ def select_files_and_options():
         duration = get_video_duration(video_path)
         preview_time = 0 if not duration or duration < 2 else min(duration * 0.5, duration - 0.2)
 
-        outputs_dir = get_outputs_folder()
-        preview_img_path = os.path.join(outputs_dir, "tk_ffmpeg_preview.jpg")
-        preview_ass_path = os.path.join(outputs_dir, "tk_preview_caption.ass")
-
-        # Generate preview caption .ass file using the same style as your video
-        width, height = get_video_resolution(video_path)
-        fontname = font_var.get()
-        fontsize = int(font_size_var.get())
-        marginv = int(marginv_var.get())
-        color = primary_color_var.get() or "#FFFFFF"
-        highlight_color = highlight_color_var.get() or "#FFFF00"
-        primary_color_ass = hex_to_ass_bgr(color)
-        highlight_color_ass = hex_to_ass_bgr(highlight_color)
-
-        # Use a minimal sample with highlight
-        words = [
-            {'start': 0.0, 'end': 2.0, 'word': 'This'},
-            {'start': 2.0, 'end': 3.0, 'word': 'is'},
-            {'start': 3.0, 'end': 4.0, 'word': 'a'},
-            {'start': 4.0, 'end': 6.0, 'word': 'preview!'},
-        ]
-        make_ass_subtitle_stable(
-            words, preview_ass_path, video_path,
-            fontsize=fontsize, fontname=fontname, marginv=marginv,
-            max_sentences=1, max_words=10,
-            primary_color=primary_color_ass,
-            highlight_color=highlight_color_ass,
-            secondary_color=hex_to_ass_bgr(secondary_color_var.get()),
-            outline_color=hex_to_ass_bgr(outline_color_var.get()),
-            back_color=hex_to_ass_bgr(back_color_var.get()),
-            bold=bold_var.get(), italic=italic_var.get(), underline=underline_var.get(), strikeout=strikeout_var.get(),
-            scale_x=scale_x_var.get(), scale_y=scale_y_var.get(), spacing=spacing_var.get(), angle=angle_var.get(),
-            border_style=border_style_var.get(), outline=outline_var.get(), shadow=shadow_var.get(), alignment=alignment_var.get(),
-            marginl=marginl_var.get(), marginr=marginr_var.get()
-        )
+        # Per-preview temp folder: nothing shared between previews, and the
+        # .ass/.jpg are removed even when ffmpeg fails
+        with tempfile.TemporaryDirectory(prefix="wordlight_preview_") as tmpdir:
+            # Generate preview caption .ass file using the same style as your video
+            fontname = font_var.get()
+            fontsize = int(font_size_var.get())
+            marginv = int(marginv_var.get())
+            color = primary_color_var.get() or "#FFFFFF"
+            highlight_color = highlight_color_var.get() or "#FFFF00"
+            primary_color_ass = hex_to_ass_bgr(color)
+            highlight_color_ass = hex_to_ass_bgr(highlight_color)
+
+            # Use a minimal sample with highlight
+            words = [
+                {'start': 0.0, 'end': 2.0, 'word': 'This'},
+                {'start': 2.0, 'end': 3.0, 'word': 'is'},
+                {'start': 3.0, 'end': 4.0, 'word': 'a'},
+                {'start': 4.0, 'end': 6.0, 'word': 'preview!'},
+            ]
+            make_ass_subtitle_stable(
+                words, os.path.join(tmpdir, "preview.ass"), video_path,
+                fontsize=fontsize, fontname=fontname, marginv=marginv,
+                max_sentences=1, max_words=10,
+                primary_color=primary_color_ass,
+                highlight_color=highlight_color_ass,
+                secondary_color=hex_to_ass_bgr(secondary_color_var.get()),
+                outline_color=hex_to_ass_bgr(outline_color_var.get()),
+                back_color=hex_to_ass_bgr(back_color_var.get()),
+                bold=bold_var.get(), italic=italic_var.get(), underline=underline_var.get(), strikeout=strikeout_var.get(),
+                scale_x=scale_x_var.get(), scale_y=scale_y_var.get(), spacing=spacing_var.get(), angle=angle_var.get(),
+                border_style=border_style_var.get(), outline=outline_var.get(), shadow=shadow_var.get(), alignment=alignment_var.get(),
+                marginl=marginl_var.get(), marginr=marginr_var.get()
+            )
 
-        # Burn the .ass onto a single frame, using the **exact same logic as video**
-        # NO path escaping, NO quotes, just the plain path
-        ass_path = os.path.abspath(preview_ass_path)
-        # Escape for ffmpeg ASS filter on Windows:
-        ass_path_escaped = ass_path.replace("\\", "\\\\").replace(":", "\\:")
-        ass_filter = f"ass='{ass_path_escaped}'"
-
-        print("ASS path for ffmpeg:", ass_path_escaped)
-        print("Does .ass file exist?", os.path.exists(ass_path), ass_path_escaped)
-
-        cmd = [
-            "ffmpeg",
-            "-y",
-            "-ss", str(preview_time),
-            "-i", video_path,
-            "-frames:v", "1",
-            "-vf", ass_filter,
-            preview_img_path
-        ]
-        print("Running ffmpeg preview command:", " ".join(cmd))
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode != 0 or not os.path.exists(preview_img_path):
-            print("FFmpeg preview failed:", result.stderr)
-            tk.messagebox.showerror("Preview Error", f"Could not generate preview image with ffmpeg.\n\nFFmpeg error:\n{result.stderr}")
+            img, ffmpeg_error = render_preview_frame(video_path, preview_time, os.path.join(tmpdir, "preview.ass"))
+        if img is None:
+            messagebox.showerror("Preview Error", f"Could not generate preview image with ffmpeg.\n\nFFmpeg error:\n{ffmpeg_error}")
             return
 
         # Display image in a popup
         preview_window = tk.Toplevel(opt_root)
         preview_window.title("Caption Style Preview")
-        from PIL import Image, ImageTk
-        img = Image.open(preview_img_path)
+        from PIL import ImageTk
         preview_img = ImageTk.PhotoImage(img)
         img_label = tk.Label(preview_window, image=preview_img)
         img_label.image = preview_img  # keep reference
@@ -469,8 +1108,8 @@ def select_files_and_options():
     preview_btn.pack(anchor="w", pady=(4, 12))
 
 
-    primary_color_var = StringVar(value="#FFFFFF")
-    highlight_color_var = StringVar(value="#FFFF00")
+    primary_color_var = tk.StringVar(value="#FFFFFF")
+    highlight_color_var = tk.StringVar(value="#FFFF00")
 
     def pick_primary_color():
         color = colorchooser.askcolor(title="Select Subtitle Color", initialcolor=primary_color_var.get())
@@ -511,7 +1150,7 @@ def select_files_and_options():
     primary_color_var.trace_add("write", update_primary_btn)
     highlight_color_var.trace_add("write", update_highlight_btn)
 
-    font_size_var = IntVar(value=36)
+    font_size_var = tk.IntVar(value=36)
     font_preview_label = tk.Label(left_frame, text="Sample Subtitle Text", anchor="w")
     font_preview_label.pack(anchor="w", pady=(0, 8))
 
@@ -534,46 +1173,56 @@ def select_files_and_options():
 
     marginv_label = tk.Label(left_frame, text="Caption Vertical Margin (higher value = higher up):")
     marginv_label.pack(anchor="w", pady=(0, 2))
-    marginv_var = IntVar(value=75)
+    marginv_var = tk.IntVar(value=75)
     marginv_slider = tk.Scale(left_frame, from_=0, to=400, orient="horizontal", variable=marginv_var)
     marginv_slider.pack(anchor="w", pady=(0, 8))
 
     threshold_label = tk.Label(left_frame, text="Auto-Editor Silence Threshold (0.01 to 0.20):")
     threshold_label.pack(anchor="w", pady=(0, 2))
-    threshold_var = DoubleVar(value=0.04)
+    threshold_var = tk.DoubleVar(value=0.04)
     threshold_slider = tk.Scale(left_frame, from_=0.01, to=0.20, resolution=0.01, orient="horizontal", variable=threshold_var)
     threshold_slider.pack(anchor="w", pady=(0, 8))
 
     margin_label = tk.Label(left_frame, text="Auto-Editor Margin (seconds, 0.1 to 2.0):")
     margin_label.pack(anchor="w", pady=(0, 2))
-    margin_var = DoubleVar(value=0.5)
+    margin_var = tk.DoubleVar(value=0.5)
     margin_slider = tk.Scale(left_frame, from_=0.1, to=2.0, resolution=0.1, orient="horizontal", variable=margin_var)
     margin_slider.pack(anchor="w", pady=(0, 8))
 
     max_sentences_label = tk.Label(left_frame, text="Max Sentences per Subtitle:")
     max_sentences_label.pack(anchor="w", pady=(8, 2))
-    max_sentences_var = IntVar(value=1)
+    max_sentences_var = tk.IntVar(value=1)
     max_sentences_spin = tk.Spinbox(left_frame, from_=1, to=5, increment=1, textvariable=max_sentences_var, width=5)
     max_sentences_spin.pack(anchor="w", pady=(0, 8))
 
     max_words_label = tk.Label(left_frame, text="Max Words per Subtitle:")
     max_words_label.pack(anchor="w", pady=(0, 2))
-    max_words_var = IntVar(value=5)
+    max_words_var = tk.IntVar(value=5)
     max_words_spin = tk.Spinbox(left_frame, from_=3, to=25, increment=1, textvariable=max_words_var, width=5)
     max_words_spin.pack(anchor="w", pady=(0, 8))
 
-    Checkbutton(left_frame, text="Bypass Auto-Editor (skip silence removal)", variable=bypass_auto_var).pack(anchor="w", pady=(0, 2))
-    Checkbutton(left_frame, text="Edit transcript before creating subtitles", variable=edit_transcript_var).pack(anchor="w", pady=(0, 8))
-    Checkbutton(left_frame, text="Enable DeepFilterNet Denoising", variable=use_deepfilternet_var).pack(anchor="w", pady=(0, 8))
-    Checkbutton(left_frame, text="Enable pyrnnoise Denoising", variable=use_pyrnnoise_var).pack(anchor="w", pady=(0, 8))
+    highlight_mode_label = tk.Label(left_frame, text="Highlight Mode (inline = one event per caption):")
+    highlight_mode_label.pack(anchor="w", pady=(0, 2))
+    highlight_mode_menu = ttk.Combobox(left_frame, textvariable=highlight_mode_var, values=HIGHLIGHT_MODES, state="readonly")
+    highlight_mode_menu.pack(anchor="w", pady=(0, 8))
+
+    tk.Checkbutton(left_frame, text="Bypass Auto-Editor (skip silence removal)", variable=bypass_auto_var).pack(anchor="w", pady=(0, 2))
+    silence_backend_label = tk.Label(left_frame, text="Silence Detection:")
+    silence_backend_label.pack(anchor="w", pady=(0, 2))
+    silence_backend_menu = ttk.Combobox(left_frame, textvariable=silence_backend_var, values=SILENCE_BACKENDS, state="readonly")
+    silence_backend_menu.pack(anchor="w", pady=(0, 2))
+    tk.Checkbutton(left_frame, text="Edit transcript before creating subtitles", variable=edit_transcript_var).pack(anchor="w", pady=(0, 8))
+    tk.Checkbutton(left_frame, text="Enable DeepFilterNet Denoising", variable=use_deepfilternet_var).pack(anchor="w", pady=(0, 8))
+    tk.Checkbutton(left_frame, text="Enable pyrnnoise Denoising", variable=use_pyrnnoise_var).pack(anchor="w", pady=(0, 8))
 
     # ---- NEW: Merge videos option ----
-    Checkbutton(left_frame, text="Merge/Concatenate selected videos into one", variable=merge_videos_var).pack(anchor="w", pady=(0, 8))
+    tk.Checkbutton(left_frame, text="Merge/Concatenate selected videos into one", variable=merge_videos_var).pack(anchor="w", pady=(0, 8))
+    tk.Checkbutton(left_frame, text="Single-pass encode (cut, music mix and caption burn in one pass)", variable=single_pass_var).pack(anchor="w", pady=(0, 8))
 
-    Checkbutton(right_frame, text="Enable Demucs Denoising", variable=use_demucs_var).pack(anchor="w", pady=(0, 2))
+    tk.Checkbutton(right_frame, text="Enable Demucs Denoising", variable=use_demucs_var).pack(anchor="w", pady=(0, 2))
     demucs_model_label = tk.Label(right_frame, text="Demucs Model:")
     demucs_model_label.pack(anchor="w", pady=(0, 2))
-    demucs_model_var = StringVar(value="htdemucs_ft")
+    demucs_model_var = tk.StringVar(value="htdemucs_ft")
     demucs_model_menu = ttk.Combobox(right_frame, textvariable=demucs_model_var, values=DEMUC_MODELS, state="readonly")
     demucs_model_menu.pack(anchor="w", pady=(0, 8))
 
@@ -581,47 +1230,53 @@ def select_files_and_options():
     demucs_device_label.pack(anchor="w", pady=(0, 2))
     has_cuda = torch.cuda.is_available()
     default_device = "cuda" if has_cuda else "cpu"
-    demucs_device_var = StringVar(value=default_device)
+    demucs_device_var = tk.StringVar(value=default_device)
     demucs_device_menu = ttk.Combobox(right_frame, textvariable=demucs_device_var, values=["cuda", "cpu"], state="readonly")
     demucs_device_menu.pack(anchor="w", pady=(0, 8))
 
-    Checkbutton(right_frame, text="Enable Noisereduce", variable=use_noisereduce_var).pack(anchor="w", pady=(0, 2))
+    demucs_preset_label = tk.Label(right_frame, text="Demucs Quality Preset:")
+    demucs_preset_label.pack(anchor="w", pady=(0, 2))
+    demucs_preset_var = tk.StringVar(value=DEMUCS_DEFAULT_PRESET)
+    demucs_preset_menu = ttk.Combobox(right_frame, textvariable=demucs_preset_var, values=list(DEMUCS_PRESETS), state="readonly")
+    demucs_preset_menu.pack(anchor="w", pady=(0, 8))
+
+    tk.Checkbutton(right_frame, text="Enable Noisereduce", variable=use_noisereduce_var).pack(anchor="w", pady=(0, 2))
     nr_label = tk.Label(right_frame, text="Noisereduce Options:")
     nr_label.pack(anchor="w", pady=(16, 2))
 
     nr_propdec_label = tk.Label(right_frame, text="prop_decrease (0.1=light, 1.0=max):")
     nr_propdec_label.pack(anchor="w", pady=(0, 2))
-    nr_propdec_var = DoubleVar(value=0.75)
+    nr_propdec_var = tk.DoubleVar(value=0.75)
     nr_propdec_slider = tk.Scale(right_frame, from_=0.1, to=1.0, resolution=0.01, orient="horizontal", variable=nr_propdec_var)
     nr_propdec_slider.pack(anchor="w", pady=(0, 8))
 
-    nr_stationary_var = BooleanVar(value=False)
-    nr_stationary_chk = Checkbutton(right_frame, text="Stationary noise", variable=nr_stationary_var)
+    nr_stationary_var = tk.BooleanVar(value=False)
+    nr_stationary_chk = tk.Checkbutton(right_frame, text="Stationary noise", variable=nr_stationary_var)
     nr_stationary_chk.pack(anchor="w", pady=(0, 2))
 
     nr_freqsmooth_label = tk.Label(right_frame, text="freq_mask_smooth_hz (0=off, up to 1000):")
     nr_freqsmooth_label.pack(anchor="w", pady=(0, 2))
-    nr_freqsmooth_var = IntVar(value=500)
+    nr_freqsmooth_var = tk.IntVar(value=500)
     nr_freqsmooth_slider = tk.Scale(right_frame, from_=0, to=1000, orient="horizontal", variable=nr_freqsmooth_var)
     nr_freqsmooth_slider.pack(anchor="w", pady=(0, 8))
 
-    Checkbutton(right_frame, text="Enable VoiceFixer Enhancement", variable=use_voicefixer_var).pack(anchor="w", pady=(0, 2))
+    tk.Checkbutton(right_frame, text="Enable VoiceFixer Enhancement", variable=use_voicefixer_var).pack(anchor="w", pady=(0, 2))
     vf_label = tk.Label(right_frame, text="VoiceFixer Mode:")
     vf_label.pack(anchor="w", pady=(8, 2))
-    vf_mode_var = StringVar(value="2")
+    vf_mode_var = tk.StringVar(value="2")
     vf_mode_menu = ttk.Combobox(right_frame, textvariable=vf_mode_var, values=VOICEFIXER_MODES, state="readonly")
     vf_mode_menu.pack(anchor="w", pady=(0, 8))
 
-    Checkbutton(right_frame, text="Enable Low-Pass Filter", variable=use_lowpass_var).pack(anchor="w", pady=(0, 2))
+    tk.Checkbutton(right_frame, text="Enable Low-Pass Filter", variable=use_lowpass_var).pack(anchor="w", pady=(0, 2))
     lp_label = tk.Label(right_frame, text="Low-Pass Filter Cutoff (Hz, 1000–20000):")
     lp_label.pack(anchor="w", pady=(10, 2))
-    lp_cutoff_var = IntVar(value=8000)
+    lp_cutoff_var = tk.IntVar(value=8000)
     lp_slider = tk.Scale(right_frame, from_=100, to=20000, resolution=100, orient="horizontal", variable=lp_cutoff_var, length=220)
     lp_slider.pack(anchor="w", pady=(0, 8))
 
     bgm_volume_label = tk.Label(right_frame, text="Background Music Volume\n(0.00 = silent, 1.00 = full):")
     bgm_volume_label.pack(anchor="n", pady=(0, 2))
-    bgm_volume_var = DoubleVar(value=0.15)
+    bgm_volume_var = tk.DoubleVar(value=0.15)
     bgm_volume_slider = tk.Scale(right_frame, from_=0.00, to=1.00, resolution=0.01, orient="horizontal", variable=bgm_volume_var, length=220)
     bgm_volume_slider.pack(anchor="n", pady=(0, 8))
 
@@ -638,10 +1293,16 @@ def select_files_and_options():
     qp_entry = tk.Entry(right_frame, textvariable=qp_var)
     qp_entry.pack(anchor="w", pady=(0, 8))
 
+    burn_workers_label = tk.Label(right_frame, text="Parallel caption burn workers (1 = off):")
+    burn_workers_label.pack(anchor="w", pady=(0, 2))
+    burn_workers_var = tk.IntVar(value=BURN_WORKERS)
+    burn_workers_spin = tk.Spinbox(right_frame, from_=1, to=8, increment=1, textvariable=burn_workers_var, width=5)
+    burn_workers_spin.pack(anchor="w", pady=(0, 8))
+
     def close_options():
         opt_root.quit()
 
-    Button(opt_root, text="Continue", command=close_options).pack(side="bottom", pady=10)
+    tk.Button(opt_root, text="Continue", command=close_options).pack(side="bottom", pady=10)
 
     opt_root.mainloop()
     opt_root.destroy()
@@ -662,17 +1323,19 @@ def select_files_and_options():
             bold_var.get(), italic_var.get(), underline_var.get(), strikeout_var.get(),
             scale_x_var.get(), scale_y_var.get(), spacing_var.get(), angle_var.get(),
             border_style_var.get(), outline_var.get(), shadow_var.get(), alignment_var.get(),
-            marginl_var.get(), marginr_var.get())
+            marginl_var.get(), marginr_var.get(), single_pass_var.get(), demucs_preset_var.get(),
+            highlight_mode_var.get(), burn_workers_var.get(), silence_backend_var.get())
 
 
 def merge_videos_ffmpeg(video_files, merged_filename):
-    # Use concat demuxer for robust merge
-    with open("inputs_to_concat.txt", "w", encoding="utf-8") as f:
+    # Use concat demuxer for robust merge; the list file is unique per call
+    fd, list_path = tempfile.mkstemp(prefix="inputs_to_concat_", suffix=".txt")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
         for vf in video_files:
             f.write(f"file '{os.path.abspath(vf)}'\n")
     cmd = [
         "ffmpeg", "-y", "-f", "concat", "-safe", "0",
-        "-i", "inputs_to_concat.txt",
+        "-i", list_path,
         "-c", "copy",
         merged_filename
     ]
@@ -680,88 +1343,325 @@ def merge_videos_ffmpeg(video_files, merged_filename):
     try:
         subprocess.run(cmd, check=True)
     finally:
-        if os.path.exists("inputs_to_concat.txt"):
-            os.remove("inputs_to_concat.txt")
+        if os.path.exists(list_path):
+            os.remove(list_path)
 
-def run_pyrnnoise(input_wav, output_wav):
-    if not _PYRNNOISE_AVAILABLE:
+def pyrnnoise_denoise_audio(audio, sr):
+    """In-memory pyrnnoise stage: float32 (samples[, channels]) in, same out."""
+    if not module_available(pyrnnoise):
         print("pyrnnoise not available.")
-        return
+        return audio, sr
     print("Running pyrnnoise (CLI recommended)...")
     try:
-        result = subprocess.run(
-            ["denoise", input_wav, output_wav],
-            capture_output=True, text=True
-        )
-        if result.returncode == 0:
-            print(f"Saved: {output_wav}")
-            return
-        else:
-            print("pyrnnoise CLI failed, falling back to Python API...")
+        # The `denoise` CLI only works on files, so this is the one place we hit disk.
+        with tempfile.TemporaryDirectory(prefix="rnnoise_") as tmpdir:
+            in_wav = os.path.join(tmpdir, "in.wav")
+            out_wav = os.path.join(tmpdir, "out.wav")
+            sf.write(in_wav, audio, sr)
+            result = subprocess.run(
+                ["denoise", in_wav, out_wav],
+                capture_output=True, text=True
+            )
+            if result.returncode == 0:
+                denoised, rate = sf.read(out_wav, dtype="float32")
+                return denoised, rate
+        print("pyrnnoise CLI failed, falling back to Python API...")
     except FileNotFoundError:
         print("pyrnnoise CLI not found, using Python API...")
-    rate, data = sf.read(input_wav)
-    denoised = pyrnnoise.RNNoise(rate).process_buffer(data)
+    denoised = pyrnnoise.RNNoise(sr).process_buffer(audio)
+    return np.asarray(denoised, dtype=np.float32), sr
+
+def run_pyrnnoise(input_wav, output_wav):
+    data, rate = sf.read(input_wav, dtype="float32")
+    denoised, rate = pyrnnoise_denoise_audio(data, rate)
     sf.write(output_wav, denoised, rate)
     print(f"Saved: {output_wav}")
 
-def run_deepfilternet(input_wav, output_wav, chunk_duration=300, batch_size=1):
-    if not _DFN_AVAILABLE:
-        print("DeepFilterNet not available.")
-        return
-    print("Running DeepFilterNet with chunking on CPU...")
-    model, df_state, _ = df_init()
-    model = model  # Force CPU
-    audio, _ = df_load_audio(input_wav, sr=df_state.sr())  # audio is already a Tensor
+def plan_overlapping_chunks(total, chunk, overlap):
+    """[(start, end), ...] covering 0..total; neighbours share `overlap` samples."""
+    if total <= 0:
+        return []
+    chunk = max(1, int(chunk))
+    overlap = max(0, min(int(overlap), chunk - 1))
+    hop = chunk - overlap
+    ranges = []
+    start = 0
+    while True:
+        end = min(start + chunk, total)
+        ranges.append((start, end))
+        if end >= total:
+            return ranges
+        start += hop
+
+def overlap_add_chunks(chunks):
+    """
+    Stitch (start, block) pairs, given in timeline order, into a stream of
+    finished output blocks. Where a block overlaps the previous one the two are
+    crossfaded with complementary raised-cosine ramps, so chunk edges don't
+    click. At most one block is held back at a time.
+    """
+    pending, pending_start = None, 0
+    for start, block in chunks:
+        if pending is not None:
+            done = max(0, min(start - pending_start, len(pending)))
+            if done:
+                yield pending[:done]
+            head = pending[done:]
+            k = min(len(head), len(block))
+            if k:
+                fade = (0.5 - 0.5 * np.cos(np.linspace(0.0, np.pi, k, dtype=np.float32)))[:, None]
+                block = block.copy()
+                block[:k] = head[:k] * (1.0 - fade) + block[:k] * fade
+        pending, pending_start = block, start
+    if pending is not None and len(pending):
+        yield pending
+
+def _fit_length(block, length):
+    if len(block) >= length:
+        return block[:length]
+    return np.concatenate([block, np.zeros((length - len(block), block.shape[1]), dtype=block.dtype)], axis=0)
+
+class DeepFilterNetEngine:
+    """
+    DeepFilterNet model + DF state, built once by init_df() and reused for
+    every file. Borrow it through lease_deepfilternet_engine() so the Tk and
+    Gradio paths share one instance.
+    """
 
-    # Ensure audio is contiguous and on CPU
-    audio = audio.contiguous()
+    def __init__(self):
+        self.model, self.df_state, _ = df_enhance_lib.init_df()
+        self.sr = self.df_state.sr()
+        # The model keeps recurrent state, so concurrent jobs take turns
+        self._lock = threading.Lock()
 
-    # Calculate chunk size in samples
-    chunk_samples = int(chunk_duration * df_state.sr())
-    audio_length = audio.shape[-1]
-    enhanced_chunks = []
+    def parameters(self):
+        return self.model.parameters()
 
-    for start in range(0, audio_length, chunk_samples):
-        end = min(start + chunk_samples, audio_length)
-        chunk = audio[:, start:end].contiguous()  # Ensure chunk is contiguous
-        if chunk.dim() == 1:
-            chunk = chunk.unsqueeze(0)  # Add channel dimension if needed
+    def buffers(self):
+        return self.model.buffers()
 
-        print(f"Processing chunk: {start//df_state.sr()} to {end//df_state.sr()} seconds")
-        with torch.no_grad():
-            if hasattr(model, "reset_h0"):
-                model.reset_h0(batch_size=batch_size, device="cpu")
-            enhanced_chunk = df_enhance(model, df_state, chunk, pad=True)
-        enhanced_chunks.append(enhanced_chunk.cpu())
+    def enhance_block(self, block, batch_size=1):
+        """Enhance one (samples, channels) float32 block with fresh recurrent state."""
+        chunk = torch.from_numpy(np.ascontiguousarray(block.T))
+        with self._lock, torch.no_grad():
+            if hasattr(self.model, "reset_h0"):
+                self.model.reset_h0(batch_size=batch_size, device="cpu")
+            enhanced = df_enhance_lib.enhance(self.model, self.df_state, chunk, pad=True)
+        return enhanced.cpu().numpy().astype(np.float32).T
 
-    # Concatenate chunks
-    enhanced = torch.cat(enhanced_chunks, dim=-1)
+DFN_POOL = ModelPool("DeepFilterNetPool", max_models=1, idle_timeout=DFN_IDLE_TIMEOUT)
 
-    # Save output
-    df_save_audio(output_wav, enhanced, df_state.sr())
-    print(f"Saved: {output_wav}")
+def lease_deepfilternet_engine():
+    return DFN_POOL.lease("deepfilternet", DeepFilterNetEngine)
 
-def get_framerate(video_path):
+def _dfn_worker_init(threads):
+    torch.set_num_threads(threads)
+
+_DFN_PROCESS_POOLS = {}  # (workers, threads) -> ProcessPoolExecutor
+_DFN_POOL_LEASES = {}    # ProcessPoolExecutor -> jobs currently using it
+_DFN_PROCESS_LOCK = threading.Lock()
+
+@contextlib.contextmanager
+def lease_dfn_process_pool(workers, threads):
+    """
+    Persistent DeepFilterNet worker processes. Each worker keeps its own
+    warm engine, so reusing the pool across files skips the model load.
+    Only the most recent (workers, threads) layout is kept warm; an older
+    layout that another job is still using is shut down once that job
+    releases it, never underneath it.
+    """
+    key = (workers, threads)
+    with _DFN_PROCESS_LOCK:
+        pool = _DFN_PROCESS_POOLS.get(key)
+        if pool is None:
+            for old in list(_DFN_PROCESS_POOLS.values()):
+                _retire_dfn_pool(old)
+            pool = _DFN_PROCESS_POOLS[key] = ProcessPoolExecutor(
+                max_workers=workers, initializer=_dfn_worker_init, initargs=(threads,))
+        _DFN_POOL_LEASES[pool] = _DFN_POOL_LEASES.get(pool, 0) + 1
+    try:
+        yield pool
+    finally:
+        with _DFN_PROCESS_LOCK:
+            _DFN_POOL_LEASES[pool] -= 1
+            if not _DFN_POOL_LEASES[pool]:
+                del _DFN_POOL_LEASES[pool]
+                if pool not in _DFN_PROCESS_POOLS.values():  # retired while in use
+                    pool.shutdown(wait=False)
+
+def _retire_dfn_pool(pool):
+    """Stop handing out `pool`; shut it down now if idle. Caller holds _DFN_PROCESS_LOCK."""
+    for key, existing in list(_DFN_PROCESS_POOLS.items()):
+        if existing is pool:
+            del _DFN_PROCESS_POOLS[key]
+    if not _DFN_POOL_LEASES.get(pool):
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def shutdown_dfn_process_pools(pool=None):
+    """
+    Stop the DeepFilterNet worker processes (all of them, or just `pool`).
+    Pools a job is still using are stopped when that job releases them.
+    """
+    with _DFN_PROCESS_LOCK:
+        for existing in list(_DFN_PROCESS_POOLS.values()):
+            if pool is None or existing is pool:
+                _retire_dfn_pool(existing)
+
+def _dfn_worker_enhance(block, batch_size):
+    # Runs in a worker process, which builds and keeps its own engine
+    with lease_deepfilternet_engine() as engine:
+        return engine.enhance_block(block, batch_size)
+
+def enhance_dfn_blocks(blocks, workers=DFN_WORKERS, threads_per_worker=DFN_THREADS_PER_WORKER, batch_size=1):
+    """
+    Enhance an iterable of (start, block) pairs, yielding (start, enhanced) in
+    the same order. With workers > 1 the blocks go to a process pool. At most
+    two blocks per worker are in flight, so memory stays bounded, and the
+    caller stitches the results exactly as it does on the sequential path.
+    """
+    workers = max(1, int(workers or 1))
+    if workers == 1:
+        with lease_deepfilternet_engine() as engine:
+            for start, block in blocks:
+                yield start, engine.enhance_block(block, batch_size)
+        return
+    threads = int(threads_per_worker or 0) or max(1, (os.cpu_count() or 1) // workers)
+    print(f"DeepFilterNet: {workers} worker processes x {threads} torch threads")
+    in_flight = deque()
+    with lease_dfn_process_pool(workers, threads) as pool:
+        try:
+            for start, block in blocks:
+                in_flight.append((start, pool.submit(_dfn_worker_enhance, block, batch_size)))
+                if len(in_flight) >= 2 * workers:
+                    done_start, future = in_flight.popleft()
+                    yield done_start, future.result()
+            while in_flight:
+                done_start, future = in_flight.popleft()
+                yield done_start, future.result()
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory); start fresh processes next time
+            shutdown_dfn_process_pools(pool)
+            raise
+        finally:
+            for _, future in in_flight:
+                future.cancel()
+
+def deepfilternet_enhance_audio(audio, sr, chunk_duration=DFN_CHUNK_SECONDS,
+                                overlap_duration=DFN_OVERLAP_SECONDS, batch_size=1,
+                                workers=DFN_WORKERS, threads_per_worker=DFN_THREADS_PER_WORKER):
+    """
+    In-memory DeepFilterNet stage. Takes float32 (samples[, channels]) at any
+    rate and returns the enhanced buffer at DeepFilterNet's native rate.
+    Chunks overlap and are crossfaded, and results land directly in one
+    preallocated output buffer instead of a list that is concatenated later.
+    """
+    if not module_available(df_enhance_lib):
+        print("DeepFilterNet not available.")
+        return audio, sr
+    print("Running DeepFilterNet with chunking on CPU...")
+    df_sr = DFN_SAMPLE_RATE
+    mono_in = audio.ndim == 1
+    audio = resample_audio(audio, sr, df_sr)
+    if mono_in:
+        audio = audio[:, None]
+
+    plan = plan_overlapping_chunks(len(audio), chunk_duration * df_sr, overlap_duration * df_sr)
+
+    def raw_chunks():
+        for start, end in plan:
+            print(f"Processing chunk: {start//df_sr} to {end//df_sr} seconds")
+            yield start, audio[start:end]
+
+    enhanced = np.empty_like(audio, dtype=np.float32)
+    pos = 0
+    enhanced_chunks = enhance_dfn_blocks(raw_chunks(), workers, threads_per_worker, batch_size)
+    for block in overlap_add_chunks(enhanced_chunks):
+        enhanced[pos:pos + len(block)] = block
+        pos += len(block)
+    return (enhanced[:, 0] if mono_in else enhanced), df_sr
+
+def deepfilternet_enhance_file(input_wav, output_wav, chunk_duration=DFN_CHUNK_SECONDS,
+                               overlap_duration=DFN_OVERLAP_SECONDS, batch_size=1,
+                               workers=DFN_WORKERS, threads_per_worker=DFN_THREADS_PER_WORKER):
+    """
+    Streaming DeepFilterNet: read one block at a time from `input_wav`, enhance
+    it, crossfade it with its neighbour and append it to `output_wav`. Memory
+    stays at roughly two blocks no matter how long the recording is.
+    """
+    if not module_available(df_enhance_lib):
+        print("DeepFilterNet not available.")
+        return False
+    print("Running streaming DeepFilterNet on CPU...")
+    df_sr = DFN_SAMPLE_RATE
+    with sf.SoundFile(input_wav) as src:
+        ratio = df_sr / float(src.samplerate)
+        total_out = int(round(src.frames * ratio))
+        plan = plan_overlapping_chunks(total_out, chunk_duration * df_sr, overlap_duration * df_sr)
+
+        def raw_chunks():
+            for start, end in plan:
+                # Plan in output samples, then read the matching source frames
+                src_start = int(math.floor(start / ratio))
+                src_end = min(src.frames, int(math.ceil(end / ratio)))
+                src.seek(src_start)
+                block = src.read(src_end - src_start, dtype="float32", always_2d=True)
+                block = _fit_length(resample_audio(block, src.samplerate, df_sr), end - start)
+                print(f"Processing chunk: {start//df_sr} to {end//df_sr} seconds")
+                yield start, block
+
+        enhanced_chunks = enhance_dfn_blocks(raw_chunks(), workers, threads_per_worker, batch_size)
+        with sf.SoundFile(output_wav, "w", samplerate=df_sr, channels=src.channels, subtype="FLOAT") as dst:
+            for block in overlap_add_chunks(enhanced_chunks):
+                dst.write(block)
+    return True
+
+def run_deepfilternet(input_wav, output_wav, chunk_duration=DFN_CHUNK_SECONDS, batch_size=1,
+                      workers=DFN_WORKERS, threads_per_worker=DFN_THREADS_PER_WORKER):
+    if deepfilternet_enhance_file(input_wav, output_wav, chunk_duration=chunk_duration, batch_size=batch_size,
+                                  workers=workers, threads_per_worker=threads_per_worker):
+        print(f"Saved: {output_wav}")
+
+def probe_media(path):
+    """
+    All stream and format info for `path` from a single ffprobe call.
+    Memoized by (path, mtime, size), so repeated lookups on the same file
+    (framerate, resolution, duration, channels...) cost one ffprobe in total
+    and a rewritten file is probed again. Treat the result as read-only.
+    """
+    abs_path = os.path.abspath(path)
+    try:
+        st = os.stat(abs_path)
+        return _probe_media_cached(abs_path, st.st_mtime_ns, st.st_size)
+    except OSError:
+        return _probe_media_cached(abs_path, None, None)
+
+@functools.lru_cache(maxsize=128)
+def _probe_media_cached(path, mtime_ns, size):
     probe = subprocess.run([
-        "ffprobe", "-v", "error", "-select_streams", "v:0",
-        "-show_entries", "stream=r_frame_rate",
-        "-of", "json", video_path
+        "ffprobe", "-v", "error",
+        "-show_streams", "-show_format",
+        "-of", "json", path
     ], capture_output=True, text=True)
-    rate_info = json.loads(probe.stdout)
-    rate_str = rate_info["streams"][0]["r_frame_rate"]
+    try:
+        return json.loads(probe.stdout)
+    except Exception:
+        return {}
+
+def _first_stream(info, codec_type):
+    for stream in info.get("streams", []):
+        if stream.get("codec_type") == codec_type:
+            return stream
+    raise ValueError(f"No {codec_type} stream found")
+
+def get_framerate(video_path):
+    rate_str = _first_stream(probe_media(video_path), "video")["r_frame_rate"]
     num, den = map(float, rate_str.split('/'))
     return num / den if den != 0 else 30.0
 
 def get_video_resolution(video_path):
-    probe = subprocess.run([
-        "ffprobe", "-v", "error", "-select_streams", "v:0",
-        "-show_entries", "stream=width,height",
-        "-of", "json", video_path
-    ], capture_output=True, text=True)
-    info = json.loads(probe.stdout)
-    width = info["streams"][0]["width"]
-    height = info["streams"][0]["height"]
+    info = _first_stream(probe_media(video_path), "video")
+    width = info["width"]
+    height = info["height"]
     return width, height
 
 def write_words_txt(words, txt_path):
@@ -791,21 +1691,36 @@ def update_words_from_txt(words, txt_path):
         words[i]['word'] = new_word
     return words[:min_len]
 
-def run_demucs_denoise(input_wav, output_wav, demucs_model="htdemucs_ft", demucs_device="cuda"):
-    print(f"Running Demucs for denoising: {input_wav}")
-    output_folder = "demucs_outputs"
-    if os.path.exists(output_folder):
-        import shutil
-        shutil.rmtree(output_folder, ignore_errors=True)
+def resolve_demucs_preset(preset, demucs_device="cuda"):
+    """Settings for a DEMUCS_PRESETS name, with `jobs` filled in for this device."""
+    if preset not in DEMUCS_PRESETS:
+        print(f"[Demucs] Unknown preset '{preset}', using '{DEMUCS_DEFAULT_PRESET}'.")
+        preset = DEMUCS_DEFAULT_PRESET
+    settings = dict(DEMUCS_PRESETS[preset])
+    if settings["jobs"] is None:
+        # Worker threads only help apply_model on CPU
+        settings["jobs"] = (os.cpu_count() or 1) if str(demucs_device).startswith("cpu") else 0
+    return settings
+
+def demucs_vocals_cli(input_wav, demucs_model="htdemucs_ft", demucs_device="cuda", demucs_preset=DEMUCS_DEFAULT_PRESET):
+    """Run the demucs CLI on a WAV file and return (vocals, sr) in memory."""
+    print(f"Running Demucs for denoising: {input_wav} (preset: {demucs_preset})")
+    settings = resolve_demucs_preset(demucs_preset, demucs_device)
+    # Private stems folder next to the input, so parallel jobs don't wipe each other's
+    output_folder = tempfile.mkdtemp(prefix="demucs_outputs_", dir=os.path.dirname(os.path.abspath(input_wav)))
     demucs_cmd = [
         "demucs",
         "-n", demucs_model,
         "-d", demucs_device,
         "--two-stems", "vocals",
-        "--shifts", "20",
+        "--shifts", str(settings["shifts"]),
+        "--overlap", str(settings["overlap"]),
+        "-j", str(settings["jobs"]),
         "-o", output_folder,
         input_wav
     ]
+    if settings["segment"]:
+        demucs_cmd[-1:-1] = ["--segment", str(int(settings["segment"]))]
     print("Running Demucs command:", " ".join(demucs_cmd))
     process = subprocess.Popen(
         demucs_cmd,
@@ -828,58 +1743,189 @@ def run_demucs_denoise(input_wav, output_wav, demucs_model="htdemucs_ft", demucs
     vocals_path = os.path.join(output_folder, demucs_model, base, "vocals.wav")
     if not os.path.exists(vocals_path):
         raise Exception("Demucs did not produce the expected vocals file. Check demucs output above.")
-    wav, sr = sf.read(vocals_path)
-    sf.write(output_wav, wav, sr)
-    import shutil
+    wav, sr = sf.read(vocals_path, dtype="float32")
     shutil.rmtree(output_folder, ignore_errors=True)
-    print(f"Demucs denoised audio saved to: {output_wav}")
 
     # Demucs runs in a separate process (via CLI), so its VRAM should be freed on exit.
     # Still, clear *our* CUDA caches in case anything was initialized on this side.
     free_vram(tag="after_demucs")
+    return wav, sr
+
+DEMUCS_POOL = ModelPool("DemucsPool", max_models=1, idle_timeout=DEMUCS_IDLE_TIMEOUT)
+
+def lease_demucs_model(demucs_model, demucs_device):
+    def load():
+        model = demucs_pretrained.get_model(demucs_model)
+        model.to(demucs_device)
+        model.eval()
+        return model
+    return DEMUCS_POOL.lease((demucs_model, demucs_device), load)
+
+def demucs_vocals_inprocess(audio, sr, demucs_model="htdemucs_ft", demucs_device="cuda", demucs_preset=DEMUCS_DEFAULT_PRESET):
+    """
+    Separate vocals with a pooled, warm Demucs model and return (vocals, sr)
+    at the model's rate. Mirrors what `demucs --two-stems vocals` does:
+    normalise the mix, apply_model, denormalise, rescale to avoid clipping.
+    """
+    settings = resolve_demucs_preset(demucs_preset, demucs_device)
+    print(f"Running Demucs in-process ({demucs_model} on {demucs_device}, preset {demucs_preset}: {settings})...")
+    with lease_demucs_model(demucs_model, demucs_device) as model:
+        wav = torch.from_numpy(np.ascontiguousarray(audio.T if audio.ndim == 2 else audio[None, :]))
+        wav = demucs_audio.convert_audio(wav, sr, model.samplerate, model.audio_channels)
+        ref = wav.mean(0)
+        wav = (wav - ref.mean()) / ref.std()
+        with torch.no_grad():
+            sources = demucs_apply.apply_model(
+                model, wav[None], device=demucs_device,
+                shifts=settings["shifts"], split=True, overlap=settings["overlap"],
+                segment=settings["segment"], num_workers=settings["jobs"], progress=True
+            )[0]
+        sources = sources * ref.std() + ref.mean()
+        vocals = sources[model.sources.index("vocals")].cpu()
+        # Same as the CLI's default --clip-mode rescale
+        vocals = vocals / max(1.01 * float(vocals.abs().max()), 1.0)
+        samplerate = model.samplerate
+    del sources, model
+    free_vram(tag="after_demucs")
+    return vocals.numpy().astype(np.float32).T, samplerate
+
+def demucs_denoise_audio(audio, sr, demucs_model="htdemucs_ft", demucs_device="cuda", demucs_preset=DEMUCS_DEFAULT_PRESET):
+    """
+    In-memory Demucs stage. Uses the in-process engine when the demucs package
+    is importable; otherwise falls back to the CLI, which needs a temp file.
+    """
+    if module_available(demucs_apply):
+        return demucs_vocals_inprocess(audio, sr, demucs_model=demucs_model, demucs_device=demucs_device,
+                                       demucs_preset=demucs_preset)
+    with tempfile.TemporaryDirectory(prefix="demucs_in_") as tmpdir:
+        input_wav = os.path.join(tmpdir, "demucs_input.wav")
+        sf.write(input_wav, audio, sr)
+        return demucs_vocals_cli(input_wav, demucs_model=demucs_model, demucs_device=demucs_device,
+                                 demucs_preset=demucs_preset)
+
+def run_demucs_denoise(input_wav, output_wav, demucs_model="htdemucs_ft", demucs_device="cuda",
+                       demucs_preset=DEMUCS_DEFAULT_PRESET):
+    if module_available(demucs_apply):
+        data, rate = sf.read(input_wav, dtype="float32")
+        wav, sr = demucs_vocals_inprocess(data, rate, demucs_model=demucs_model, demucs_device=demucs_device,
+                                          demucs_preset=demucs_preset)
+    else:
+        wav, sr = demucs_vocals_cli(input_wav, demucs_model=demucs_model, demucs_device=demucs_device,
+                                    demucs_preset=demucs_preset)
+    sf.write(output_wav, wav, sr)
+    print(f"Demucs denoised audio saved to: {output_wav}")
+
+def get_audio_channels(media_path):
+    try:
+        return int(_first_stream(probe_media(media_path), "audio")["channels"])
+    except Exception:
+        return 2
+
+def decode_audio(media_path, sr=48000, channels=None):
+    """
+    Decode the first audio stream straight into a float32 (samples, channels)
+    array through an ffmpeg pipe, without an intermediate WAV on disk.
+    """
+    if channels is None:
+        channels = get_audio_channels(media_path)
+    result = subprocess.run([
+        "ffmpeg", "-v", "error", "-i", media_path,
+        "-vn", "-f", "f32le", "-acodec", "pcm_f32le",
+        "-ac", str(channels), "-ar", str(sr), "-"
+    ], capture_output=True, check=True)
+    audio = np.frombuffer(result.stdout, dtype=np.float32).reshape(-1, channels)
+    return (audio[:, 0].copy() if channels == 1 else audio.copy()), sr
+
+def decode_audio_to_wav(media_path, wav_path, sr=48000, channels=None):
+    """decode_audio, but written to a float WAV instead of held in memory."""
+    if channels is None:
+        channels = get_audio_channels(media_path)
+    subprocess.run([
+        "ffmpeg", "-y", "-v", "error", "-i", media_path,
+        "-vn", "-acodec", "pcm_f32le", "-ac", str(channels), "-ar", str(sr), wav_path
+    ], check=True)
+    return wav_path, sr
 
 def get_video_duration(video_path):
-    probe = subprocess.run([
-        "ffprobe", "-v", "error", "-show_entries",
-        "format=duration", "-of", "default=noprint_wrappers=1:nokey=1", video_path
-    ], capture_output=True, text=True)
     try:
-        duration = float(probe.stdout.strip())
+        duration = float(probe_media(video_path)["format"]["duration"])
     except Exception:
         duration = None
     return duration
 
+def resample_audio(audio, sr_from, sr_to):
+    """Polyphase resample along the sample axis; no-op when the rates match."""
+    if int(sr_from) == int(sr_to):
+        return audio
+    g = math.gcd(int(sr_from), int(sr_to))
+    return scipy_signal.resample_poly(audio, int(sr_to) // g, int(sr_from) // g, axis=0).astype(np.float32)
+
 def apply_lowpass_filter(data, sr, cutoff_hz):
     nyq = 0.5 * sr
     norm_cutoff = cutoff_hz / nyq
     if norm_cutoff >= 1:
         return data
-    b, a = butter(N=4, Wn=norm_cutoff, btype='low', analog=False)
+    b, a = scipy_signal.butter(N=4, Wn=norm_cutoff, btype='low', analog=False)
     if data.ndim == 1:
-        return lfilter(b, a, data)
+        return scipy_signal.lfilter(b, a, data)
     else:
-        return np.array([lfilter(b, a, channel) for channel in data.T]).T
+        return np.array([scipy_signal.lfilter(b, a, channel) for channel in data.T]).T
+
+def lowpass_audio(audio, sr, cutoff_hz):
+    print(f"Applying low-pass filter at {cutoff_hz} Hz...")
+    return apply_lowpass_filter(audio, sr, cutoff_hz=cutoff_hz).astype(np.float32), sr
+
+def noisereduce_audio(audio, sr, prop_decrease=0.75, stationary=False, freq_mask_smooth_hz=500):
+    print(f"Running noisereduce on previous output...")
+    prop_dec = max(0.01, min(float(prop_decrease), 1.0))
+    freq_mask = int(freq_mask_smooth_hz)
+    # noisereduce expects (channels, samples) for multichannel input
+    y = audio.T if audio.ndim == 2 else audio
+    reduced = nr.reduce_noise(
+        y=y,
+        sr=sr,
+        stationary=stationary,
+        prop_decrease=prop_dec,
+        freq_mask_smooth_hz=freq_mask if freq_mask > 0 else None,
+    )
+    reduced = reduced.T if audio.ndim == 2 else reduced
+    return np.asarray(reduced, dtype=np.float32), sr
 
-def run_voicefixer(input_wav, output_wav, mode="2", disable_cuda=False, silent=False):
-    if VoiceFixer is None:
+VOICEFIXER_SR = 44100
+
+def voicefixer_restore_audio(audio, sr, mode="2", disable_cuda=False):
+    """
+    In-memory VoiceFixer stage (VoiceFixer.restore_inmem). VoiceFixer works on
+    44.1 kHz mono, which is what this stage returns.
+    """
+    if not module_available(voicefixer_lib):
         raise ImportError("VoiceFixer is not installed. Run `pip install voicefixer`.")
-    if str(mode) not in ["0", "1", "2", "all"]:
+    if str(mode) not in VOICEFIXER_MODES:
         raise ValueError(f"VoiceFixer mode must be 0, 1, 2, or 'all', got: {mode}")
-    print(f"Running VoiceFixer (mode={mode}, {'no GPU' if disable_cuda else 'GPU if available'}) on {input_wav}...")
-    voicefixer = VoiceFixer()
-    voicefixer.restore(
-        input=input_wav,
-        output=output_wav,
-        mode=mode,
+    print(f"Running VoiceFixer (mode={mode}, {'no GPU' if disable_cuda else 'GPU if available'})...")
+    mono = audio.mean(axis=1) if audio.ndim == 2 else audio
+    mono = resample_audio(mono, sr, VOICEFIXER_SR)
+    voicefixer = voicefixer_lib.VoiceFixer()
+    # restore_inmem compares mode against ints; 'all' has no in-memory equivalent, use 0
+    restored = voicefixer.restore_inmem(
+        mono,
         cuda=not disable_cuda,
+        mode=int(mode) if str(mode).isdigit() else 0,
     )
-    print(f"VoiceFixer output audio saved to: {output_wav}")
+    restored = np.asarray(restored, dtype=np.float32).squeeze()
     # VoiceFixer may use CUDA; drop its memory after finishing.
     try:
         del voicefixer
     except Exception:
         pass
     free_vram(tag="after_voicefixer")
+    return restored, VOICEFIXER_SR
+
+def run_voicefixer(input_wav, output_wav, mode="2", disable_cuda=False, silent=False):
+    data, rate = sf.read(input_wav, dtype="float32")
+    restored, rate = voicefixer_restore_audio(data, rate, mode=mode, disable_cuda=disable_cuda)
+    sf.write(output_wav, restored, rate)
+    print(f"VoiceFixer output audio saved to: {output_wav}")
 
 def hex_to_ass_bgr(hex_color):
     print(f"hex_to_ass_bgr input: {hex_color}")
@@ -911,6 +1957,184 @@ def hex_to_ass_bgr(hex_color):
     print(f"hex_to_ass_bgr output: {result}")
     return result
 
+# One step of the denoise chain: func(audio, sr, **params) -> (audio, sr).
+# Non-required stages log a warning and pass the audio through on failure.
+# `version` names the model/library build the stage output depends on;
+# `runtime_params` only affect how the work is scheduled, not its result,
+# so they stay out of the stage cache key. `resource` is the stage_slot()
+# kind ("gpu" or "cpu") the stage runs under. Only `cacheable` stages (the
+# slow model-based ones) have their output kept in the stage cache.
+# `file_func(input_wav, output_wav, **params) -> bool` is an optional
+# streaming variant that run_audio_stages uses for long audio.
+AudioStage = namedtuple("AudioStage", ["name", "func", "params", "required", "version", "runtime_params", "resource",
+                                       "cacheable", "file_func"],
+                        defaults=("", (), "cpu", False, None))
+
+def build_denoise_stages(
+    use_demucs=False, demucs_model="htdemucs_ft", demucs_device="cuda", demucs_preset=DEMUCS_DEFAULT_PRESET,
+    use_deepfilternet=False, dfn_workers=DFN_WORKERS, dfn_threads_per_worker=DFN_THREADS_PER_WORKER,
+    use_noisereduce=False, nr_propdec=0.75, nr_stationary=False, nr_freqsmooth=500,
+    use_pyrnnoise=False,
+    use_voicefixer=False, vf_mode="2",
+    use_lowpass=False, lp_cutoff=8000,
+):
+    """The enabled denoise stages, in the order main() has always run them."""
+    stages = []
+    if use_demucs:
+        stages.append(AudioStage("demucs", demucs_denoise_audio,
+                                 {"demucs_model": demucs_model, "demucs_device": demucs_device,
+                                  "demucs_preset": demucs_preset}, True,
+                                 package_version("demucs"),
+                                 resource="gpu" if demucs_device == "cuda" else "cpu", cacheable=True))
+    if use_deepfilternet:
+        stages.append(AudioStage("deepfilternet", deepfilternet_enhance_audio,
+                                 {"workers": int(dfn_workers), "threads_per_worker": int(dfn_threads_per_worker)}, False,
+                                 package_version("deepfilternet"), ("workers", "threads_per_worker"),
+                                 cacheable=True, file_func=deepfilternet_enhance_file))
+    if use_noisereduce:
+        stages.append(AudioStage("noisereduce", noisereduce_audio,
+                                 {"prop_decrease": float(nr_propdec), "stationary": bool(nr_stationary),
+                                  "freq_mask_smooth_hz": int(nr_freqsmooth)}, False,
+                                 package_version("noisereduce")))
+    if use_pyrnnoise:
+        stages.append(AudioStage("pyrnnoise", pyrnnoise_denoise_audio, {}, False,
+                                 package_version("pyrnnoise")))
+    if use_voicefixer:
+        stages.append(AudioStage("voicefixer", voicefixer_restore_audio, {"mode": str(vf_mode)}, True,
+                                 package_version("voicefixer"),
+                                 resource="gpu" if torch.cuda.is_available() else "cpu", cacheable=True))
+    if use_lowpass:
+        stages.append(AudioStage("lowpass", lowpass_audio, {"cutoff_hz": int(lp_cutoff)}, False,
+                                 package_version("scipy")))
+    return stages
+
+# Stage outputs are stored as 24-bit FLAC (about a third of the float32 size
+# for speech). FLAC only holds [-1, 1], so louder audio is scaled down and the
+# factor kept in the file's comment tag. A streamed stage's output is a WAV
+# path and is copied over a block at a time.
+def _stage_artifact_blocks(audio, block_frames=1 << 20):
+    if isinstance(audio, str):
+        with sf.SoundFile(audio) as src:
+            yield from src.blocks(block_frames, dtype="float32")
+        return
+    audio = np.asarray(audio, dtype=np.float32)
+    for start in range(0, len(audio), block_frames):
+        yield audio[start:start + block_frames]
+
+def _read_stage_artifact(f):
+    with sf.SoundFile(f) as src:
+        scale = float(src.comment or 1.0)
+        audio = src.read(dtype="float32")
+        sr = src.samplerate
+    if scale != 1.0:
+        audio *= scale
+    return audio, sr
+
+def _write_stage_artifact(f, value):
+    audio, sr = value
+    scale = max([1.0] + [float(np.max(np.abs(block))) for block in _stage_artifact_blocks(audio) if len(block)])
+    channels = sf.info(audio).channels if isinstance(audio, str) else (1 if np.ndim(audio) == 1 else audio.shape[1])
+    with sf.SoundFile(f, "w", int(sr), channels, format="FLAC", subtype="PCM_24") as dst:
+        dst.comment = repr(scale)
+        for block in _stage_artifact_blocks(audio):
+            dst.write(block / scale if scale != 1.0 else block)
+
+def _estimate_stage_artifact_size(value):
+    audio = value[0]
+    if isinstance(audio, str):
+        info = sf.info(audio)
+        return info.frames * info.channels * 3 // 2
+    return np.asarray(audio).size * 3 // 2  # 24-bit samples, roughly halved by FLAC
+
+STAGE_CACHE = DiskCache(
+    "StageCache", "stages", STAGE_CACHE_MAX_MB, ".flac", _read_stage_artifact, _write_stage_artifact,
+    estimate_size=_estimate_stage_artifact_size
+)
+
+def stage_signature(stage):
+    """What a stage's output depends on: name, result-affecting params, version."""
+    params = {k: v for k, v in stage.params.items() if k not in stage.runtime_params}
+    return [stage.name, params, stage.version]
+
+def stage_cache_keys(audio, sr, stages):
+    """
+    Chained content keys: stage i's key covers the input audio and every
+    stage up to and including i (name, result-affecting params, version).
+    """
+    keys = []
+    key = cache_key("input", hash_audio(audio), sr)
+    for stage in stages:
+        key = cache_key(key, STAGE_CACHE_VERSION, *stage_signature(stage))
+        keys.append(key)
+    return keys
+
+def audio_frames(audio):
+    """Sample frames in a buffer or a WAV path."""
+    return sf.info(audio).frames if isinstance(audio, str) else len(audio)
+
+def run_audio_stages(audio, sr, stages, cache=STAGE_CACHE, cancel_event=None, work_dir=None):
+    """
+    Run `stages` in order. With a cache, the output of the last cacheable
+    stage that was already computed is loaded from disk and only the stages
+    after it run, so e.g. changing the lowpass cutoff reuses the
+    Demucs/DeepFilterNet output.
+    Each stage holds a stage_slot() of its resource kind while it runs.
+
+    `audio` may also be the path of a float WAV. Given a `work_dir`, audio of
+    at least STREAM_STAGE_MIN_SECONDS runs through stages that have a
+    `file_func` (DeepFilterNet) from disk to disk, so the chain never holds
+    that stage's input and output in memory at once. The result is always
+    an in-memory buffer.
+    """
+    keys = stage_cache_keys(audio, sr, stages) if (cache is not None and cache.enabled and stages) else []
+    start = 0
+    for i in range(len(keys) - 1, -1, -1):
+        if not stages[i].cacheable:
+            continue
+        hit = cache.load(keys[i])
+        if hit is not None:
+            audio, sr = hit
+            start = i + 1
+            print(f"[AudioChain] Reusing cached output of {' -> '.join(s.name for s in stages[:start])}")
+            break
+
+    with (job_workspace(prefix="audio_stages_", dir=work_dir) if work_dir else contextlib.nullcontext()) as stream_dir:
+        for i in range(start, len(stages)):
+            stage = stages[i]
+            check_cancelled(cancel_event)
+            frames = audio_frames(audio)
+            streamed = (stage.file_func is not None and stream_dir is not None
+                        and frames >= STREAM_STAGE_MIN_SECONDS * sr)
+            if streamed and not isinstance(audio, str):
+                spill_path = os.path.join(stream_dir, f"{i:02d}_{stage.name}_in.wav")
+                sf.write(spill_path, audio, sr, subtype="FLOAT")
+                audio = spill_path
+            elif not streamed and isinstance(audio, str):
+                audio, sr = sf.read(audio, dtype="float32")
+            print(f"[AudioChain] {stage.name} ({frames / float(sr):.1f}s @ {sr} Hz{', streamed' if streamed else ''})")
+            try:
+                with stage_slot(stage.resource):
+                    if streamed:
+                        out_path = os.path.join(stream_dir, f"{i:02d}_{stage.name}.wav")
+                        if not stage.file_func(audio, out_path, **stage.params):
+                            raise RuntimeError("no output written")
+                        audio, sr = out_path, sf.info(out_path).samplerate
+                    else:
+                        audio, sr = stage.func(audio, sr, **stage.params)
+            except Exception as e:
+                if stage.required:
+                    raise
+                print(f"⚠️ {stage.name} failed:", e)
+                keys = []  # later keys assume this stage ran; don't cache a pass-through
+                continue
+            if keys and stage.cacheable:
+                cache.store(keys[i], (audio, sr))
+        if isinstance(audio, str):
+            audio, sr = sf.read(audio, dtype="float32")
+    print(f"Final processed audio: {len(audio) / float(sr):.1f}s @ {sr} Hz")
+    return audio, sr
+
+@run_in_job_workspace
 def main(
     input_video, background_audio, bypass_auto, edit_transcript,
     subtitle_font, font_size, marginv,
@@ -928,91 +2152,74 @@ def main(
     bold=0, italic=0, underline=0, strikeout=0,
     scale_x=100, scale_y=100, spacing=0, angle=0,
     border_style=1, outline=3, shadow=1, alignment=2,
-    marginl=10, marginr=10, transcribe_model="large-v2"):
-
-    extracted_wav = "extracted_audio.wav"
-    processed_wav = extracted_wav
-    step_outputs = {}
-
-    denoised_wav = "demucs_denoised.wav"
-    nr_wav = "nr_denoised.wav"
-    vf_wav = "voicefixer_enhanced.wav"
-    lp_wav = "lowpass_nr_denoised.wav"
-    dfn_wav = "deepfilternet_denoised.wav"
-    rnnoise_wav = "rnnoise_denoised.wav"
-    output_video = "output_video_cleaned.mp4"
-    final_video = "final_output_no_silence.mp4"
-    final_with_music = "final_with_music.mp4"
-
-    subprocess.run([
-        "ffmpeg", "-y", "-i", input_video,
-        "-vn", "-acodec", "pcm_s16le", "-ar", "48000", extracted_wav
-    ], check=True)
-
-    processed_wav = extracted_wav
-
-    if use_demucs:
-        run_demucs_denoise(processed_wav, denoised_wav, demucs_model=demucs_model, demucs_device=demucs_device)
-        processed_wav = denoised_wav
-        step_outputs['demucs'] = processed_wav
-
-    if use_deepfilternet:
-        try:
-            run_deepfilternet(processed_wav, dfn_wav)
-            processed_wav = dfn_wav
-            step_outputs['deepfilternet'] = processed_wav
-        except Exception as e:
-            print("⚠️ DeepFilterNet failed or not installed:", e)
-
-    if use_noisereduce:
-        print(f"Running noisereduce on previous output...")
-        data, rate = sf.read(processed_wav)
-        if data.dtype != np.float32:
-            data = data.astype(np.float32)
-        prop_dec = max(0.01, min(float(nr_propdec), 1.0))
-        freq_mask = int(nr_freqsmooth)
-        try:
-            data_nr = nr.reduce_noise(
-                y=data,
-                sr=rate,
-                stationary=nr_stationary,
-                prop_decrease=prop_dec,
-                freq_mask_smooth_hz=freq_mask if freq_mask > 0 else None,
-            )
-        except Exception as e:
-            print("⚠️ Noisereduce failed:", e)
-            data_nr = data
-        sf.write(nr_wav, data_nr, rate)
-        processed_wav = nr_wav
-        step_outputs['noisereduce'] = processed_wav
-
-    if use_pyrnnoise:
-        try:
-            print("Running PYRNNOISE on audio")
-            run_pyrnnoise(processed_wav, rnnoise_wav)
-            processed_wav = rnnoise_wav
-            step_outputs['pyrnnoise'] = processed_wav
-        except Exception as e:
-            print("⚠️ pyrnnoise failed or not installed:", e)
-
-    if use_voicefixer:
-        run_voicefixer(processed_wav, vf_wav, mode=vf_mode)
-        processed_wav = vf_wav
-        step_outputs['voicefixer'] = processed_wav
+    marginl=10, marginr=10, transcribe_model="large-v2", single_pass=False,
+    dfn_workers=DFN_WORKERS, dfn_threads_per_worker=DFN_THREADS_PER_WORKER,
+    demucs_preset=DEMUCS_DEFAULT_PRESET, transcribe_vad=False,
+    transcribe_backend=None, transcribe_compute_type=None, highlight_mode="layers",
+    burn_workers=BURN_WORKERS, silence_backend="native", cancel_event=None, work_dir=None):
+    """
+    Full pipeline: extract audio, run the selected denoise stages, cut silence,
+    mix background music, transcribe, and burn word-highlighted captions.
+
+    With single_pass=True the keep-ranges, cut speech track and ASS file are
+    computed up front and the video is decoded/encoded only once (trim, music
+    mix and subtitle burn share one ffmpeg graph) instead of up to three times.
+
+    silence_backend="native" finds the keep-ranges from the processed audio
+    in memory (detect_keep_intervals) and cuts the video with a select graph
+    in the mux encode; "auto-editor" shells out to auto-editor instead.
+
+    All intermediates live in `work_dir` (a per-job folder provided by
+    run_in_job_workspace), so several jobs can run side by side. Each stage
+    that finishes is recorded in the workspace's JobManifest; when a job
+    raises (say auto-editor or an encode errors out, or it is cancelled),
+    rerunning the same video skips straight to the first stage that didn't
+    complete or whose settings changed.
+    Setting `cancel_event` stops the job with JobCancelled at the next stage
+    boundary.
+    """
 
-    if use_lowpass:
-        print(f"Applying low-pass filter at {lp_cutoff} Hz...")
-        data_lp, rate_lp = sf.read(processed_wav)
-        if data_lp.dtype != np.float32:
-            data_lp = data_lp.astype(np.float32)
-        try:
-            data_lp_filt = apply_lowpass_filter(data_lp, rate_lp, cutoff_hz=lp_cutoff)
-        except Exception as e:
-            print("⚠️ Low-pass filter failed:", e)
-            data_lp_filt = data_lp
-        sf.write(lp_wav, data_lp_filt, rate_lp)
-        processed_wav = lp_wav
-        step_outputs['lowpass'] = processed_wav
+    def work(name):
+        return os.path.join(work_dir, name)
+
+    processed_wav = work("processed_audio.wav")
+    output_video = work("output_video_cleaned.mp4")
+    final_video = work("final_output_no_silence.mp4")
+    final_with_music = work("final_with_music.mp4")
+    cut_wav = work("speech_cut.wav")
+    words_json = work("words.json")
+    manifest = JobManifest(work_dir)
+
+    stages = build_denoise_stages(
+        use_demucs=use_demucs, demucs_model=demucs_model, demucs_device=demucs_device, demucs_preset=demucs_preset,
+        use_deepfilternet=use_deepfilternet, dfn_workers=dfn_workers, dfn_threads_per_worker=dfn_threads_per_worker,
+        use_noisereduce=use_noisereduce, nr_propdec=nr_propdec, nr_stationary=nr_stationary, nr_freqsmooth=nr_freqsmooth,
+        use_pyrnnoise=use_pyrnnoise,
+        use_voicefixer=use_voicefixer, vf_mode=vf_mode,
+        use_lowpass=use_lowpass, lp_cutoff=lp_cutoff,
+    )
+    denoise_key = resume_key("denoise", file_fingerprint(input_video),
+                             stages=[stage_signature(stage) for stage in stages])
+    if manifest.completed("denoise", denoise_key):
+        audio, audio_sr = sf.read(processed_wav, dtype="float32")
+    else:
+        # Decode once into memory; the denoise stages hand float32 buffers to each
+        # other and only the final result is written out for ffmpeg to mux.
+        # Long recordings headed for a streaming stage are decoded to disk
+        # instead, so that stage never has the whole input in memory.
+        decoded_wav = work("decoded_audio.wav")
+        if (any(stage.file_func for stage in stages)
+                and (get_video_duration(input_video) or 0) >= STREAM_STAGE_MIN_SECONDS):
+            audio, audio_sr = decode_audio_to_wav(input_video, decoded_wav, sr=48000)
+        else:
+            audio, audio_sr = decode_audio(input_video, sr=48000)
+        audio, audio_sr = run_audio_stages(audio, audio_sr, stages, cancel_event=cancel_event, work_dir=work_dir)
+        if os.path.exists(decoded_wav):
+            os.remove(decoded_wav)
+        # Float WAV, so a resumed run reads back exactly these samples
+        sf.write(processed_wav, audio, audio_sr, subtype="FLOAT")
+        manifest.record("denoise", denoise_key, [processed_wav])
+    check_cancelled(cancel_event)
 
     print(f"Final processed audio for video is: {processed_wav}")
 
@@ -1025,76 +2232,168 @@ def main(
         qp_int = 30
         qp = "30"
 
-    subprocess.run([
-        "ffmpeg", "-y",
-        "-i", input_video,
-        "-i", processed_wav,
-        "-map", "0:v:0", "-map", "1:a:0",
-        "-c:v", video_codec,
-        "-rc", "constqp", "-qp", qp,
-       # "-r", str(framerate),
-        "-pix_fmt", "yuv420p",
-        "-c:a", "aac", "-b:a", "320k",
-        "-shortest",
-        output_video
-    ], check=True)
+    ass_path = work("captions.ass")
+    out_video = work("captioned_output.mkv")
+    txt_path = work("transcript_edit.txt")
+
+    transcribe_kwargs = dict(model_size=transcribe_model, vad=transcribe_vad,
+                             backend=transcribe_backend or DEFAULT_TRANSCRIBE_BACKEND,
+                             compute_type=transcribe_compute_type or DEFAULT_COMPUTE_TYPE)
+
+    def transcribe_step(source, parent_key):
+        # The word list is a job artifact too, so a rerun after a failed
+        # encode or burn never has to wait for Whisper again.
+        key = resume_key("transcribe", parent_key, **transcribe_kwargs)
+        if manifest.completed("transcribe", key):
+            with open(words_json, "r", encoding="utf-8") as f:
+                return json.load(f)
+        words = transcribe_video(source() if callable(source) else source, **transcribe_kwargs)
+        if words:
+            with open(words_json, "w", encoding="utf-8") as f:
+                json.dump(words, f)
+            manifest.record("transcribe", key, [words_json])
+        return words
 
-    if not bypass_auto:
-        threshold_str = f"{threshold:.2f}"
-        margin_str = f"{margin:.1f}s"
-        subprocess.run([
-            "auto-editor", output_video,
-            "--edit", f"audio:threshold={threshold_str}", "--margin", margin_str,
-            "-c:v", video_codec, "-b:v", "50M", "--no-open", "-b:a", "320k",
-            "-o", final_video
-        ], check=True)
-        video_for_music = final_video
-    else:
-        video_for_music = output_video
-
-    duration = get_video_duration(video_for_music)
-    if duration is None or duration < 7:
-        fade_start = max(0, duration - 2) if duration else 0
-        fade_dur = min(2, duration) if duration else 2
-    else:
-        fade_start = duration - 5
-        fade_dur = 5
-
-    # Optionally apply COMPAND to the main (speech) track after denoising and before music.
-    compand_expr = "compand=0|0:1|1:-90/-900|-70/-70|-30/-9|0/-3:6:0:-90:0.02"
-    compand_prefix = (compand_expr + ",") if enable_compand else ""
-
-    filter_complex = (
-        f"[0:a]{compand_prefix}dynaudnorm=f=500:g=15:m=10:r=0.95:b=1[main];"
-        f"[1:a]afade=t=out:st={fade_start:.2f}:d={fade_dur:.2f},dynaudnorm=f=500:g=15:m=10:r=0.95[pbg];"
-        f"[main]asplit=2[maina][mainb];"
-        f"[pbg]volume={bgm_volume:.2f}[bg];"
-        f"[bg][maina]sidechaincompress=threshold=0.01:ratio=5:attack=50:release=50[compr];"
-        f"[compr][mainb]amerge[mixout]"
-    )
-
-    result = subprocess.run([
-        "ffmpeg", "-y",
-        "-i", video_for_music,
-        "-stream_loop", "-1", "-i", background_audio,
-        "-filter_complex", filter_complex,
-        "-map", "0:v:0",
-        "-map", "[mixout]",
-        "-c:v", "copy",
-        "-c:a", "aac",
-        "-ac", "2",
-        final_with_music
-    ], check=True, capture_output=True, text=True)
-    print(result.stdout)
-    print(result.stderr)
-
-    video_path = final_video if not bypass_auto else output_video
-    ass_path = "captions.ass"
-    out_video = input_video + "Completed_" + dt + "_.mkv"
-    txt_path = "transcript_edit.txt"
-
-    print("Transcribing...")
-    words = transcribe_video(video_path, model_size=transcribe_model)
+    keep_ranges = None
+    native_cut = not bypass_auto and silence_backend != "auto-editor"
+    video_key = denoise_key
+    if single_pass or native_cut:
+        # Work out the keep-ranges and the cut speech up front; single-pass
+        # mode then decodes/encodes the video exactly once.
+        speech_duration = len(audio) / float(audio_sr)
+        video_key = resume_key("cut", denoise_key, bypass_auto=bypass_auto, native_cut=native_cut,
+                               threshold=threshold, margin=margin, framerate=framerate)
+        if manifest.completed("cut", video_key):
+            keep_ranges = [tuple(r) for r in manifest.data("cut")["keep_ranges"]]
+        else:
+            if bypass_auto:
+                keep_ranges = [(0.0, speech_duration)]
+            elif native_cut:
+                keep_ranges = detect_keep_intervals(audio, audio_sr, threshold, margin, framerate)
+            else:
+                keep_ranges = detect_keep_ranges_auto_editor(processed_wav, threshold, margin, framerate)
+            keep_ranges = snap_ranges_to_frames(keep_ranges, framerate, speech_duration)
+            if keep_ranges:
+                cut_audio = cut_audio_to_ranges(audio, audio_sr, keep_ranges)
+                sf.write(cut_wav, cut_audio, audio_sr)
+                del cut_audio
+                manifest.record("cut", video_key, [cut_wav], keep_ranges=keep_ranges)
+        if not keep_ranges:
+            print("⚠️ Silence detection kept nothing; nothing to render.")
+            return
+        print(f"Silence cut: keeping {len(keep_ranges)} range(s), "
+              f"{sum(e - s for s, e in keep_ranges):.2f}s of {speech_duration:.2f}s")
+        # Whisper hears the cleaned, uncut speech; retime_words() maps the word
+        # times through the cuts, so the transcript (and its cache entry) does
+        # not depend on the silence settings.
+        transcribe_source = functools.partial(to_whisper_audio, audio, audio_sr)
+        transcribe_parent = denoise_key
+
+    transcription = None
+    try:
+        if not single_pass:
+            if keep_ranges is not None:
+                # Transcribe on a worker thread while ffmpeg cuts and encodes the video
+                transcribe_pool = ThreadPoolExecutor(max_workers=1)
+                transcription = transcribe_pool.submit(transcribe_step, transcribe_source, transcribe_parent)
+                transcribe_pool.shutdown(wait=False)
+                # Silence removal happens inside the mux encode
+                video_key = resume_key("mux", video_key, video_codec=video_codec, qp=qp)
+                if not manifest.completed("mux", video_key):
+                    with stage_slot("encode"):
+                        cut_video_with_speech(input_video, cut_wav, keep_ranges, output_video, framerate, video_codec, qp,
+                                              work_dir=work_dir)
+                    manifest.record("mux", video_key, [output_video])
+            else:
+                video_key = resume_key("mux", video_key, video_codec=video_codec, qp=qp)
+                if not manifest.completed("mux", video_key):
+                    with stage_slot("encode"):
+                        subprocess.run([
+                            "ffmpeg", "-y",
+                            "-i", input_video,
+                            "-i", processed_wav,
+                            "-map", "0:v:0", "-map", "1:a:0",
+                            "-c:v", video_codec,
+                            "-rc", "constqp", "-qp", qp,
+                           # "-r", str(framerate),
+                            "-pix_fmt", "yuv420p",
+                            "-c:a", "aac", "-b:a", "320k",
+                            "-shortest",
+                            output_video
+                        ], check=True)
+                    manifest.record("mux", video_key, [output_video])
+            check_cancelled(cancel_event)
+
+            if keep_ranges is None and not bypass_auto:
+                threshold_str = f"{threshold:.2f}"
+                margin_str = f"{margin:.1f}s"
+                video_key = resume_key("auto-editor", video_key, threshold=threshold_str, margin=margin_str)
+                if not manifest.completed("auto-editor", video_key):
+                    with stage_slot("encode"):
+                        subprocess.run([
+                            "auto-editor", output_video,
+                            "--edit", f"audio:threshold={threshold_str}", "--margin", margin_str,
+                            "-c:v", video_codec, "-b:v", "50M", "--no-open", "-b:a", "320k",
+                            "-o", final_video
+                        ], check=True)
+                    manifest.record("auto-editor", video_key, [final_video])
+                video_for_music = final_video
+            else:
+                video_for_music = output_video
+            check_cancelled(cancel_event)
+
+            music_key = resume_key("music", video_key, background_audio=file_fingerprint(background_audio),
+                                   bgm_volume=bgm_volume, enable_compand=enable_compand)
+            if not manifest.completed("music", music_key):
+                duration = get_video_duration(video_for_music)
+                filter_complex = build_music_mix_filter("0:a", "1:a", duration, bgm_volume, enable_compand)
+
+                result = subprocess.run([
+                    "ffmpeg", "-y",
+                    "-i", video_for_music,
+                    "-stream_loop", "-1", "-i", background_audio,
+                    "-filter_complex", filter_complex,
+                    "-map", "0:v:0",
+                    "-map", "[mixout]",
+                    "-c:v", "copy",
+                    "-c:a", "aac",
+                    "-ac", "2",
+                    final_with_music
+                ], check=True, capture_output=True, text=True)
+                print(result.stdout)
+                print(result.stderr)
+                manifest.record("music", music_key, [final_with_music])
+
+            if keep_ranges is not None:
+                pass  # transcription is already running on the uncut speech
+            elif bypass_auto:
+                # The muxed video carries exactly the processed audio (cut to the video by -shortest)
+                video_duration = get_video_duration(input_video)
+                speech = audio[:int(video_duration * audio_sr)] if video_duration else audio
+                transcribe_source = functools.partial(to_whisper_audio, speech, audio_sr)
+                transcribe_parent = denoise_key
+            else:
+                # auto-editor's cuts only exist in its rendered file
+                transcribe_source = final_video
+                transcribe_parent = video_key
+
+        check_cancelled(cancel_event)
+        if transcription is not None:
+            print("Waiting for transcription...")
+            words = transcription.result()
+        else:
+            print("Transcribing...")
+            words = transcribe_step(transcribe_source, transcribe_parent)
+    except BaseException:
+        # Never leave Whisper running into a workspace that is about to be
+        # removed, or picked up again by the next run of this video
+        if transcription is not None:
+            transcription.cancel()
+            futures_wait([transcription])
+        raise
+
+    if keep_ranges is not None:
+        words = retime_words(words, keep_ranges)
     if not words:
         print("⚠️ Transcription failed: No words detected.")
         return
@@ -1125,16 +2424,26 @@ def main(
         bold=int(bold), italic=int(italic), underline=int(underline), strikeout=int(strikeout),
         scale_x=int(scale_x), scale_y=int(scale_y), spacing=int(spacing), angle=int(angle),
         border_style=int(border_style), outline=int(outline), shadow=int(shadow), alignment=int(alignment),
-        marginl=int(marginl), marginr=int(marginr)
+        marginl=int(marginl), marginr=int(marginr), highlight_mode=highlight_mode
     )
 
     if not os.path.exists(ass_path):
         print(f"⚠️ Subtitle file not generated: {ass_path}")
         return
 
+    check_cancelled(cancel_event)
     print("Burning captions into video...")
     try:
-        burn_subtitles_ffmpeg(final_with_music, ass_path, out_video, video_codec, qp)
+        if single_pass:
+            with stage_slot("encode"):
+                render_single_pass(
+                    input_video, cut_wav, background_audio, keep_ranges, ass_path, out_video,
+                    framerate, bgm_volume, enable_compand, video_codec, qp, work_dir=work_dir
+                )
+        else:
+            # Takes its own encode slot(s) for the whole burn
+            burn_subtitles_parallel(final_with_music, ass_path, out_video, video_codec, qp,
+                                    workers=burn_workers)
         if not os.path.exists(out_video):
             print(f"⚠️ Subtitle burning failed: Output video {out_video} not created.")
             return
@@ -1142,60 +2451,341 @@ def main(
         print(f"⚠️ FFmpeg subtitle burning failed: {e}")
         return
 
-    print("Done! Output saved as:", out_video)
-
-    output_file_path = out_video
     if outputs_folder is not None and output_basename is not None:
         ext = os.path.splitext(out_video)[-1]
-        target_path = os.path.join(outputs_folder, output_basename + ext)
-        try:
-            os.rename(out_video, target_path)
-            output_file_path = target_path
-        except Exception as e:
-            print(f"⚠️ Failed to rename output file to {target_path}: {e}")
-            import shutil
-            shutil.copy(out_video, target_path)
-            output_file_path = target_path
+        output_file_path = os.path.join(outputs_folder, output_basename + ext)
+    else:
+        stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_file_path = input_video + "Completed_" + stamp + "_.mkv"
+    # Move the result out of the job workspace before it is cleaned up
+    shutil.move(out_video, output_file_path)
+    print("Done! Output saved as:", output_file_path)
 
-    for f in [extracted_wav, denoised_wav, nr_wav, vf_wav, lp_wav, dfn_wav, rnnoise_wav, txt_path, ass_path]:
-        if os.path.exists(f):
-            try:
-                os.remove(f)
-            except Exception:
-                pass
     print("✅ All done. Final output with background music and ducking saved as:", output_file_path)
     return output_file_path
+
+def run_batch(jobs, max_jobs=None, on_done=None):
+    """
+    Run main(**job) for every job dict with up to `max_jobs` videos in flight.
+    Stages of different videos overlap, bounded per resource by stage_slot()
+    (STAGE_LIMITS / configure_stage_limits): one video transcribes on the GPU
+    while another encodes and a third runs DeepFilterNet. Each job keeps its
+    own workspace and settings, so every output matches a serial main() run.
+    Jobs that stop for a transcript edit (edit_transcript) share the console's
+    "Press Enter" prompt, so such a batch runs one video at a time.
+    `on_done(job, output_path, error)` is called as each job finishes.
+    Returns [(job, output_path, error), ...] in input order.
+    """
+    max_jobs = max(1, int(max_jobs or BATCH_JOBS))
+    if max_jobs > 1 and any(job.get("edit_transcript") for job in jobs):
+        print("[Batch] Transcript editing is on; processing one video at a time.")
+        max_jobs = 1
+    results = [None] * len(jobs)
+    with ThreadPoolExecutor(max_workers=min(max_jobs, max(1, len(jobs)))) as pool:
+        futures = {pool.submit(main, **job): i for i, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            job = jobs[futures[future]]
+            try:
+                output, error = future.result(), None
+            except Exception as e:
+                print(f"❌ Job for {job.get('input_video')} failed: {e}")
+                traceback.print_exc()
+                output, error = None, e
+            results[futures[future]] = (job, output, error)
+            if on_done is not None:
+                on_done(job, output, error)
+    return results
+
+# Default pipeline settings shared by the Gradio UI (its initial widget
+# values) and headless batch mode (--batch manifest.json|.yaml), where any
+# setting the manifest doesn't give falls back to these.
+PIPELINE_DEFAULTS = dict(
+    bypass_auto=False, edit_transcript=False,
+    subtitle_font="Arial", font_size=36, marginv=75,
+    threshold=0.01, margin=0.5,
+    demucs_model="htdemucs_ft", demucs_device="cuda", bgm_volume=0.15, enable_compand=True,
+    max_sentences=1, max_words=5,
+    nr_propdec=0.75, nr_stationary=False, nr_freqsmooth=500,
+    lp_cutoff=8000,
+    use_demucs=False, use_noisereduce=False, use_lowpass=False, use_voicefixer=False,
+    vf_mode="2", use_deepfilternet=True, use_pyrnnoise=True,
+    primary_color_hex="#FFFFFF", highlight_color_hex="#FFFF00",
+)
+_BATCH_RESERVED = {"work_dir", "cancel_event"}
+
+def load_batch_manifest(path):
+    """
+    Read a job manifest: either a list of jobs, or
+    {"defaults": {...main() params...}, "jobs": [...]}. A job is a dict of
+    main() parameters (at least input_video) or just an input video path.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    if path.lower().endswith((".yaml", ".yml")):
+        if not module_available(yaml):
+            raise ImportError("YAML manifests need PyYAML. Run `pip install pyyaml` or use JSON.")
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+    if isinstance(data, list):
+        data = {"jobs": data}
+    if not isinstance(data, dict) or not isinstance(data.get("jobs"), list):
+        raise ValueError(f"{path}: expected a list of jobs or a mapping with a 'jobs' list")
+    return data.get("defaults") or {}, data["jobs"]
+
+def resolve_batch_jobs(defaults, entries, manifest_dir="."):
+    """
+    Merge PIPELINE_DEFAULTS, manifest defaults and each entry into full main()
+    keyword sets. Returns [(job_id, job), ...]; see batch_job_id().
+    """
+    params = inspect.signature(main).parameters
+    jobs = []
+    seen = {}
+    for idx, entry in enumerate(entries):
+        if isinstance(entry, str):
+            entry = {"input_video": entry}
+        job = dict(PIPELINE_DEFAULTS)
+        if not torch.cuda.is_available():
+            job["demucs_device"] = "cpu"
+        job.update(defaults)
+        job.update(entry)
+        unknown = sorted(k for k in job if k not in params or k in _BATCH_RESERVED)
+        if unknown:
+            raise ValueError(f"Job {idx}: unknown parameter(s) {', '.join(unknown)}")
+        for key in ("input_video", "background_audio"):
+            if not job.get(key):
+                raise ValueError(f"Job {idx}: '{key}' is required")
+            job[key] = os.path.normpath(os.path.join(manifest_dir, job[key]))
+        # Identify the job by what the manifest asked for, before the
+        # position-derived output name and the machine defaults fill in
+        explicit = dict(defaults, **entry)
+        explicit.update(input_video=job["input_video"], background_audio=job["background_audio"])
+        base_id = batch_job_id(explicit)
+        seen[base_id] = seen.get(base_id, -1) + 1
+        job_id = batch_job_id(explicit, seen[base_id])
+        if job.get("edit_transcript"):
+            print(f"⚠️ Job {idx}: edit_transcript needs a person at the keyboard; disabled in batch mode.")
+            job["edit_transcript"] = False
+        job["outputs_folder"] = job.get("outputs_folder") or get_outputs_folder()
+        os.makedirs(job["outputs_folder"], exist_ok=True)
+        stem = os.path.splitext(os.path.basename(job["input_video"]))[0]
+        job["output_basename"] = job.get("output_basename") or f"{idx:04d}_{stem}_captioned"
+        jobs.append((job_id, job))
+    return jobs
+
+def batch_job_id(settings, occurrence=0):
+    """
+    Resume-state key of a manifest job: its input paths plus the settings the
+    manifest gave explicitly, so adding, removing or reordering other entries
+    leaves it unchanged. `occurrence` tells identical entries apart.
+    """
+    return cache_key("batch_job", settings, occurrence)[:16]
+
+def run_batch_manifest(manifest_path, max_jobs=None, state_path=None, report_path=None, retry_failed=True):
+    """
+    Headless batch run. Jobs already marked done in the state file (with
+    their output still on disk) are skipped, so an interrupted batch resumes
+    where it stopped. Writes a JSON report and returns the number of failures.
+    """
+    manifest_path = os.path.abspath(manifest_path)
+    stem = os.path.splitext(manifest_path)[0]
+    state_path = state_path or stem + ".state.json"
+    report_path = report_path or stem + ".report.json"
+    defaults, entries = load_batch_manifest(manifest_path)
+    resolved = resolve_batch_jobs(defaults, entries, os.path.dirname(manifest_path))
+    jobs = [job for _, job in resolved]
+    job_ids = {id(job): job_id for job_id, job in resolved}
+
+    state = {}
+    if os.path.exists(state_path):
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    state_lock = threading.Lock()
+
+    def save_state():
+        tmp_path = state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, state_path)
+
+    pending, skipped = [], []
+    for job in jobs:
+        entry = state.get(job_ids[id(job)], {})
+        done = entry.get("status") == "done" and entry.get("output") and os.path.exists(entry["output"])
+        if done or (entry.get("status") == "failed" and not retry_failed):
+            skipped.append(job)
+        else:
+            pending.append(job)
+    print(f"[Batch] {len(jobs)} job(s): {len(pending)} to run, {len(skipped)} already handled "
+          f"(state: {state_path})")
+
+    def on_done(job, output, error):
+        with state_lock:
+            state[job_ids[id(job)]] = {
+                "input_video": job["input_video"],
+                "status": "done" if output else "failed",
+                "output": output,
+                "error": None if output else str(error or "no output produced"),
+                "finished": datetime.datetime.now().isoformat(timespec="seconds"),
+            }
+            save_state()
+        print(f"[Batch] {'✅' if output else '❌'} {job['input_video']}")
+
+    started = time.monotonic()
+    if pending:
+        run_batch(pending, max_jobs=max_jobs, on_done=on_done)
+    elapsed = time.monotonic() - started
+
+    report = {
+        "manifest": manifest_path,
+        "elapsed_seconds": round(elapsed, 1),
+        "jobs": [dict(state.get(job_ids[id(job)], {"input_video": job["input_video"], "status": "pending"}),
+                      skipped=job in skipped)
+                 for job in jobs],
+    }
+    failures = sum(1 for j in report["jobs"] if j["status"] != "done")
+    report["succeeded"] = len(jobs) - failures
+    report["failed"] = failures
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"[Batch] Finished in {elapsed / 60.0:.1f} min: {report['succeeded']} succeeded, "
+          f"{failures} failed. Report: {report_path}")
+    return failures
     
-def transcribe_video(video_path, model_size="large-v2"):
+WHISPER_SR = 16000
+WHISPER_LANGUAGE = "en"
+WHISPER_BEAM_SIZE = 10
+WHISPER_TEMPERATURE = 0
+
+def to_whisper_audio(audio, sr):
+    """Downmix and polyphase-resample a float buffer to Whisper's 16 kHz mono float32."""
+    mono = audio.mean(axis=1) if audio.ndim == 2 else audio
+    return np.ascontiguousarray(resample_audio(mono.astype(np.float32), sr, WHISPER_SR), dtype=np.float32)
+
+# Voice-activity gating for long recordings: only speech is sent to Whisper.
+DEFAULT_TRANSCRIBE_BACKEND = "whisper_timestamped"  # or "faster_whisper" (--transcribe-backend)
+DEFAULT_COMPUTE_TYPE = "int8"                       # faster-whisper / CTranslate2 precision
+FASTER_WHISPER_COMPUTE_TYPES = ["int8", "int8_float16", "int8_float32", "float16", "float32"]
+
+VAD_THRESHOLD = 0.02    # frame peak relative to the loudest frame that counts as speech
+VAD_FRAME_RATE = 50     # analysis frames per second (20 ms)
+VAD_MIN_SILENCE = 0.6   # shorter pauses stay inside one speech region (seconds)
+VAD_PAD = 0.2           # context kept on both sides of each region (seconds)
+VAD_SPACER = 0.3        # silence inserted between packed regions (seconds)
+
+def frame_peak_levels(audio, sr, frame_rate):
+    """Peak |amplitude| per analysis frame, normalised so the loudest frame is 1.0."""
+    mono = np.abs(audio).max(axis=1) if audio.ndim == 2 else np.abs(audio)
+    if len(mono) == 0:
+        return np.zeros(0, dtype=np.float32)
+    hop = sr / float(frame_rate)
+    edges = (np.arange(int(math.ceil(len(mono) / hop))) * hop).astype(np.int64)
+    levels = np.maximum.reduceat(mono, edges)
+    peak = levels.max()
+    return levels / peak if peak > 0 else levels
+
+def mask_to_runs(mask):
+    """[(start, end), ...] index runs where a boolean mask is True."""
+    edges = np.diff(np.concatenate([[0], mask.astype(np.int8), [0]]))
+    return list(zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)))
+
+def detect_speech_regions(audio, sr, threshold=VAD_THRESHOLD, min_silence=VAD_MIN_SILENCE,
+                          pad=VAD_PAD, frame_rate=VAD_FRAME_RATE):
+    """Energy VAD over already-denoised speech: [(start_sec, end_sec), ...]."""
+    levels = frame_peak_levels(audio, sr, frame_rate)
+    duration = len(audio) / float(sr)
+    regions = []
+    for start_f, end_f in mask_to_runs(levels > threshold):
+        start = max(0.0, float(start_f) / frame_rate - pad)
+        end = min(duration, float(end_f) / frame_rate + pad)
+        if regions and start - regions[-1][1] < min_silence:
+            regions[-1] = (regions[-1][0], max(regions[-1][1], end))
+        else:
+            regions.append((start, end))
+    return regions
+
+class TimelineMap:
+    """
+    Piecewise-linear map between a source timeline and an edited one built
+    by keeping `intervals` (source seconds, in order) back to back, with an
+    optional `gap` of inserted silence between consecutive pieces.
     """
-    Transcribe with whisper_timestamped, using a selectable model_size.
-    Common valid options include: 'tiny', 'base', 'small', 'medium',
-    'large', 'large-v2', 'large-v3', and variants you have installed.
 
-    We keep a defensive fallback to 'large-v2' if a bad model name is passed.
+    def __init__(self, intervals, gap=0.0):
+        self.src_starts = np.array([s for s, _ in intervals], dtype=np.float64)
+        self.lengths = np.array([e - s for s, e in intervals], dtype=np.float64)
+        self.out_starts = np.concatenate([[0.0], np.cumsum(self.lengths + gap)[:-1]]) if len(intervals) else np.zeros(0)
+
+    def to_source(self, t):
+        """Edited-timeline time -> source time (times in a gap snap to the piece before it)."""
+        if not len(self.out_starts):
+            return t
+        idx = min(max(int(np.searchsorted(self.out_starts, t, side="right")) - 1, 0), len(self.out_starts) - 1)
+        return float(self.src_starts[idx] + min(max(t - self.out_starts[idx], 0.0), self.lengths[idx]))
+
+    def locate(self, t):
+        """Index of the kept interval containing source time `t`, or None if `t` was cut."""
+        idx = int(np.searchsorted(self.src_starts, t, side="right")) - 1
+        if idx < 0 or t > self.src_starts[idx] + self.lengths[idx]:
+            return None
+        return idx
+
+    def to_output(self, t, idx=None):
+        """Source time -> edited-timeline time (None if `t` falls in a cut)."""
+        idx = self.locate(t) if idx is None else idx
+        if idx is None:
+            return None
+        return float(self.out_starts[idx] + min(max(t - self.src_starts[idx], 0.0), self.lengths[idx]))
+
+def retime_words(words, keep_intervals):
     """
-    device = "cuda" if torch.cuda.is_available() else "cpu"
-    print(f"Using device: {device} | requested model: {model_size}")
-    model = None
+    Map word times from the uncut source onto the timeline left after keeping
+    only `keep_intervals`. A word belongs to the interval holding its midpoint
+    (words cut away are dropped) and is clamped to that interval's edges.
+    """
+    timeline = TimelineMap(keep_intervals)
+    retimed = []
+    for w in words:
+        idx = timeline.locate(0.5 * (w["start"] + w["end"]))
+        if idx is None:
+            continue
+        start = timeline.to_output(w["start"], idx)
+        end = max(start, timeline.to_output(w["end"], idx))
+        retimed.append(dict(w, start=start, end=end))
+    return retimed
+
+def pack_speech_regions(audio, sr, regions, gap=VAD_SPACER):
+    """
+    Concatenate the speech regions (with a short spacer between them) into one
+    buffer, so Whisper decodes full 30 s windows of speech instead of silence.
+    Returns the packed audio and the TimelineMap back to the source.
+    """
+    spans = [(int(round(s * sr)), int(round(e * sr))) for s, e in regions]
+    spans = [(s, e) for s, e in spans if e > s]
+    spacer = np.zeros(int(round(gap * sr)), dtype=np.float32)
+    pieces = []
+    for i, (s, e) in enumerate(spans):
+        if i:
+            pieces.append(spacer)
+        pieces.append(audio[s:e])
+    packed = np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.float32)
+    timeline = TimelineMap([(s / float(sr), e / float(sr)) for s, e in spans], gap=len(spacer) / float(sr))
+    return packed, timeline
+
+def _whisper_words(model, audio, verbose=True):
     results = None
     try:
-        try:
-            model = load_model(model_size, device=device)
-        except Exception as e:
-            print(f"[Whisper] Failed to load model '{model_size}': {e}. Falling back to 'large-v2'.")
-            model = load_model("large-v2", device=device)
-
         # Do inference without tracking gradients
         with torch.no_grad():
-            results = transcribe(
+            results = whisper_timestamped.transcribe(
                 model,
-                video_path,
-                language="en",
-                beam_size=10,
+                audio,
+                language=WHISPER_LANGUAGE,
+                beam_size=WHISPER_BEAM_SIZE,
                 vad=False,
-                verbose=True,
+                verbose=verbose,
                 best_of=1,
-                temperature=0
+                temperature=WHISPER_TEMPERATURE
             )
 
         words = []
@@ -1208,16 +2798,142 @@ def transcribe_video(video_path, model_size="large-v2"):
                 })
         return words
     finally:
-        # Explicitly drop references so the caching allocator can free VRAM
-        try:
-            del results
-        except Exception:
-            pass
+        del results
+
+def _load_whisper_timestamped(model_size, device, compute_type=None):
+    return lease_whisper_model(model_size, device)
+
+def _load_faster_whisper(model_size, device, compute_type=DEFAULT_COMPUTE_TYPE):
+    if not module_available(faster_whisper):
+        raise ImportError("faster-whisper is not installed. Run `pip install faster-whisper`.")
+    if device == "cpu" and "float16" in compute_type:
+        # CTranslate2 has no fp16 kernels on CPU
+        print(f"[faster-whisper] {compute_type} is not supported on CPU, using int8.")
+        compute_type = "int8"
+    return WHISPER_POOL.lease(
+        ("faster_whisper", model_size, device, compute_type),
+        lambda: faster_whisper.WhisperModel(model_size, device=device, compute_type=compute_type)
+    )
+
+def _faster_whisper_words(model, audio, verbose=True):
+    segments, _info = model.transcribe(
+        audio,
+        language=WHISPER_LANGUAGE,
+        beam_size=WHISPER_BEAM_SIZE,
+        best_of=1,
+        temperature=WHISPER_TEMPERATURE,
+        word_timestamps=True,
+        vad_filter=False,
+    )
+    words = []
+    for segment in segments:  # lazy generator: decoding happens while iterating
+        if verbose:
+            print(f"[{format_time(segment.start)} --> {format_time(segment.end)}] {segment.text}")
+        for word in segment.words or []:
+            words.append({
+                "start": word.start,
+                "end": word.end,
+                "word": word.word.strip(),
+            })
+    return words
+
+# A transcription backend leases a (pooled) model and turns 16 kHz audio or a
+# media path into the [{"start", "end", "word"}, ...] list used everywhere else.
+TranscriptionBackend = namedtuple("TranscriptionBackend", ["load", "transcribe"])
+TRANSCRIBE_BACKENDS = {
+    "whisper_timestamped": TranscriptionBackend(_load_whisper_timestamped, _whisper_words),
+    "faster_whisper": TranscriptionBackend(_load_faster_whisper, _faster_whisper_words),
+}
+
+TRANSCRIPT_CACHE = DiskCache(
+    "TranscriptCache", "transcripts", TRANSCRIPT_CACHE_MAX_MB, ".json", _read_json, _write_json
+)
+
+def transcript_cache_key(audio, model_size, backend, compute_type, device, vad):
+    """Everything that can change the word list: the 16 kHz audio and the decode settings."""
+    return cache_key(
+        "transcript", TRANSCRIPT_CACHE_VERSION, hash_audio(audio),
+        backend, model_size, compute_type if backend == "faster_whisper" else None, device,
+        WHISPER_LANGUAGE, WHISPER_BEAM_SIZE, WHISPER_TEMPERATURE,
+        [VAD_THRESHOLD, VAD_FRAME_RATE, VAD_MIN_SILENCE, VAD_PAD, VAD_SPACER] if vad else None,
+    )
+
+def _transcribe_words(engine, model, audio, vad):
+    if not vad:
+        return engine.transcribe(model, audio, verbose=True)
+
+    regions = detect_speech_regions(audio, WHISPER_SR)
+    if not regions:
+        print("[VAD] No speech detected.")
+        return []
+    packed, timeline = pack_speech_regions(audio, WHISPER_SR, regions)
+    print(f"[VAD] {len(regions)} speech region(s): {len(packed) / WHISPER_SR:.1f}s "
+          f"of {len(audio) / WHISPER_SR:.1f}s sent to Whisper")
+    words = engine.transcribe(model, packed, verbose=False)
+    for w in words:
+        w["start"] = timeline.to_source(w["start"])
+        w["end"] = max(w["start"], timeline.to_source(w["end"]))
+    return words
+
+def transcribe_video(source, model_size="large-v2", vad=False, backend=None, compute_type=None):
+    """
+    Transcribe with whisper_timestamped, using a selectable model_size.
+    Common valid options include: 'tiny', 'base', 'small', 'medium',
+    'large', 'large-v2', 'large-v3', and variants you have installed.
+
+    `source` is a media file path, or a 16 kHz mono float32 array (see
+    to_whisper_audio) when the audio is already in memory.
+
+    With vad=True, silence is detected first and only the packed speech
+    regions go through the model; word times are mapped back onto the
+    original timeline. Much faster on long recordings with many pauses.
+
+    `backend` picks an entry of TRANSCRIBE_BACKENDS (default:
+    DEFAULT_TRANSCRIBE_BACKEND); 'faster_whisper' runs CTranslate2 with the
+    given `compute_type` (e.g. int8 on CPU-only machines, int8_float16 on GPU).
+
+    Results are cached on disk (TRANSCRIPT_CACHE) by a hash of the 16 kHz
+    audio plus the model and decode settings, so style-only reruns skip
+    transcription entirely.
+
+    We keep a defensive fallback to 'large-v2' if a bad model name is passed.
+    The model comes from WHISPER_POOL and stays loaded for the next job.
+    """
+    backend = backend or DEFAULT_TRANSCRIBE_BACKEND
+    compute_type = compute_type or DEFAULT_COMPUTE_TYPE
+    if backend not in TRANSCRIBE_BACKENDS:
+        print(f"[Whisper] Unknown backend '{backend}', using 'whisper_timestamped'.")
+        backend = "whisper_timestamped"
+    engine = TRANSCRIBE_BACKENDS[backend]
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    print(f"Using device: {device} | backend: {backend} | requested model: {model_size}")
+
+    audio = source if isinstance(source, np.ndarray) else decode_audio(source, sr=WHISPER_SR, channels=1)[0]
+    key = transcript_cache_key(audio, model_size, backend, compute_type, device, vad)
+    words = TRANSCRIPT_CACHE.load(key)
+    if words is not None:
+        print(f"[Whisper] Transcript cache hit ({len(words)} words), skipping transcription.")
+        return words
+
+    cacheable = True
+    with stage_slot("gpu" if device == "cuda" else "cpu"), contextlib.ExitStack() as leases:
         try:
-            del model
-        except Exception:
-            pass
-        free_vram(tag="after_whisper")
+            try:
+                model = leases.enter_context(engine.load(model_size, device, compute_type))
+            except ImportError:
+                raise
+            except Exception as e:
+                print(f"[Whisper] Failed to load model '{model_size}': {e}. Falling back to 'large-v2'.")
+                model = leases.enter_context(engine.load("large-v2", device, compute_type))
+                cacheable = False  # the key names the model that was asked for
+            words = _transcribe_words(engine, model, audio, vad)
+        finally:
+            # Drop per-call activations; the pooled model itself stays warm
+            free_vram(tag="after_whisper")
+
+    if cacheable:
+        TRANSCRIPT_CACHE.store(key, words)
+    return words
 
 def make_ass_subtitle_stable(
     words, out_ass_path, input_video,
@@ -1227,8 +2943,14 @@ def make_ass_subtitle_stable(
     bold=0, italic=0, underline=0, strikeout=0,
     scale_x=100, scale_y=100, spacing=0, angle=0,
     border_style=1, outline=3, shadow=1, alignment=2,
-    marginl=10, marginr=10,
+    marginl=10, marginr=10, highlight_mode="layers",
 ):
+    """
+    Write the karaoke-style .ass file. highlight_mode="layers" (default) draws
+    a base line plus one Highlight-layer Dialogue per word; "inline" emits one
+    Dialogue per segment whose words switch colour with timed \\t overrides,
+    so the event count (and libass layout work) scales with segments.
+    """
     print(f"ASS highlight_color: {highlight_color}")
     width, height = get_video_resolution(input_video)
     header = f"""[Script Info]
@@ -1244,13 +2966,24 @@ def make_ass_subtitle_stable(
     [Events]
     Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
     """
-    events = ""
+    with open(out_ass_path, "w", encoding="utf-8") as f:
+        f.write(header)
+        for seg in group_caption_segments(words, max_sentences=max_sentences, max_words=max_words):
+            if highlight_mode == "inline":
+                write_inline_highlight_events(f, seg, primary_color, highlight_color)
+            else:
+                write_layered_highlight_events(f, seg)
+
+def group_caption_segments(words, max_sentences=1, max_words=10, max_gap=1.5):
+    """
+    Split the word list into caption segments: a segment ends after
+    `max_sentences` sentences, `max_words` words, or before a pause longer
+    than `max_gap` seconds.
+    """
     segments = []
     cur_segment = []
     sentence_count = 0
     word_count = 0
-    last_end = 0
-    max_gap = 1.5
 
     sentence_enders = re.compile(r'[\.\?\!]+$')
 
@@ -1269,45 +3002,82 @@ def make_ass_subtitle_stable(
             cur_segment = []
             sentence_count = 0
             word_count = 0
+    return segments
+
+HIGHLIGHT_MODES = ["layers", "inline"]
+
+# Flicker-proof timing
+MIN_WORD_DURATION = 0.12  # seconds; adjust ~0.15–0.22 to taste
+BASE_LAYER = 0
+HILITE_LAYER = 1
+
+def highlight_word_times(seg):
+    """(start, end) of each word's highlight: at least MIN_WORD_DURATION, never past the next word."""
+    seg_end = seg[-1]['end']
+    times = []
+    for i, w in enumerate(seg):
+        next_start = seg[i + 1]['start'] if i < len(seg) - 1 else seg_end
+        w_start = w['start']
+        # Ensure minimum visibility, but don't exceed segment end
+        w_end = max(w['end'], w_start + MIN_WORD_DURATION)
+        w_end = min(w_end, next_start)
+        times.append((w_start, w_end))
+    return times
+
+def write_layered_highlight_events(out, seg):
+    """
+    Write one segment as an always-on base line plus one Highlight-layer
+    line per word. Each highlighted line is spliced from the joined segment
+    text at precomputed word offsets instead of re-joining every word.
+    """
+    seg_start = seg[0]['start']
+    seg_end = seg[-1]['end']
+    seg_words = [w['word'] for w in seg]
+    seg_text = " ".join(seg_words)
+
+    # 1) Always-on base line for the whole segment (no pre-roll before first word)
+    out.write(f"Dialogue: {BASE_LAYER},{format_time(seg_start)},{format_time(seg_end)},Default,,0,0,0,,{seg_text}\n")
+
+    # 2) Word highlights on a higher layer, no artificial gap
+    offset = 0
+    for word, (w_start, w_end) in zip(seg_words, highlight_word_times(seg)):
+        word_end = offset + len(word)
+        # Keep at least ~1 cs after rounding
+        if w_end - w_start >= 0.01:
+            out.write(
+                f"Dialogue: {HILITE_LAYER},{format_time(w_start)},{format_time(w_end)},Default,,0,0,0,,"
+                f"{seg_text[:offset]}{{\\rHighlight}}{word}{{\\r}}{seg_text[word_end:]}\n"
+            )
+        offset = word_end + 1
 
-    # Flicker-proof timing
-    MIN_WORD_DURATION = 0.12  # seconds; adjust ~0.15–0.22 to taste
-    BASE_LAYER = 0
-    HILITE_LAYER = 1
-
-    for seg in segments:
-        seg_start = seg[0]['start']
-        seg_end = seg[-1]['end']
-        seg_text = " ".join(w['word'] for w in seg)
+def ass_override_color(color):
+    """'&H00BBGGRR&' style colour -> '&HBBGGRR&' for \\1c override tags."""
+    digits = re.sub(r"[^0-9A-Fa-f]", "", color.upper().replace("&H", ""))
+    return f"&H{digits[-6:].rjust(6, '0')}&"
 
-        # 1) Always-on base line for the whole segment (no pre-roll before first word)
-        events += (
-            f"Dialogue: {BASE_LAYER},{format_time(seg_start)},{format_time(seg_end)},Default,,0,0,0,,{seg_text}\n"
-        )
-        # 2) Word highlights on a higher layer, no artificial gap
-        for i, w in enumerate(seg):
-            next_start = seg[i + 1]['start'] if i < len(seg) - 1 else seg_end
-            w_start = w['start']
-            # Ensure minimum visibility, but don't exceed segment end
-            w_end = max(w['end'], w_start + MIN_WORD_DURATION)
-            w_end = min(w_end, next_start)
-
-            # Build text with only the i-th word highlighted
-            parts = []
-            for j, ww in enumerate(seg):
-                if j == i:
-                    parts.append(r"{\rHighlight}" + ww['word'] + r"{\r}")
-                else:
-                    parts.append(ww['word'])
-            text = " ".join(parts)
-
-            # Keep at least ~1 cs after rounding
-            if w_end - w_start >= 0.01:
-                events += (
-                    f"Dialogue: {HILITE_LAYER},{format_time(w_start)},{format_time(w_end)},Default,,0,0,0,,{text}\n"
-                )
-    with open(out_ass_path, "w", encoding="utf-8") as f:
-        f.write(header + events)
+def write_inline_highlight_events(out, seg, primary_color, highlight_color):
+    """
+    Write one segment as a single Dialogue. Every word carries its own
+    override block: reset to the primary colour, then \\t transforms that
+    switch to the highlight colour at the word's start and back at its end
+    (times in ms relative to the event start).
+    """
+    seg_start = seg[0]['start']
+    seg_end = seg[-1]['end']
+    base = ass_override_color(primary_color)
+    hilite = ass_override_color(highlight_color)
+    # The event starts at the centisecond format_time() writes
+    event_start = round(max(0.0, seg_start) * 100) / 100.0
+
+    parts = []
+    for i, (w, (w_start, w_end)) in enumerate(zip(seg, highlight_word_times(seg))):
+        tags = f"\\1c{base}" if i else ""
+        if w_end - w_start >= 0.01:
+            on = max(0, int(round((w_start - event_start) * 1000)))
+            off = max(on + 1, int(round((w_end - event_start) * 1000)))
+            tags += f"\\t({on},{on + 1},\\1c{hilite})\\t({off},{off + 1},\\1c{base})"
+        parts.append(f"{{{tags}}}{w['word']}" if tags else w['word'])
+    out.write(f"Dialogue: {BASE_LAYER},{format_time(seg_start)},{format_time(seg_end)},Default,,0,0,0,,{' '.join(parts)}\n")
 
 def format_time(seconds):
     # Round to nearest centisecond to avoid micro-gaps at boundaries
@@ -1331,10 +3101,375 @@ def burn_subtitles_ffmpeg(input_video, ass_path, output_video, video_codec="hevc
         output_video
     ], check=True)
 
+def list_video_packets(video_path):
+    """
+    Presentation times (seconds from the file start) of every video packet
+    and of the keyframes among them, from one packet-level ffprobe pass
+    (no decoding).
+    """
+    out = subprocess.run([
+        "ffprobe", "-v", "error", "-select_streams", "v:0",
+        "-show_entries", "packet=pts_time,flags", "-of", "csv=p=0", video_path
+    ], capture_output=True, text=True, check=True).stdout
+    try:
+        start = float(probe_media(video_path).get("format", {}).get("start_time", 0.0))
+    except (TypeError, ValueError):
+        start = 0.0
+    times, keyframes = [], []
+    for line in out.splitlines():
+        fields = line.strip().split(",")
+        if len(fields) < 2 or fields[0] in ("", "N/A"):
+            continue
+        t = float(fields[0]) - start
+        times.append(t)
+        if "K" in fields[1]:
+            keyframes.append(t)
+    return np.sort(np.array(times, dtype=np.float64)), sorted(set(keyframes))
+
+def plan_keyframe_ranges(frame_times, keyframes, pieces, min_seconds=BURN_MIN_SEGMENT_SECONDS):
+    """
+    Split the timeline at the keyframes nearest to `pieces` equal parts.
+    Returns [(start_sec, end_sec or None, frame_count), ...]; a range holds
+    every frame whose pts is in [start, end).
+    """
+    if len(frame_times) == 0:
+        return []
+    first, last = float(frame_times[0]), float(frame_times[-1])
+    candidates = np.array([k for k in keyframes if first + min_seconds <= k <= last - min_seconds])
+    bounds = [first]
+    for i in range(1, pieces):
+        if not len(candidates):
+            break
+        target = first + (last - first) * i / pieces
+        k = float(candidates[np.argmin(np.abs(candidates - target))])
+        if k - bounds[-1] >= min_seconds:
+            bounds.append(k)
+    edges = np.searchsorted(frame_times, bounds + [np.inf], side="left")
+    ends = bounds[1:] + [None]
+    return [(bounds[i], ends[i], int(edges[i + 1] - edges[i])) for i in range(len(bounds))]
+
+def parse_ass_time(value):
+    h, m, sec = value.strip().split(":")
+    return int(h) * 3600 + int(m) * 60 + float(sec)
+
+def write_ass_slice(ass_path, out_path, start, end):
+    """Copy the .ass header plus only the Dialogue events overlapping [start, end]."""
+    with open(ass_path, "r", encoding="utf-8") as src, open(out_path, "w", encoding="utf-8") as dst:
+        for line in src:
+            if line.lstrip().startswith("Dialogue:"):
+                fields = line.split(",", 3)
+                if parse_ass_time(fields[2]) < start or (end is not None and parse_ass_time(fields[1]) > end):
+                    continue
+            dst.write(line)
+
+def count_video_frames(video_path):
+    out = subprocess.run([
+        "ffprobe", "-v", "error", "-select_streams", "v:0", "-count_packets",
+        "-show_entries", "stream=nb_read_packets", "-of", "csv=p=0", video_path
+    ], capture_output=True, text=True, check=True).stdout
+    return int(out.strip().split(",")[0] or 0)
+
+def _burn_piece(input_video, ass_path, piece_path, start, frame_count, video_codec, qp):
+    ass_escaped = os.path.abspath(ass_path).replace("\\", "\\\\").replace(":", "\\:")
+    # Input seek just before the keyframe; -copyts/-start_at_zero keep the
+    # file-relative timestamps the ass filter expects, setpts rebases the piece.
+    subprocess.run([
+        "ffmpeg", "-y", "-v", "error",
+        "-copyts", "-start_at_zero",
+        "-ss", f"{max(0.0, start - 0.0005):.6f}", "-i", input_video,
+        "-map", "0:v:0", "-an",
+        "-vf", f"ass='{ass_escaped}',setpts=PTS-STARTPTS",
+        "-frames:v", str(frame_count), "-fps_mode", "passthrough",
+        "-c:v", video_codec,
+        "-rc", "constqp", "-qp", qp,
+        piece_path
+    ], check=True)
+    return count_video_frames(piece_path)
+
+def burn_subtitles_parallel(input_video, ass_path, output_video, video_codec="hevc_nvenc", qp="30",
+                            workers=BURN_WORKERS):
+    """
+    burn_subtitles_ffmpeg split across `workers` ffmpeg processes: the video
+    is cut at keyframes, each piece is burned with its slice of the .ass,
+    then the pieces are concatenated losslessly and the original audio is
+    copied back in. If any piece's frame count doesn't match the source
+    range, the whole burn falls back to the single-process path.
+
+    The whole burn holds min(workers, STAGE_LIMITS["encode"]) encode slots
+    (at least one), so its pieces run `workers` wide but no other job encodes
+    alongside beyond the limit; callers must not hold an encode slot around
+    this call.
+    """
+    workers = int(workers or 1)
+    with stage_slot("encode", workers):
+        return _burn_subtitles_parallel(input_video, ass_path, output_video, video_codec, qp, workers)
+
+def _burn_subtitles_parallel(input_video, ass_path, output_video, video_codec, qp, workers):
+    def burn_in_one_pass():
+        return burn_subtitles_ffmpeg(input_video, ass_path, output_video, video_codec, qp)
+
+    if workers <= 1:
+        return burn_in_one_pass()
+    frame_times, keyframes = list_video_packets(input_video)
+    ranges = plan_keyframe_ranges(frame_times, keyframes, workers)
+    if len(ranges) < 2:
+        print("[Burn] Video too short or too few keyframes to split; burning in one pass.")
+        return burn_in_one_pass()
+
+    print(f"[Burn] Burning {len(ranges)} keyframe-aligned pieces with {workers} workers...")
+    with job_workspace(prefix="wordlight_burn_", dir=os.path.dirname(os.path.abspath(output_video))) as burn_dir:
+        jobs = []
+        failure = None
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for i, (start, end, frames) in enumerate(ranges):
+                slice_path = os.path.join(burn_dir, f"captions_{i:03d}.ass")
+                piece_path = os.path.join(burn_dir, f"piece_{i:03d}.mkv")
+                write_ass_slice(ass_path, slice_path, start, end)
+                jobs.append((piece_path, frames, pool.submit(
+                    _burn_piece, input_video, slice_path, piece_path, start, frames, video_codec, qp)))
+            for future in as_completed([future for _, _, future in jobs]):
+                failure = future.exception()
+                if failure is not None:
+                    # Don't start the queued pieces; only the running ones are waited for
+                    for _, _, pending in jobs:
+                        pending.cancel()
+                    break
+        if failure is not None:
+            if not isinstance(failure, subprocess.CalledProcessError):
+                raise failure
+            print(f"⚠️ [Burn] A segment failed ({failure}); burning in one pass instead.")
+            return burn_in_one_pass()
+        counts = [(piece_path, frames, future.result()) for piece_path, frames, future in jobs]
+
+        for piece_path, expected, got in counts:
+            if got != expected:
+                print(f"⚠️ [Burn] {os.path.basename(piece_path)} has {got} frames, expected {expected}; "
+                      "burning in one pass instead.")
+                return burn_in_one_pass()
+
+        list_path = os.path.join(burn_dir, "pieces.txt")
+        with open(list_path, "w", encoding="utf-8") as f:
+            for piece_path, _, _ in counts:
+                f.write(f"file '{os.path.abspath(piece_path)}'\n")
+        subprocess.run([
+            "ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", list_path,
+            "-i", input_video,
+            "-map", "0:v:0", "-map", "1:a?",
+            "-c", "copy",
+            output_video
+        ], check=True)
+    print(f"[Burn] Joined {len(ranges)} pieces ({len(frame_times)} frames).")
+
+def music_fade_params(duration):
+    if duration is None or duration < 7:
+        fade_start = max(0, duration - 2) if duration else 0
+        fade_dur = min(2, duration) if duration else 2
+    else:
+        fade_start = duration - 5
+        fade_dur = 5
+    return fade_start, fade_dur
+
+
+def build_music_mix_filter(speech_in, music_in, duration, bgm_volume, enable_compand, out_label="mixout"):
+    """
+    Audio half of the filter graph: normalise speech, fade/duck the looped
+    background music under it and merge both into [out_label].
+    """
+    fade_start, fade_dur = music_fade_params(duration)
+
+    # Optionally apply COMPAND to the main (speech) track after denoising and before music.
+    compand_expr = "compand=0|0:1|1:-90/-900|-70/-70|-30/-9|0/-3:6:0:-90:0.02"
+    compand_prefix = (compand_expr + ",") if enable_compand else ""
+
+    return (
+        f"[{speech_in}]{compand_prefix}dynaudnorm=f=500:g=15:m=10:r=0.95:b=1[main];"
+        f"[{music_in}]afade=t=out:st={fade_start:.2f}:d={fade_dur:.2f},dynaudnorm=f=500:g=15:m=10:r=0.95[pbg];"
+        f"[main]asplit=2[maina][mainb];"
+        f"[pbg]volume={bgm_volume:.2f}[bg];"
+        f"[bg][maina]sidechaincompress=threshold=0.01:ratio=5:attack=50:release=50[compr];"
+        f"[compr][mainb]amerge[{out_label}]"
+    )
+
+
+def detect_keep_ranges_auto_editor(audio_path, threshold, margin, framerate):
+    """
+    Ask auto-editor for its cut list only (v1 JSON timeline export, no render)
+    and return the kept parts as [(start_sec, end_sec), ...].
+    """
+    fps = framerate or 30.0
+    fd, timeline_json = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        subprocess.run([
+            "auto-editor", audio_path,
+            "--edit", f"audio:threshold={threshold:.2f}", "--margin", f"{margin:.1f}s",
+            "--frame-rate", f"{fps:.6f}",
+            "--export", "v1", "--no-open",
+            "-o", timeline_json
+        ], check=True)
+        with open(timeline_json, "r", encoding="utf-8") as f:
+            timeline = json.load(f)
+    finally:
+        if os.path.exists(timeline_json):
+            os.remove(timeline_json)
+    ranges = []
+    for start, end, speed in timeline.get("chunks", []):
+        # auto-editor marks removed chunks with speed 0 or 99999
+        if speed <= 0 or speed >= 99999:
+            continue
+        start_s, end_s = start / fps, end / fps
+        if ranges and abs(ranges[-1][1] - start_s) < 1e-9:
+            ranges[-1] = (ranges[-1][0], end_s)
+        else:
+            ranges.append((start_s, end_s))
+    return ranges
+
+
+# Native silence detection, mirroring auto-editor's `--edit audio` defaults.
+SILENCE_BACKENDS = ["native", "auto-editor"]
+SILENCE_MINCLIP_FRAMES = 3  # loud blips shorter than this are treated as silence
+SILENCE_MINCUT_FRAMES = 6   # silences shorter than this are kept
+
+def _fill_short_runs(mask, value, min_len):
+    """In place: runs of `value` shorter than `min_len` frames take the other value."""
+    for start, end in mask_to_runs(mask if value else ~mask):
+        if end - start < min_len:
+            mask[start:end] = not value
+
+def detect_keep_intervals(audio, sr, threshold, margin, framerate):
+    """
+    auto-editor's audio edit on the in-memory speech: a frame is loud when its
+    peak, relative to the loudest frame, reaches `threshold`; loud runs under
+    SILENCE_MINCLIP_FRAMES and silent runs under SILENCE_MINCUT_FRAMES are
+    dropped, then every loud run is widened by `margin` seconds on both sides.
+    Returns [(start_sec, end_sec), ...] at frame resolution.
+    """
+    fps = framerate or 30.0
+    loud = frame_peak_levels(audio, sr, fps) >= threshold
+    if not loud.any():
+        return []
+    _fill_short_runs(loud, True, SILENCE_MINCLIP_FRAMES)
+    _fill_short_runs(loud, False, SILENCE_MINCUT_FRAMES)
+    pad = int(round(margin * fps))
+    total = len(loud)
+    ranges = []
+    for start, end in mask_to_runs(loud):
+        start, end = max(0, start - pad), min(total, end + pad)
+        if ranges and start <= ranges[-1][1]:
+            ranges[-1] = (ranges[-1][0], max(ranges[-1][1], end))
+        else:
+            ranges.append((start, end))
+    return [(float(s) / fps, float(e) / fps) for s, e in ranges]
+
+def snap_ranges_to_frames(ranges, framerate, max_duration=None):
+    """
+    Round range edges to whole frames and merge overlaps, so the audio cut at
+    sample precision stays in sync with the frame-based video cut.
+    """
+    fps = framerate or 30.0
+    snapped = []
+    for start, end in sorted(ranges):
+        if max_duration is not None:
+            end = min(end, max_duration)
+        start_f = int(round(max(0.0, start) * fps))
+        end_f = int(round(end * fps))
+        if end_f <= start_f:
+            continue
+        if snapped and start_f <= snapped[-1][1]:
+            snapped[-1] = (snapped[-1][0], max(snapped[-1][1], end_f))
+        else:
+            snapped.append((start_f, end_f))
+    return [(s / fps, e / fps) for s, e in snapped]
+
+
+def cut_audio_to_ranges(data, sr, ranges):
+    pieces = [data[int(round(s * sr)):int(round(e * sr))] for s, e in ranges]
+    if not pieces:
+        return data[:0]
+    return np.concatenate(pieces, axis=0)
+
+
+def build_select_expr(ranges, framerate):
+    # Half-frame offset so each frame is judged by the slot it starts in,
+    # regardless of float jitter in its timestamp.
+    half = 0.5 / (framerate or 30.0)
+    return "+".join(f"between(t,{s - half:.6f},{e - half:.6f})" for s, e in ranges)
+
+
+def cut_video_with_speech(input_video, speech_wav, keep_ranges, output_video, framerate,
+                          video_codec="hevc_nvenc", qp="30", work_dir=None):
+    """
+    Mux the (already cut) speech onto the source video while dropping the
+    silent ranges with a select filter: silence removal in the same encode,
+    with no separate auto-editor render. The filter script goes in
+    `work_dir` (the job workspace) when given.
+    """
+    duration = sum(e - s for s, e in keep_ranges)
+    fd, script_path = tempfile.mkstemp(suffix=".ffgraph", dir=work_dir)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(f"[0:v]select='{build_select_expr(keep_ranges, framerate)}',setpts=N/FRAME_RATE/TB[vout]")
+    try:
+        subprocess.run([
+            "ffmpeg", "-y",
+            "-i", input_video,
+            "-i", speech_wav,
+            "-filter_complex_script", script_path,
+            "-map", "[vout]", "-map", "1:a:0",
+            "-c:v", video_codec,
+            "-rc", "constqp", "-qp", qp,
+            "-pix_fmt", "yuv420p",
+            "-c:a", "aac", "-b:a", "320k",
+            "-t", f"{duration:.6f}",
+            output_video
+        ], check=True)
+    finally:
+        os.remove(script_path)
+
+
+def render_single_pass(
+    input_video, speech_wav, background_audio, keep_ranges, ass_path, output_video,
+    framerate, bgm_volume, enable_compand, video_codec="hevc_nvenc", qp="30", work_dir=None
+):
+    """
+    One decode/encode of the source video: drop the silent ranges, burn the
+    captions and mix the (already cut) speech with ducked background music.
+    The filter script goes in `work_dir` (the job workspace) when given.
+    """
+    duration = sum(e - s for s, e in keep_ranges)
+    ass_escaped = os.path.abspath(ass_path).replace("\\", "\\\\").replace(":", "\\:")
+    select_expr = build_select_expr(keep_ranges, framerate)
+    filter_complex = (
+        f"[0:v]select='{select_expr}',setpts=N/FRAME_RATE/TB,ass='{ass_escaped}'[vout];"
+        + build_music_mix_filter("1:a", "2:a", duration, bgm_volume, enable_compand)
+    )
+    # The select expression grows with the number of cuts; a script file keeps
+    # us clear of command-line length limits on Windows.
+    fd, script_path = tempfile.mkstemp(suffix=".ffgraph", dir=work_dir)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(filter_complex)
+    try:
+        subprocess.run([
+            "ffmpeg", "-y",
+            "-i", input_video,
+            "-i", speech_wav,
+            "-stream_loop", "-1", "-i", background_audio,
+            "-filter_complex_script", script_path,
+            "-map", "[vout]", "-map", "[mixout]",
+            "-c:v", video_codec,
+            "-rc", "constqp", "-qp", qp,
+            "-pix_fmt", "yuv420p",
+            "-c:a", "aac", "-b:a", "320k",
+            "-ac", "2",
+            "-t", f"{duration:.6f}",
+            output_video
+        ], check=True)
+    finally:
+        os.remove(script_path)
+
+
 def save_gradio_file(fileobj, out_path):
     # If it's a file path string
     if isinstance(fileobj, str):
-        import shutil
         shutil.copyfile(fileobj, out_path)
     # If it's a file-like object with read()
     elif hasattr(fileobj, "read"):
@@ -1348,6 +3483,32 @@ def save_gradio_file(fileobj, out_path):
     else:
         raise Exception(f"Invalid file object type: {type(fileobj)}")
 
+# Cancel flags of the web UI's running jobs, keyed by a per-click token
+_GRADIO_JOBS = {}
+_GRADIO_JOBS_LOCK = threading.Lock()
+
+def new_job_token():
+    return uuid.uuid4().hex
+
+def register_gradio_job(token):
+    event = threading.Event()
+    if token:
+        with _GRADIO_JOBS_LOCK:
+            _GRADIO_JOBS[token] = event
+    return event
+
+def unregister_gradio_job(token):
+    with _GRADIO_JOBS_LOCK:
+        _GRADIO_JOBS.pop(token, None)
+
+def cancel_gradio_job(token):
+    """Ask a running job to stop at its next stage boundary (queued jobs are dropped by Gradio)."""
+    with _GRADIO_JOBS_LOCK:
+        event = _GRADIO_JOBS.get(token)
+    if event is not None:
+        print("[Scheduler] Cancelling job...")
+        event.set()
+
 def gradio_main(
     input_videos, background_audio, bypass_auto, edit_transcript,
     subtitle_font, font_size, marginv, threshold, margin,
@@ -1363,11 +3524,16 @@ def gradio_main(
     bold=False, italic=False, underline=False, strikeout=False,
     scale_x=100, scale_y=100, spacing=0, angle=0,
     border_style=1, outline=3, shadow=1, alignment=2,
-    marginl=10, marginr=10, transcribe_model="large-v2"
+    marginl=10, marginr=10, transcribe_model="large-v2", single_pass=False,
+    dfn_workers=DFN_WORKERS, dfn_threads_per_worker=DFN_THREADS_PER_WORKER,
+    demucs_preset=DEMUCS_DEFAULT_PRESET, transcribe_vad=False,
+    transcribe_backend=None, transcribe_compute_type=None, highlight_mode="layers",
+    burn_workers=BURN_WORKERS, silence_backend="native", cancel_token=None
 ):
     print(f"Gradio highlight_color_hex: {highlight_color_hex}")
     outputs_folder = get_outputs_folder()
-    base_name = f"Processed_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    # Unique per job: several queued jobs can start within the same second
+    base_name = f"Processed_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
     # Accepts single or multiple files from gradio
     if isinstance(input_videos, list):
         video_paths = []
@@ -1384,36 +3550,63 @@ def gradio_main(
     background_audio_path = os.path.join(outputs_folder, base_name + "_bgm" + (os.path.splitext(getattr(background_audio, 'name', ''))[-1] or ".mp3"))
     save_gradio_file(background_audio, background_audio_path)
 
-    # Merge if selected
+    # Merge if selected; otherwise every selected video becomes its own job
     if merge_videos and len(video_paths) > 1:
         merged_path = os.path.join(outputs_folder, base_name + "_merged.mp4")
         merge_videos_ffmpeg(video_paths, merged_path)
-        video_input_for_main = merged_path
+        inputs_for_main = [merged_path]
     else:
-        video_input_for_main = video_paths[0]
-
-    output_file = main(
-        video_input_for_main, background_audio_path, bypass_auto, edit_transcript,
-        subtitle_font, int(font_size), int(marginv), float(threshold), float(margin),
-        demucs_model, demucs_device, float(bgm_volume), bool(enable_compand),
-        int(max_sentences), int(max_words),
-        float(nr_propdec), nr_stationary, int(nr_freqsmooth),
-        int(lp_cutoff),
-        use_demucs, use_noisereduce, use_lowpass, use_voicefixer,
-        vf_mode, use_deepfilternet, use_pyrnnoise,
-        primary_color_hex, highlight_color_hex,
-        video_codec, qp,
+        inputs_for_main = video_paths
+
+    cancel_event = register_gradio_job(cancel_token)
+    job = dict(
+        background_audio=background_audio_path, bypass_auto=bypass_auto, edit_transcript=edit_transcript,
+        subtitle_font=subtitle_font, font_size=int(font_size), marginv=int(marginv),
+        threshold=float(threshold), margin=float(margin),
+        demucs_model=demucs_model, demucs_device=demucs_device, bgm_volume=float(bgm_volume),
+        enable_compand=bool(enable_compand),
+        max_sentences=int(max_sentences), max_words=int(max_words),
+        nr_propdec=float(nr_propdec), nr_stationary=nr_stationary, nr_freqsmooth=int(nr_freqsmooth),
+        lp_cutoff=int(lp_cutoff),
+        use_demucs=use_demucs, use_noisereduce=use_noisereduce, use_lowpass=use_lowpass, use_voicefixer=use_voicefixer,
+        vf_mode=vf_mode, use_deepfilternet=use_deepfilternet, use_pyrnnoise=use_pyrnnoise,
+        primary_color_hex=primary_color_hex, highlight_color_hex=highlight_color_hex,
+        video_codec=video_codec, qp=qp,
         outputs_folder=outputs_folder,
-        output_basename=base_name,
         secondary_color=secondary_color_hex,
         outline_color=outline_color_hex,
         back_color=back_color_hex,
         bold=int(bold), italic=int(italic), underline=int(underline), strikeout=int(strikeout),
         scale_x=int(scale_x), scale_y=int(scale_y), spacing=int(spacing), angle=int(angle),
         border_style=int(border_style), outline=int(outline), shadow=int(shadow), alignment=int(alignment),
-        marginl=int(marginl), marginr=int(marginr), transcribe_model=transcribe_model
+        marginl=int(marginl), marginr=int(marginr), transcribe_model=transcribe_model,
+        single_pass=bool(single_pass),
+        dfn_workers=int(dfn_workers), dfn_threads_per_worker=int(dfn_threads_per_worker),
+        demucs_preset=demucs_preset, transcribe_vad=bool(transcribe_vad),
+        transcribe_backend=transcribe_backend, transcribe_compute_type=transcribe_compute_type,
+        highlight_mode=highlight_mode, burn_workers=int(burn_workers),
+        silence_backend=silence_backend, cancel_event=cancel_event,
     )
-    return output_file
+    if len(inputs_for_main) == 1:
+        jobs = [dict(job, input_video=inputs_for_main[0], output_basename=base_name)]
+    else:
+        jobs = [dict(job, input_video=path, output_basename=f"{base_name}_{idx}")
+                for idx, path in enumerate(inputs_for_main)]
+    try:
+        # The Gradio queue already runs GRADIO_CONCURRENT_JOBS requests at
+        # once; a request's own files go one after another so that stays the
+        # real number of pipelines in flight.
+        results = run_batch(jobs, max_jobs=1)
+    finally:
+        unregister_gradio_job(cancel_token)
+    errors = [error for _, _, error in results if error is not None]
+    if any(isinstance(error, JobCancelled) for error in errors):
+        print(f"[Scheduler] Job {base_name} cancelled.")
+        return None
+    outputs = [output for _, output, _ in results if output]
+    if errors and not outputs:
+        raise errors[0]
+    return outputs[0] if len(jobs) == 1 else outputs
 
 def extract_frame(video_path, time=10, out_path="preview_frame.jpg"):
     cmd = [
@@ -1427,7 +3620,34 @@ def extract_frame(video_path, time=10, out_path="preview_frame.jpg"):
     return out_path
 
 
+def render_preview_frame(video_path, preview_time, ass_path):
+    """
+    Burn `ass_path` onto the frame at `preview_time`, writing the JPEG next to
+    the .ass. Returns (PIL image loaded into memory or None, ffmpeg stderr).
+    """
+    preview_img_path = os.path.join(os.path.dirname(ass_path), "preview.jpg")
+    # Escape for ffmpeg ASS filter on Windows:
+    ass_path_escaped = os.path.abspath(ass_path).replace("\\", "\\\\").replace(":", "\\:")
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-ss", str(preview_time),
+        "-i", video_path,
+        "-frames:v", "1",
+        "-vf", f"ass='{ass_path_escaped}'",
+        preview_img_path
+    ]
+    print("Running ffmpeg preview command:", " ".join(cmd))
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0 or not os.path.exists(preview_img_path):
+        print("FFmpeg preview failed:", result.stderr)
+        return None, result.stderr
+    with Image.open(preview_img_path) as img:
+        return img.copy(), result.stderr
+
+
 def get_font_path_by_name(font_name):
+    font_name_to_path = get_font_map()
     # Try direct match first (Windows font registry)
     if font_name in font_name_to_path:
         return font_name_to_path[font_name]
@@ -1534,62 +3754,40 @@ def preview_caption_gradio(
     duration = get_video_duration(video_path)
     preview_time = 0 if not duration or duration < 2 else min(duration * 0.5, duration - 0.2)
 
-    outputs_dir = get_outputs_folder()
-    preview_img_path = os.path.join(outputs_dir, "gradio_ffmpeg_preview.jpg")
-    preview_ass_path = os.path.join(outputs_dir, "gradio_preview_caption.ass")
-
-    # Generate preview .ass using the same logic as video
-    width, height = get_video_resolution(video_path)
-    preview_caption = "This is a preview caption!"
-    words = [
-        {'start': 0.0, 'end': 2.0, 'word': 'This'},
-        {'start': 2.0, 'end': 3.0, 'word': 'is'},
-        {'start': 3.0, 'end': 4.0, 'word': 'a'},
-        {'start': 4.0, 'end': 6.0, 'word': 'preview!'},
-    ]
-    # Convert color values to ASS BGR
-    primary_color_ass = hex_to_ass_bgr(primary_color_hex)
-    highlight_color_ass = hex_to_ass_bgr(highlight_color_hex)
-
-    make_ass_subtitle_stable(
-        words, preview_ass_path, video_path,
-        fontsize=int(font_size), fontname=subtitle_font, marginv=int(marginv),
-        max_sentences=1, max_words=10,
-        primary_color=primary_color_ass,
-        highlight_color=highlight_color_ass,
-        secondary_color=hex_to_ass_bgr(secondary_color_hex),
-        outline_color=hex_to_ass_bgr(outline_color_hex),
-        back_color=hex_to_ass_bgr(back_color_hex),
-        bold=int(bold), italic=int(italic), underline=int(underline), strikeout=int(strikeout),
-        scale_x=int(scale_x), scale_y=int(scale_y), spacing=int(spacing), angle=int(angle),
-        border_style=int(border_style), outline=int(outline), shadow=int(shadow), alignment=int(alignment),
-        marginl=int(marginl), marginr=int(marginr)
-    )
-
-    # Use FFmpeg with ASS (with correct Windows escaping)
-    ass_path = os.path.abspath(preview_ass_path)
-    ass_path_escaped = ass_path.replace("\\", "\\\\").replace(":", "\\:")
-    ass_filter = f"ass='{ass_path_escaped}'"
+    with tempfile.TemporaryDirectory(prefix="wordlight_preview_") as tmpdir:
+        # Generate preview .ass using the same logic as video
+        preview_caption = "This is a preview caption!"
+        words = [
+            {'start': 0.0, 'end': 2.0, 'word': 'This'},
+            {'start': 2.0, 'end': 3.0, 'word': 'is'},
+            {'start': 3.0, 'end': 4.0, 'word': 'a'},
+            {'start': 4.0, 'end': 6.0, 'word': 'preview!'},
+        ]
+        # Convert color values to ASS BGR
+        primary_color_ass = hex_to_ass_bgr(primary_color_hex)
+        highlight_color_ass = hex_to_ass_bgr(highlight_color_hex)
 
-    cmd = [
-        "ffmpeg",
-        "-y",
-        "-ss", str(preview_time),
-        "-i", video_path,
-        "-frames:v", "1",
-        "-vf", ass_filter,
-        preview_img_path
-    ]
-    print("Running ffmpeg for Gradio preview:", " ".join(cmd))
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0 or not os.path.exists(preview_img_path):
-        print("FFmpeg preview failed:", result.stderr)
-        return None
+        make_ass_subtitle_stable(
+            words, os.path.join(tmpdir, "preview.ass"), video_path,
+            fontsize=int(font_size), fontname=subtitle_font, marginv=int(marginv),
+            max_sentences=1, max_words=10,
+            primary_color=primary_color_ass,
+            highlight_color=highlight_color_ass,
+            secondary_color=hex_to_ass_bgr(secondary_color_hex),
+            outline_color=hex_to_ass_bgr(outline_color_hex),
+            back_color=hex_to_ass_bgr(back_color_hex),
+            bold=int(bold), italic=int(italic), underline=int(underline), strikeout=int(strikeout),
+            scale_x=int(scale_x), scale_y=int(scale_y), spacing=int(spacing), angle=int(angle),
+            border_style=int(border_style), outline=int(outline), shadow=int(shadow), alignment=int(alignment),
+            marginl=int(marginl), marginr=int(marginr)
+        )
 
-    return preview_img_path
+        img, _ffmpeg_error = render_preview_frame(video_path, preview_time, os.path.join(tmpdir, "preview.ass"))
+    # An in-memory image: concurrent previews never share a file on disk
+    return img
 
 def launch_gradio():
-    if not _GRADIO_AVAILABLE:
+    if not module_available(gr):
         print("Gradio is not installed. Run `pip install gradio`.")
         return
     with gr.Blocks() as demo:
@@ -1621,6 +3819,20 @@ def launch_gradio():
                 value="large-v2",
                 label="Whisper Transcription Model"
             )
+            transcribe_backend = gr.Dropdown(
+                choices=list(TRANSCRIBE_BACKENDS),
+                value=DEFAULT_TRANSCRIBE_BACKEND,
+                label="Transcription Backend (faster_whisper = CTranslate2, much faster on CPU)"
+            )
+            transcribe_compute_type = gr.Dropdown(
+                choices=FASTER_WHISPER_COMPUTE_TYPES,
+                value=DEFAULT_COMPUTE_TYPE,
+                label="faster_whisper Compute Type"
+            )
+            transcribe_vad = gr.Checkbox(
+                label="Skip silence before transcribing (VAD-gated, faster on long recordings)",
+                value=False
+            )
 
         # Add a tiny cache so repeated calls don't re-enumerate (fast startup & refresh).
         from functools import lru_cache
@@ -1757,7 +3969,8 @@ def launch_gradio():
         FONT_CHOICES = get_system_fonts()
         subtitle_font = gr.Dropdown(
             choices=FONT_CHOICES,
-            value="Arial" if "Arial" in FONT_CHOICES else (FONT_CHOICES[0] if FONT_CHOICES else ""),
+            value=(PIPELINE_DEFAULTS["subtitle_font"] if PIPELINE_DEFAULTS["subtitle_font"] in FONT_CHOICES
+                   else (FONT_CHOICES[0] if FONT_CHOICES else "")),
             label="Subtitle Font"
         )
         # --- NEW: helper + button to reload fonts on demand (no restart needed) ---
@@ -1785,29 +3998,32 @@ def launch_gradio():
 
 #        font_size.change(update_font_preview, [subtitle_font, font_size, primary_color_hex], font_preview_img)        
         with gr.Accordion("Denoise Options", open=False):
-            use_demucs = gr.Checkbox(label="Enable Demucs Denoising", value=False)
-            demucs_model = gr.Dropdown(choices=DEMUC_MODELS, value="htdemucs_ft", label="Demucs Model")
-            demucs_device = gr.Dropdown(choices=["cuda", "cpu"], value="cuda", label="Demucs Device")      
-            use_noisereduce = gr.Checkbox(label="Enable Noisereduce", value=False)
-            nr_stationary = gr.Checkbox(label="Noisereduce stationary", value=False)
-            nr_propdec = gr.Slider(0.1, 1.0, value=0.75, step=0.01, label="Noisereduce prop_decrease")
-            nr_freqsmooth = gr.Slider(0, 1000, value=500, step=1, label="Noisereduce freq_mask_smooth_hz")
-            use_lowpass = gr.Checkbox(label="Enable Low-Pass Filter", value=False)
-            lp_cutoff = gr.Slider(100, 20000, value=8000, step=100, label="Low-Pass Filter Cutoff (Hz)")
-            use_voicefixer = gr.Checkbox(label="Enable VoiceFixer Enhancement", value=False)
-            vf_mode = gr.Dropdown(choices=VOICEFIXER_MODES, value="2", label="VoiceFixer Mode")
-            use_deepfilternet = gr.Checkbox(label="Enable DeepFilterNet Denoising", value=True)
-            use_pyrnnoise = gr.Checkbox(label="Enable pyrnnoise Denoising", value=True)
+            use_demucs = gr.Checkbox(label="Enable Demucs Denoising", value=PIPELINE_DEFAULTS["use_demucs"])
+            demucs_model = gr.Dropdown(choices=DEMUC_MODELS, value=PIPELINE_DEFAULTS["demucs_model"], label="Demucs Model")
+            demucs_device = gr.Dropdown(choices=["cuda", "cpu"], value=PIPELINE_DEFAULTS["demucs_device"], label="Demucs Device")      
+            demucs_preset = gr.Dropdown(choices=list(DEMUCS_PRESETS), value=DEMUCS_DEFAULT_PRESET, label="Demucs Quality Preset (fast / balanced / best)")
+            use_noisereduce = gr.Checkbox(label="Enable Noisereduce", value=PIPELINE_DEFAULTS["use_noisereduce"])
+            nr_stationary = gr.Checkbox(label="Noisereduce stationary", value=PIPELINE_DEFAULTS["nr_stationary"])
+            nr_propdec = gr.Slider(0.1, 1.0, value=PIPELINE_DEFAULTS["nr_propdec"], step=0.01, label="Noisereduce prop_decrease")
+            nr_freqsmooth = gr.Slider(0, 1000, value=PIPELINE_DEFAULTS["nr_freqsmooth"], step=1, label="Noisereduce freq_mask_smooth_hz")
+            use_lowpass = gr.Checkbox(label="Enable Low-Pass Filter", value=PIPELINE_DEFAULTS["use_lowpass"])
+            lp_cutoff = gr.Slider(100, 20000, value=PIPELINE_DEFAULTS["lp_cutoff"], step=100, label="Low-Pass Filter Cutoff (Hz)")
+            use_voicefixer = gr.Checkbox(label="Enable VoiceFixer Enhancement", value=PIPELINE_DEFAULTS["use_voicefixer"])
+            vf_mode = gr.Dropdown(choices=VOICEFIXER_MODES, value=PIPELINE_DEFAULTS["vf_mode"], label="VoiceFixer Mode")
+            use_deepfilternet = gr.Checkbox(label="Enable DeepFilterNet Denoising", value=PIPELINE_DEFAULTS["use_deepfilternet"])
+            use_pyrnnoise = gr.Checkbox(label="Enable pyrnnoise Denoising", value=PIPELINE_DEFAULTS["use_pyrnnoise"])
+            dfn_workers = gr.Slider(1, max(1, os.cpu_count() or 1), value=DFN_WORKERS, step=1, label="DeepFilterNet Worker Processes")
+            dfn_threads_per_worker = gr.Slider(0, max(1, os.cpu_count() or 1), value=DFN_THREADS_PER_WORKER, step=1, label="DeepFilterNet Threads per Worker (0 = auto)")
 
         
 
         with gr.Accordion("Subtitle Options", open=False):
-            font_size = gr.Slider(18, 200, value=36, label="Font Size")
-            primary_color_hex = gr.ColorPicker(label="Subtitle Color", value="#FFFFFF")
+            font_size = gr.Slider(18, 200, value=PIPELINE_DEFAULTS["font_size"], label="Font Size")
+            primary_color_hex = gr.ColorPicker(label="Subtitle Color", value=PIPELINE_DEFAULTS["primary_color_hex"])
             #primary_color_hex.change(update_font_preview, [subtitle_font, font_size, primary_color_hex], font_preview_img)
             subtitle_font.change(update_font_preview, [subtitle_font, font_size, primary_color_hex], font_preview_img)        
-            highlight_color_hex = gr.ColorPicker(label="Highlight (Spoken Word) Color", value="#FFFF00")        
-            marginv = gr.Slider(0, 400, value=75, label="Caption Vertical Margin")
+            highlight_color_hex = gr.ColorPicker(label="Highlight (Spoken Word) Color", value=PIPELINE_DEFAULTS["highlight_color_hex"])        
+            marginv = gr.Slider(0, 400, value=PIPELINE_DEFAULTS["marginv"], label="Caption Vertical Margin")
             outline_color_hex = gr.ColorPicker(label="Outline Color", value="#000000")
             back_color_hex = gr.ColorPicker(label="Back Color", value="#000000")
             bold = gr.Checkbox(label="Bold", value=False)
@@ -1819,33 +4035,47 @@ def launch_gradio():
             outline = gr.Slider(0, 10, value=3, step=1, label="Outline")
             shadow = gr.Slider(0, 10, value=1, step=1, label="Shadow")
             with gr.Accordion("Advanced Subtitle Style Options", open=False):
-                max_sentences = gr.Slider(1, 5, value=1, step=1, label="Max Sentences per Subtitle")
-                max_words = gr.Slider(3, 25, value=5, step=1, label="Max Words per Subtitle")
+                max_sentences = gr.Slider(1, 5, value=PIPELINE_DEFAULTS["max_sentences"], step=1, label="Max Sentences per Subtitle")
+                max_words = gr.Slider(3, 25, value=PIPELINE_DEFAULTS["max_words"], step=1, label="Max Words per Subtitle")
                 secondary_color_hex = gr.ColorPicker(label="Secondary Color", value="#FF0000", visible=False)
                 marginl = gr.Slider(0, 100, value=10, step=1, label="MarginL")
                 marginr = gr.Slider(0, 100, value=10, step=1, label="MarginR")
                 spacing = gr.Slider(0, 20, value=0, step=1, label="Spacing")
                 alignment = gr.Slider(1, 9, value=2, step=1, label="Alignment")
+                highlight_mode = gr.Dropdown(
+                    choices=HIGHLIGHT_MODES, value="layers",
+                    label="Highlight Mode (inline = one event per caption, faster burn)"
+                )
                 scale_x = gr.Slider(50, 200, value=100, step=1, label="Scale X")
                 scale_y = gr.Slider(50, 200, value=100, step=1, label="Scale Y")
 
         with gr.Accordion("Processing Options", open=False):
-            threshold = gr.Slider(0.01, 0.20, value=0.01, step=0.01, label="Auto-Editor Silence Threshold")
-            margin = gr.Slider(0.1, 2.0, value=0.5, step=0.1, label="Auto-Editor Margin (seconds)")
-            bypass_auto = gr.Checkbox(label="Bypass Auto-Editor (skip silence removal)", value=False)
-            bgm_volume = gr.Slider(0.0, 1.0, value=0.15, step=0.01, label="Background Music Volume")
-            enable_compand = gr.Checkbox(label="Enable COMPAND (post-denoise, pre-music)", value=True)
+            threshold = gr.Slider(0.01, 0.20, value=PIPELINE_DEFAULTS["threshold"], step=0.01, label="Auto-Editor Silence Threshold")
+            margin = gr.Slider(0.1, 2.0, value=PIPELINE_DEFAULTS["margin"], step=0.1, label="Auto-Editor Margin (seconds)")
+            bypass_auto = gr.Checkbox(label="Bypass Auto-Editor (skip silence removal)", value=PIPELINE_DEFAULTS["bypass_auto"])
+            silence_backend = gr.Dropdown(
+                choices=SILENCE_BACKENDS, value="native",
+                label="Silence Detection (native = built-in, no extra encode)"
+            )
+            bgm_volume = gr.Slider(0.0, 1.0, value=PIPELINE_DEFAULTS["bgm_volume"], step=0.01, label="Background Music Volume")
+            enable_compand = gr.Checkbox(label="Enable COMPAND (post-denoise, pre-music)", value=PIPELINE_DEFAULTS["enable_compand"])
             video_codec = gr.Textbox(label="Video Codec ([CPU]: libx264, libx265, libaom-av1, librav1e, libsvtav1; [Nvidia]: hevc_nvenc, h264_nvenc, av1_nvenc; [AMD]: h264_amf, av1_amf, hevc_amf; [Intel]: h264_qsv, hevc_qsv, av1_qsv, vp9_qsv)", value="hevc_nvenc")
             qp = gr.Textbox(label="FFmpeg QP Value (e.g. 0, 23, 30, 40)", value="30")
             merge_videos = gr.Checkbox(label="Merge/Concatenate selected videos into one", value=True)
-            edit_transcript = gr.Checkbox(label="Edit transcript before creating subtitles", value=False)
+            edit_transcript = gr.Checkbox(label="Edit transcript before creating subtitles", value=PIPELINE_DEFAULTS["edit_transcript"])
+            single_pass = gr.Checkbox(label="Single-pass encode (cut, music mix and caption burn in one ffmpeg pass)", value=False)
+            burn_workers = gr.Slider(1, 8, value=BURN_WORKERS, step=1,
+                                     label="Parallel caption burn workers (splits at keyframes; 1 = off)")
         submit = gr.Button("Process Video")
+        cancel_btn = gr.Button("Cancel Job")
+        cancel_token = gr.State(None)
         preview_btn = gr.Button("Preview Caption")
-        preview_img = gr.Image(label="Preview", type="filepath")
+        preview_img = gr.Image(label="Preview", type="pil")
         output_video = gr.File(label="Processed Video")
 
-        # Process Video
-        submit.click(
+        # Process Video: each click gets a fresh token so Cancel can reach the
+        # running job; the queue shows every waiting user their position.
+        process_event = submit.click(new_job_token, None, cancel_token, queue=False).then(
             gradio_main,
             [
                 input_videos, background_audio, bypass_auto, edit_transcript,
@@ -1862,10 +4092,14 @@ def launch_gradio():
                 bold, italic, underline, strikeout,
                 scale_x, scale_y, spacing, angle,
                 border_style, outline, shadow, alignment,
-                marginl, marginr, transcribe_model
+                marginl, marginr, transcribe_model, single_pass,
+                dfn_workers, dfn_threads_per_worker, demucs_preset, transcribe_vad,
+                transcribe_backend, transcribe_compute_type, highlight_mode,
+                burn_workers, silence_backend, cancel_token
             ],
             outputs=output_files
         )
+        cancel_btn.click(cancel_gradio_job, cancel_token, None, cancels=[process_event], queue=False)
 
         # Preview Caption
         preview_btn.click(
@@ -1881,12 +4115,59 @@ def launch_gradio():
             outputs=preview_img
         )
 
+    demo.queue(default_concurrency_limit=GRADIO_CONCURRENT_JOBS, max_size=GRADIO_QUEUE_SIZE)
     demo.launch(server_name='0.0.0.0', share=True)
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="WordLight: word-highlighted captions, denoising and music mixing.")
+    parser.add_argument("--transcribe-backend", choices=list(TRANSCRIBE_BACKENDS), default=DEFAULT_TRANSCRIBE_BACKEND,
+                        help="Speech-to-text engine (default: %(default)s)")
+    parser.add_argument("--compute-type", choices=FASTER_WHISPER_COMPUTE_TYPES, default=DEFAULT_COMPUTE_TYPE,
+                        help="CTranslate2 precision for the faster_whisper backend (default: %(default)s)")
+    parser.add_argument("--max-jobs", type=int, default=GRADIO_CONCURRENT_JOBS,
+                        help="Web UI jobs processed at the same time; the rest wait in the queue (default: %(default)s)")
+    parser.add_argument("--gpu-slots", type=int, default=STAGE_LIMITS["gpu"],
+                        help="Jobs allowed in a GPU-heavy stage (Whisper, Demucs, VoiceFixer) at once (default: %(default)s)")
+    parser.add_argument("--cpu-slots", type=int, default=STAGE_LIMITS["cpu"],
+                        help="Jobs allowed in a CPU-heavy denoise stage at once (default: %(default)s)")
+    parser.add_argument("--encode-slots", type=int, default=STAGE_LIMITS["encode"],
+                        help="Jobs allowed to run a video encode at once (default: %(default)s)")
+    parser.add_argument("--batch-jobs", type=int, default=BATCH_JOBS,
+                        help="Videos processed concurrently when several files are selected without merging (default: %(default)s)")
+    parser.add_argument("--batch", metavar="MANIFEST",
+                        help="Run the jobs in a JSON/YAML manifest without any UI, then exit")
+    parser.add_argument("--state", help="Resume state file for --batch (default: <manifest>.state.json)")
+    parser.add_argument("--report", help="Summary report for --batch (default: <manifest>.report.json)")
+    parser.add_argument("--skip-failed", action="store_true",
+                        help="With --batch, don't retry jobs that failed in an earlier run")
+    parser.add_argument("--startup-time", action="store_true",
+                        help="Print how long the module took to import and exit (non-zero if over budget)")
+    cli_args = parser.parse_args()
+    startup_seconds = time.perf_counter() - _IMPORT_STARTED
+    if cli_args.startup_time:
+        print(f"Startup: {startup_seconds:.3f}s (budget {STARTUP_BUDGET_SECONDS:.1f}s)")
+        sys.exit(0 if startup_seconds <= STARTUP_BUDGET_SECONDS else 1)
+    if startup_seconds > STARTUP_BUDGET_SECONDS:
+        print(f"⚠️ Startup took {startup_seconds:.1f}s (budget {STARTUP_BUDGET_SECONDS:.1f}s); "
+              f"check for eager heavy imports with 'python -X importtime WordLight.py --startup-time'.")
+    DEFAULT_TRANSCRIBE_BACKEND = cli_args.transcribe_backend
+    DEFAULT_COMPUTE_TYPE = cli_args.compute_type
+    GRADIO_CONCURRENT_JOBS = max(1, cli_args.max_jobs)
+    configure_stage_limits(gpu=cli_args.gpu_slots, cpu=cli_args.cpu_slots, encode=cli_args.encode_slots)
+    BATCH_JOBS = max(1, cli_args.batch_jobs)
+
+    if cli_args.batch:
+        try:
+            failed = run_batch_manifest(cli_args.batch, max_jobs=BATCH_JOBS, state_path=cli_args.state,
+                                        report_path=cli_args.report, retry_failed=not cli_args.skip_failed)
+        finally:
+            shutdown_model_pools()
+        sys.exit(1 if failed else 0)
+
     mode = None
-    if _GRADIO_AVAILABLE:
+    gradio_installed = module_installed("gradio")
+    if gradio_installed:
         print("Select launch mode:")
         print("1) Tkinter GUI (Desktop window, recommended for advanced control)")
         print("2) Gradio Web UI (Accessible from browser, easy to share on LAN)")
@@ -1897,7 +4178,7 @@ if __name__ == "__main__":
     else:
         mode = "1"
 
-    if mode == "2" and _GRADIO_AVAILABLE:
+    if mode == "2" and gradio_installed:
         launch_gradio()
     else:
         try:
@@ -1916,42 +4197,59 @@ if __name__ == "__main__":
                 bold, italic, underline, strikeout,
                 scale_x, scale_y, spacing, angle,
                 border_style, outline, shadow, alignment,
-                marginl, marginr
+                marginl, marginr, single_pass, demucs_preset,
+                highlight_mode, burn_workers, silence_backend
             ) = select_files_and_options()
-            # Merge if needed
-            if merge_videos and len(video_files) > 1:
-                merged_filename = "merged_input.mp4"
-                merge_videos_ffmpeg(video_files, merged_filename)
-                input_video_for_main = merged_filename
-            else:
-                input_video_for_main = video_files[0]
-            
             # Set outputs_folder and output_basename explicitly
             outputs_folder = get_outputs_folder()
             output_basename = f"Processed_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            
-            main(
-                input_video_for_main, background_audio, bypass_auto, edit_transcript,
-                subtitle_font, font_size, marginv,
-                threshold, margin,
-                demucs_model, demucs_device, bgm_volume,
-                max_sentences, max_words,
-                nr_propdec, nr_stationary, nr_freqsmooth,
-                lp_cutoff,
-                use_demucs, use_noisereduce, use_lowpass, use_voicefixer,
-                vf_mode, use_deepfilternet, use_pyrnnoise,
-                primary_color_hex, highlight_color_hex,
-                video_codec, qp,
+
+            # Merge if needed; otherwise each selected video is its own job
+            if merge_videos and len(video_files) > 1:
+                merged_filename = os.path.join(outputs_folder, output_basename + "_merged.mp4")
+                merge_videos_ffmpeg(video_files, merged_filename)
+                inputs_for_main = [merged_filename]
+            else:
+                inputs_for_main = list(video_files)
+
+            job = dict(
+                background_audio=background_audio, bypass_auto=bypass_auto, edit_transcript=edit_transcript,
+                subtitle_font=subtitle_font, font_size=font_size, marginv=marginv,
+                threshold=threshold, margin=margin,
+                demucs_model=demucs_model, demucs_device=demucs_device, bgm_volume=bgm_volume,
+                enable_compand=True,  # Gradio default
+                max_sentences=max_sentences, max_words=max_words,
+                nr_propdec=nr_propdec, nr_stationary=nr_stationary, nr_freqsmooth=nr_freqsmooth,
+                lp_cutoff=lp_cutoff,
+                use_demucs=use_demucs, use_noisereduce=use_noisereduce, use_lowpass=use_lowpass, use_voicefixer=use_voicefixer,
+                vf_mode=vf_mode, use_deepfilternet=use_deepfilternet, use_pyrnnoise=use_pyrnnoise,
+                primary_color_hex=primary_color_hex, highlight_color_hex=highlight_color_hex,
+                video_codec=video_codec, qp=qp,
                 outputs_folder=outputs_folder,
-                output_basename=output_basename,
-                secondary_color=secondary_color, 
-                outline_color=outline_color, 
+                secondary_color=secondary_color,
+                outline_color=outline_color,
                 back_color=back_color,
                 bold=bold, italic=italic, underline=underline, strikeout=strikeout,
                 scale_x=scale_x, scale_y=scale_y, spacing=spacing, angle=angle,
                 border_style=border_style, outline=outline, shadow=shadow, alignment=alignment,
-                marginl=marginl, marginr=marginr
+                marginl=marginl, marginr=marginr,
+                single_pass=single_pass,
+                demucs_preset=demucs_preset,
+                highlight_mode=highlight_mode,
+                burn_workers=burn_workers,
+                silence_backend=silence_backend,
             )
+            if len(inputs_for_main) == 1:
+                main(input_video=inputs_for_main[0], output_basename=output_basename, **job)
+            else:
+                for _, output, error in run_batch([
+                    dict(job, input_video=path, output_basename=f"{output_basename}_{idx}")
+                    for idx, path in enumerate(inputs_for_main)
+                ], max_jobs=1 if edit_transcript else None):
+                    if error is not None:
+                        print("❌ Error:", error)
         except Exception as e:
             print("❌ Error:", e)
             input("Press Enter to exit.")
+        finally:
+            shutdown_model_pools()
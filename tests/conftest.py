@@ -0,0 +1,5 @@
+import os
+import sys
+
+# WordLight is a single script at the repository root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
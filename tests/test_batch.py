@@ -0,0 +1,45 @@
+import types
+
+import pytest
+
+import WordLight
+from WordLight import resolve_batch_jobs
+
+
+@pytest.fixture(autouse=True)
+def no_cuda(monkeypatch):
+    monkeypatch.setattr(WordLight, "torch", types.SimpleNamespace(cuda=types.SimpleNamespace(is_available=lambda: False)))
+
+
+def _ids(entries, tmp_path, **defaults):
+    defaults.setdefault("background_audio", "music.mp3")
+    defaults.setdefault("outputs_folder", str(tmp_path))
+    return [job_id for job_id, _ in resolve_batch_jobs(defaults, entries, str(tmp_path))]
+
+
+def test_ids_survive_reordering_and_new_entries(tmp_path):
+    a, b = _ids(["a.mp4", {"input_video": "b.mp4", "font_size": 40}], tmp_path)
+    assert _ids([{"input_video": "b.mp4", "font_size": 40}, "a.mp4"], tmp_path) == [b, a]
+    assert _ids(["new.mp4", "a.mp4", {"input_video": "b.mp4", "font_size": 40}], tmp_path)[1:] == [a, b]
+
+
+def test_identical_entries_get_distinct_ids(tmp_path):
+    first, second = _ids(["a.mp4", "a.mp4"], tmp_path)
+    assert first != second
+    assert _ids(["a.mp4", "b.mp4", "a.mp4"], tmp_path)[::2] == [first, second]
+
+
+def test_changed_settings_change_the_id(tmp_path):
+    base = _ids(["a.mp4"], tmp_path)
+    assert _ids([{"input_video": "a.mp4", "font_size": 40}], tmp_path) != base
+    assert _ids(["a.mp4"], tmp_path, background_audio="other.mp3") != base
+    assert _ids(["a.mp4"], tmp_path, font_size=40) != base
+
+
+def test_positional_output_names_do_not_affect_ids(tmp_path):
+    jobs = resolve_batch_jobs({"background_audio": "m.mp3", "outputs_folder": str(tmp_path)},
+                              ["x.mp4", "a.mp4"], str(tmp_path))
+    moved = resolve_batch_jobs({"background_audio": "m.mp3", "outputs_folder": str(tmp_path)},
+                               ["a.mp4"], str(tmp_path))
+    assert jobs[1][1]["output_basename"] != moved[0][1]["output_basename"]
+    assert jobs[1][0] == moved[0][0]
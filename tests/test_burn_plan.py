@@ -0,0 +1,43 @@
+import numpy as np
+
+from WordLight import plan_keyframe_ranges, write_ass_slice
+
+
+def _timeline(seconds=120, fps=30, gop=2.0):
+    frame_times = np.arange(int(seconds * fps)) / float(fps)
+    keyframes = [t for t in frame_times if abs(t / gop - round(t / gop)) < 1e-9]
+    return frame_times, keyframes
+
+
+def test_ranges_start_on_keyframes_and_cover_every_frame():
+    frame_times, keyframes = _timeline()
+    ranges = plan_keyframe_ranges(frame_times, keyframes, pieces=4, min_seconds=10)
+    assert len(ranges) == 4
+    assert ranges[0][0] == frame_times[0] and ranges[-1][1] is None
+    assert all(start in keyframes for start, _, _ in ranges)
+    assert [end for _, end, _ in ranges[:-1]] == [start for start, _, _ in ranges[1:]]
+    assert sum(count for _, _, count in ranges) == len(frame_times)
+    assert ranges[1][0] == 30.0  # nearest keyframe to a quarter of the way through
+
+
+def test_short_video_is_not_split():
+    frame_times, keyframes = _timeline(seconds=30)
+    assert plan_keyframe_ranges(frame_times, keyframes, pieces=4, min_seconds=20) == [(0.0, None, len(frame_times))]
+    assert plan_keyframe_ranges([], [], pieces=4) == []
+
+
+def test_ass_slice_keeps_header_and_overlapping_events(tmp_path):
+    src = tmp_path / "captions.ass"
+    src.write_text(
+        "[Events]\n"
+        "Dialogue: 0,0:00:01.00,0:00:02.00,Default,,0,0,0,,before\n"
+        "Dialogue: 0,0:00:09.50,0:00:10.50,Default,,0,0,0,,straddles\n"
+        "Dialogue: 0,0:00:12.00,0:00:13.00,Default,,0,0,0,,inside\n"
+        "Dialogue: 0,0:00:25.00,0:00:26.00,Default,,0,0,0,,after\n",
+        encoding="utf-8",
+    )
+    out = tmp_path / "slice.ass"
+    write_ass_slice(str(src), str(out), 10.0, 20.0)
+    text = out.read_text(encoding="utf-8")
+    assert text.startswith("[Events]\n")
+    assert [line.rsplit(",", 1)[1] for line in text.splitlines()[1:]] == ["straddles", "inside"]
@@ -0,0 +1,76 @@
+import io
+import re
+
+from WordLight import (
+    MIN_WORD_DURATION, group_caption_segments, write_inline_highlight_events, write_layered_highlight_events,
+)
+
+
+def _words(*specs):
+    return [{"start": s, "end": e, "word": w} for w, s, e in specs]
+
+
+def test_segments_split_on_word_count():
+    words = _words(*[(f"w{i}", i * 0.3, i * 0.3 + 0.25) for i in range(7)])
+    segments = group_caption_segments(words, max_sentences=5, max_words=3)
+    assert [len(seg) for seg in segments] == [3, 3, 1]
+    assert [w for seg in segments for w in seg] == words
+
+
+def test_segments_split_on_sentence_end_and_long_pause():
+    words = _words(("Hi.", 0.0, 0.3), ("there", 0.4, 0.6), ("again", 3.0, 3.4), ("friend", 3.5, 3.9))
+    segments = group_caption_segments(words, max_sentences=1, max_words=10, max_gap=1.5)
+    assert [[w["word"] for w in seg] for seg in segments] == [["Hi."], ["there"], ["again", "friend"]]
+
+
+def test_layered_events_splice_each_word_into_the_line():
+    seg = _words(("Hello", 1.0, 1.5), ("big", 1.5, 1.55), ("world.", 2.0, 2.4))
+    out = io.StringIO()
+    write_layered_highlight_events(out, seg)
+    lines = out.getvalue().splitlines()
+    assert lines[0] == "Dialogue: 0,0:00:01.00,0:00:02.40,Default,,0,0,0,,Hello big world."
+    assert lines[1].endswith(",,{\\rHighlight}Hello{\\r} big world.")
+    assert lines[2].endswith(",,Hello {\\rHighlight}big{\\r} world.")
+    assert lines[3].endswith(",,Hello big {\\rHighlight}world.{\\r}")
+    # A too-short word is stretched to MIN_WORD_DURATION
+    assert lines[2].startswith(f"Dialogue: 1,0:00:01.50,0:00:01.{int(round((0.5 + MIN_WORD_DURATION) * 100)):02d},")
+
+
+def _dialogue_times(line):
+    start, end = line.split(",")[1:3]
+    return _seconds(start), _seconds(end)
+
+
+def _seconds(stamp):
+    h, m, s = stamp.split(":")
+    return int(h) * 3600 + int(m) * 60 + float(s)
+
+
+def test_inline_events_highlight_the_same_windows_as_layers():
+    seg = _words(("Hello", 1.0, 1.5), ("big", 1.5, 1.55), ("world.", 2.0, 2.4))
+    layered, inline = io.StringIO(), io.StringIO()
+    write_layered_highlight_events(layered, seg)
+    write_inline_highlight_events(inline, seg, "&H00FFFFFF&", "&H0000FFFF&")
+
+    layered_lines = layered.getvalue().splitlines()
+    inline_lines = inline.getvalue().splitlines()
+    assert len(inline_lines) == 1
+    assert _dialogue_times(inline_lines[0]) == _dialogue_times(layered_lines[0])
+
+    event_start = _dialogue_times(inline_lines[0])[0]
+    switches = [int(ms) for ms in re.findall(r"\\t\((\d+),\d+,", inline_lines[0])]
+    windows = [(event_start + on / 1000.0, event_start + off / 1000.0)
+               for on, off in zip(switches[::2], switches[1::2])]
+    expected = [_dialogue_times(line) for line in layered_lines[1:]]
+    assert len(windows) == len(expected)
+    for (on, off), (start, end) in zip(windows, expected):
+        assert abs(on - start) < 0.011 and abs(off - end) < 0.011
+
+
+def test_inline_events_reset_colour_per_word():
+    seg = _words(("a", 0.0, 0.5), ("b", 0.5, 1.0))
+    out = io.StringIO()
+    write_inline_highlight_events(out, seg, "&H00FFFFFF&", "&H0000FFFF&")
+    text = out.getvalue().strip().split(",", 9)[9]
+    assert text == ("{\\t(0,1,\\1c&H00FFFF&)\\t(500,501,\\1c&HFFFFFF&)}a "
+                    "{\\1c&HFFFFFF&\\t(500,501,\\1c&H00FFFF&)\\t(1000,1001,\\1c&HFFFFFF&)}b")
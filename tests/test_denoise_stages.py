@@ -0,0 +1,26 @@
+import numpy as np
+import soundfile as sf
+
+import WordLight
+
+
+class _FakeVoiceFixerModule:
+    modes = []
+
+    def _load(self):
+        return self
+
+    class VoiceFixer:
+        def restore_inmem(self, audio, cuda, mode):
+            _FakeVoiceFixerModule.modes.append(mode)
+            return audio[None, :]
+
+
+def test_run_voicefixer_passes_the_numeric_mode(tmp_path, monkeypatch):
+    monkeypatch.setattr(WordLight, "voicefixer_lib", _FakeVoiceFixerModule())
+    src, dst = str(tmp_path / "in.wav"), str(tmp_path / "out.wav")
+    sf.write(src, np.zeros((4410, 2), dtype=np.float32), 44100)
+    WordLight.run_voicefixer(src, dst, mode="1")
+    assert _FakeVoiceFixerModule.modes == [1]
+    data, rate = sf.read(dst)
+    assert rate == WordLight.VOICEFIXER_SR and data.shape == (4410,)
@@ -0,0 +1,66 @@
+import numpy as np
+
+import WordLight
+from WordLight import (lease_dfn_process_pool, overlap_add_chunks, plan_overlapping_chunks,
+                       shutdown_dfn_process_pools)
+
+
+def test_plan_covers_timeline_with_fixed_overlap():
+    plan = plan_overlapping_chunks(1000, 300, 50)
+    assert plan[0][0] == 0 and plan[-1][1] == 1000
+    for (s0, e0), (s1, e1) in zip(plan, plan[1:]):
+        assert e0 - s1 == 50
+        assert e0 - s0 == 300
+
+
+def test_plan_edge_cases():
+    assert plan_overlapping_chunks(0, 300, 50) == []
+    assert plan_overlapping_chunks(100, 300, 50) == [(0, 100)]
+    # An overlap as large as the chunk is clamped so the plan still advances
+    assert plan_overlapping_chunks(10, 4, 10) == [(0, 4), (1, 5), (2, 6), (3, 7), (4, 8), (5, 9), (6, 10)]
+
+
+def test_identity_chunks_stitch_back_to_the_input():
+    rng = np.random.default_rng(0)
+    audio = rng.standard_normal((48000, 2)).astype(np.float32)
+    plan = plan_overlapping_chunks(len(audio), 10000, 1500)
+    stitched = np.concatenate(list(overlap_add_chunks((s, audio[s:e]) for s, e in plan)))
+    assert stitched.shape == audio.shape
+    np.testing.assert_allclose(stitched, audio, atol=1e-6)
+
+
+def test_overlap_is_crossfaded():
+    ones = np.ones((8, 1), dtype=np.float32)
+    zeros = np.zeros((8, 1), dtype=np.float32)
+    out = np.concatenate(list(overlap_add_chunks([(0, ones), (4, zeros)])))
+    assert len(out) == 12
+    assert out[0, 0] == 1.0 and out[-1, 0] == 0.0
+    # Monotonic ramp from the first block into the second
+    assert np.all(np.diff(out[:, 0]) <= 0)
+
+
+
+class _FakeExecutor:
+    def __init__(self, max_workers, initializer, initargs):
+        self.layout = (max_workers,) + initargs
+        self.stopped = False
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.stopped = True
+
+
+def test_switching_dfn_layout_waits_for_jobs_using_the_old_pool(monkeypatch):
+    monkeypatch.setattr(WordLight, "ProcessPoolExecutor", _FakeExecutor)
+    try:
+        with lease_dfn_process_pool(2, 1) as old:
+            with lease_dfn_process_pool(3, 1) as new:
+                assert new is not old and not old.stopped
+            assert not old.stopped
+        assert old.stopped and not new.stopped
+        with lease_dfn_process_pool(3, 1) as again:
+            assert again is new
+            shutdown_dfn_process_pools()
+            assert not new.stopped
+        assert new.stopped
+    finally:
+        shutdown_dfn_process_pools()
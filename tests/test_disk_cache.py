@@ -0,0 +1,62 @@
+import os
+
+import pytest
+
+import WordLight
+from WordLight import DiskCache
+
+
+@pytest.fixture
+def make_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(WordLight, "get_cache_folder", lambda name: str(tmp_path))
+    return lambda max_mb, **kwargs: DiskCache("TestCache", "test", max_mb, ".json",
+                                              WordLight._read_json, WordLight._write_json, **kwargs)
+
+
+def _age(tmp_path, key, seconds_ago):
+    path = str(tmp_path / (key + ".json"))
+    mtime = os.path.getmtime(path) - seconds_ago
+    os.utime(path, (mtime, mtime))
+
+
+def test_round_trip_and_miss(make_cache):
+    cache = make_cache(1)
+    assert cache.load("missing") is None
+    cache.store("k", {"words": [1, 2, 3]})
+    assert cache.load("k") == {"words": [1, 2, 3]}
+
+
+def test_least_recently_used_entries_go_first(make_cache, tmp_path):
+    cache = make_cache(4 / 1024)  # 4 KB quota, 2 KB per entry
+    entry = "x" * 1500
+    cache.store("old", entry)
+    cache.store("used", entry)
+    _age(tmp_path, "old", 20)
+    _age(tmp_path, "used", 10)
+    assert cache.load("used") == entry  # a hit makes it the most recent
+    cache.store("new", entry)
+    assert cache.load("old") is None
+    assert cache.load("used") == entry and cache.load("new") == entry
+
+
+def test_entry_larger_than_the_quota_is_not_stored(make_cache, tmp_path):
+    cache = make_cache(4 / 1024)
+    cache.store("small", "x" * 100)
+    cache.store("huge", "x" * 8000)
+    assert cache.load("huge") is None
+    assert cache.load("small") == "x" * 100
+    assert sorted(os.listdir(tmp_path)) == ["small.json"]
+
+
+def test_size_estimate_skips_the_write(make_cache, tmp_path):
+    written = []
+    cache = make_cache(1, estimate_size=lambda value: 10 * 1024 * 1024)
+    cache.writer = lambda f, value: written.append(value)
+    cache.store("k", "value")
+    assert written == [] and os.listdir(tmp_path) == []
+
+
+def test_disabled_cache_does_nothing(make_cache, tmp_path):
+    cache = make_cache(0)
+    cache.store("k", "value")
+    assert cache.load("k") is None and os.listdir(tmp_path) == []
@@ -0,0 +1,97 @@
+import threading
+import time
+
+from WordLight import ModelPool
+
+
+class _Loader:
+    def __init__(self, delay=0.0):
+        self.loads = []
+        self.delay = delay
+
+    def __call__(self, key):
+        def load():
+            time.sleep(self.delay)
+            self.loads.append(key)
+            return object()
+        return load
+
+
+def test_lease_reuses_the_warm_model():
+    pool, loader = ModelPool("TestPool"), _Loader()
+    with pool.lease("a", loader("a")) as first:
+        pass
+    with pool.lease("a", loader("a")) as second:
+        assert second is first
+    assert loader.loads == ["a"]
+
+
+def test_concurrent_leases_share_one_load():
+    pool, loader = ModelPool("TestPool"), _Loader(delay=0.1)
+    models = []
+
+    def use():
+        with pool.lease("a", loader("a")) as model:
+            models.append(model)
+
+    threads = [threading.Thread(target=use) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert loader.loads == ["a"]
+    assert all(model is models[0] for model in models)
+
+
+def test_evicting_a_leased_model_waits_for_its_release():
+    pool, loader = ModelPool("TestPool", max_models=2), _Loader()
+    with pool.lease("a", loader("a")) as model:
+        pool.clear()
+        with pool.lease("a", loader("a")) as again:
+            assert again is model
+    with pool.lease("a", loader("a")):
+        pass
+    assert loader.loads == ["a", "a"]
+
+
+def test_least_recently_used_idle_model_is_unloaded():
+    pool, loader = ModelPool("TestPool", max_models=2), _Loader()
+    for key in ("a", "b", "a", "c"):
+        with pool.lease(key, loader(key)):
+            pass
+    for key in ("a", "c"):
+        with pool.lease(key, loader(key)):
+            pass
+    assert loader.loads == ["a", "b", "c"]  # b was the LRU entry when c arrived
+    with pool.lease("b", loader("b")):
+        pass
+    assert loader.loads == ["a", "b", "c", "b"]
+
+
+def test_leased_model_is_not_unloaded_to_make_room():
+    pool, loader = ModelPool("TestPool", max_models=1), _Loader()
+    with pool.lease("a", loader("a")) as a:
+        with pool.lease("b", loader("b")):
+            with pool.lease("a", loader("a")) as again:
+                assert again is a
+    assert loader.loads == ["a", "b"]
+    with pool.lease("a", loader("a")):
+        pass  # a was leased last, so b went once both were released
+    with pool.lease("b", loader("b")):
+        pass
+    assert loader.loads == ["a", "b", "b"]
+
+
+def test_idle_models_are_unloaded_after_the_timeout():
+    pool, loader = ModelPool("TestPool", max_models=4, idle_timeout=0.05), _Loader()
+    with pool.lease("a", loader("a")):
+        time.sleep(0.1)  # a lease in progress is never idle
+    with pool.lease("b", loader("b")):
+        pass
+    with pool.lease("a", loader("a")):
+        pass
+    assert loader.loads == ["a", "b"]
+    time.sleep(0.1)
+    with pool.lease("b", loader("b")):
+        pass
+    assert loader.loads == ["a", "b", "b"]
@@ -0,0 +1,59 @@
+import os
+
+import WordLight
+from WordLight import (JobManifest, claim_resumable_workspace, file_fingerprint, release_resumable_workspace,
+                       resume_key)
+
+
+def test_fingerprint_follows_content_not_location(tmp_path):
+    data = os.urandom(3 * 1024 * 1024)
+    original, copy = tmp_path / "a.mp4", tmp_path / "upload_1234.mp4"
+    original.write_bytes(data)
+    copy.write_bytes(data)
+    assert file_fingerprint(str(original)) == file_fingerprint(str(copy))
+    copy.write_bytes(data[:-1] + bytes([data[-1] ^ 1]))
+    assert file_fingerprint(str(original)) != file_fingerprint(str(copy))
+
+
+def test_a_copy_of_the_input_claims_the_same_workspace(tmp_path, monkeypatch):
+    monkeypatch.setattr(WordLight, "get_cache_folder", lambda name: str(tmp_path / "Cache" / name))
+    os.makedirs(tmp_path / "Cache" / "jobs")
+    first, second = tmp_path / "first.mp4", tmp_path / "second.mp4"
+    first.write_bytes(b"video" * 1000)
+    second.write_bytes(b"video" * 1000)
+    work_dir, lock = claim_resumable_workspace(str(first))
+    release_resumable_workspace(work_dir, lock, keep=True)
+    again, lock = claim_resumable_workspace(str(second))
+    assert again == work_dir
+    release_resumable_workspace(again, lock, keep=False)
+    assert not os.path.exists(work_dir)
+
+
+def test_manifest_reuses_only_matching_keys_with_artifacts(tmp_path):
+    manifest = JobManifest(str(tmp_path))
+    words = tmp_path / "words.json"
+    words.write_text("[]", encoding="utf-8")
+    manifest.record("transcribe", "key-1", [str(words)], model="large-v2")
+
+    reloaded = JobManifest(str(tmp_path))
+    assert reloaded.completed("transcribe", "key-1")
+    assert reloaded.data("transcribe") == {"model": "large-v2"}
+    assert not reloaded.completed("transcribe", "key-2")  # settings changed since
+    assert not reloaded.completed("denoise", "key-1")
+
+    words.unlink()
+    assert reloaded.lookup("transcribe", "key-1") is None
+
+
+def test_stage_keys_chain_through_their_parents():
+    denoise = resume_key("denoise", "input", stages=[["lowpass", {"cutoff_hz": 8000}, "1"]])
+    cut = resume_key("cut", denoise, threshold=0.04)
+    other = resume_key("denoise", "input", stages=[["lowpass", {"cutoff_hz": 6000}, "1"]])
+    assert resume_key("cut", denoise, threshold=0.04) == cut
+    assert resume_key("cut", other, threshold=0.04) != cut
+    assert resume_key("cut", denoise, threshold=0.05) != cut
+
+
+def test_unreadable_manifest_starts_fresh(tmp_path):
+    (tmp_path / "manifest.json").write_text("{not json", encoding="utf-8")
+    assert JobManifest(str(tmp_path)).lookup("denoise", "key") is None
@@ -0,0 +1,40 @@
+import pytest
+
+from WordLight import TimelineMap, retime_words
+
+KEEP = [(1.0, 3.0), (5.0, 6.0), (8.0, 10.0)]
+
+
+def test_timeline_maps_source_to_output_and_back():
+    timeline = TimelineMap(KEEP)
+    assert timeline.locate(0.5) is None and timeline.locate(4.0) is None
+    assert timeline.locate(5.5) == 1
+    assert timeline.to_output(1.0) == 0.0
+    assert timeline.to_output(5.5) == pytest.approx(2.5)
+    assert timeline.to_output(9.0) == pytest.approx(4.0)
+    assert timeline.to_output(7.0) is None
+    for t in (0.0, 1.25, 2.5, 3.9, 4.5):
+        assert timeline.to_output(timeline.to_source(t)) == pytest.approx(t)
+
+
+def test_timeline_gap_and_empty_map():
+    timeline = TimelineMap(KEEP, gap=0.5)
+    assert timeline.to_output(5.0) == pytest.approx(2.5)
+    assert timeline.to_source(2.2) == pytest.approx(3.0)  # inside the gap: end of the previous piece
+    assert TimelineMap([]).to_source(1.5) == 1.5
+
+
+def test_words_follow_their_midpoint_and_are_clamped():
+    words = [
+        {"start": 1.2, "end": 1.6, "word": "kept"},
+        {"start": 2.8, "end": 3.6, "word": "tail"},      # midpoint 3.2 falls in the cut
+        {"start": 4.8, "end": 5.4, "word": "straddle"},  # midpoint 5.1: starts before the piece
+        {"start": 6.5, "end": 7.5, "word": "gone"},
+        {"start": 9.5, "end": 10.4, "word": "end"},
+    ]
+    retimed = retime_words(words, KEEP)
+    assert [w["word"] for w in retimed] == ["kept", "straddle", "end"]
+    assert retimed[0]["start"] == pytest.approx(0.2) and retimed[0]["end"] == pytest.approx(0.6)
+    assert retimed[1]["start"] == pytest.approx(2.0) and retimed[1]["end"] == pytest.approx(2.4)
+    assert retimed[2]["start"] == pytest.approx(4.5) and retimed[2]["end"] == pytest.approx(5.0)
+    assert words[0]["start"] == 1.2  # input left untouched
@@ -0,0 +1,87 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+import WordLight
+from WordLight import configure_stage_limits, stage_slot
+
+
+@pytest.fixture
+def encode_limit():
+    saved = dict(WordLight.STAGE_LIMITS)
+    yield lambda n: configure_stage_limits(encode=n)
+    configure_stage_limits(**saved)
+
+
+def test_multi_slot_claim_is_capped_at_the_limit(encode_limit):
+    encode_limit(2)
+    with stage_slot("encode", 8):
+        assert WordLight._STAGE_IN_USE["encode"] == 2
+    assert WordLight._STAGE_IN_USE["encode"] == 0
+
+
+def test_multi_slot_claim_waits_for_all_slots(encode_limit):
+    encode_limit(2)
+    entered = threading.Event()
+
+    def wide():
+        with stage_slot("encode", 2):
+            entered.set()
+
+    with stage_slot("encode"):
+        worker = threading.Thread(target=wide)
+        worker.start()
+        assert not entered.wait(0.2)
+    worker.join(2)
+    assert entered.is_set()
+
+
+def test_parallel_burn_runs_pieces_concurrently_with_one_encode_slot(encode_limit, tmp_path, monkeypatch):
+    encode_limit(1)
+    fps, seconds = 30, 120
+    frame_times = np.arange(seconds * fps) / float(fps)
+    keyframes = list(frame_times[::fps * 2])
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def fake_piece(input_video, ass_path, piece_path, start, frame_count, video_codec, qp):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.1)
+        with lock:
+            running[0] -= 1
+        return frame_count
+
+    monkeypatch.setattr(WordLight, "list_video_packets", lambda path: (frame_times, keyframes))
+    monkeypatch.setattr(WordLight, "_burn_piece", fake_piece)
+    monkeypatch.setattr(WordLight.subprocess, "run", lambda *a, **k: None)
+    ass = tmp_path / "captions.ass"
+    ass.write_text("[Events]\n", encoding="utf-8")
+
+    WordLight.burn_subtitles_parallel("in.mp4", str(ass), str(tmp_path / "out.mp4"), workers=4)
+    assert peak[0] == 4
+    assert WordLight._STAGE_IN_USE["encode"] == 0
+
+
+def test_batch_with_transcript_editing_runs_one_video_at_a_time(monkeypatch):
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def fake_main(**job):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        return job["input_video"]
+
+    monkeypatch.setattr(WordLight, "main", fake_main)
+    jobs = [{"input_video": f"{i}.mp4", "edit_transcript": i == 2} for i in range(4)]
+    results = WordLight.run_batch(jobs, max_jobs=3)
+    assert peak[0] == 1
+    assert [output for _, output, _ in results] == ["0.mp4", "1.mp4", "2.mp4", "3.mp4"]
+    peak[0] = 0
+    WordLight.run_batch([dict(job, edit_transcript=False) for job in jobs], max_jobs=3)
+    assert peak[0] == 3
@@ -0,0 +1,41 @@
+import numpy as np
+
+from WordLight import SILENCE_MINCLIP_FRAMES, SILENCE_MINCUT_FRAMES, detect_keep_intervals
+
+SR = 1000
+FPS = 10  # 100 samples per analysis frame
+
+
+def _audio(loud_frames, total_frames, level=1.0):
+    """Mono buffer whose listed frames peak at `level` and are silent elsewhere."""
+    audio = np.zeros(total_frames * SR // FPS, dtype=np.float32)
+    for frame in loud_frames:
+        audio[frame * SR // FPS] = level
+    return audio
+
+
+def test_loud_run_is_kept_and_widened_by_margin():
+    audio = _audio(range(20, 40), 100)
+    assert detect_keep_intervals(audio, SR, 0.5, 0.5, FPS) == [(1.5, 4.5)]
+
+
+def test_clips_shorter_than_minclip_are_dropped():
+    blip = range(50, 50 + SILENCE_MINCLIP_FRAMES - 1)
+    audio = _audio(list(range(10, 20)) + list(blip), 100)
+    assert detect_keep_intervals(audio, SR, 0.5, 0.0, FPS) == [(1.0, 2.0)]
+
+
+def test_cuts_shorter_than_mincut_are_bridged():
+    gap = SILENCE_MINCUT_FRAMES - 1
+    audio = _audio(list(range(10, 20)) + list(range(20 + gap, 30 + gap)), 100)
+    assert detect_keep_intervals(audio, SR, 0.5, 0.0, FPS) == [(1.0, (30 + gap) / FPS)]
+    longer = SILENCE_MINCUT_FRAMES + 2
+    audio = _audio(list(range(10, 20)) + list(range(20 + longer, 30 + longer)), 100)
+    assert len(detect_keep_intervals(audio, SR, 0.5, 0.0, FPS)) == 2
+
+
+def test_threshold_is_relative_to_the_loudest_frame_and_silence_keeps_nothing():
+    audio = _audio(range(10, 20), 50, level=0.01)
+    assert detect_keep_intervals(audio, SR, 0.5, 0.0, FPS) == [(1.0, 2.0)]
+    assert detect_keep_intervals(np.zeros(5000, dtype=np.float32), SR, 0.5, 0.0, FPS) == []
+    assert all(isinstance(t, float) for r in detect_keep_intervals(audio, SR, 0.5, 0.0, FPS) for t in r)
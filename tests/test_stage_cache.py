@@ -0,0 +1,122 @@
+import numpy as np
+import soundfile as sf
+
+import WordLight
+from WordLight import AudioStage, DiskCache, run_audio_stages, stage_cache_keys
+
+
+def _noop(audio, sr, **params):
+    return audio, sr
+
+
+def _stages(cutoff=8000, workers=1):
+    return [
+        AudioStage("deepfilternet", _noop, {"workers": workers, "threads_per_worker": 0}, False,
+                   "0.5.6", ("workers", "threads_per_worker")),
+        AudioStage("lowpass", _noop, {"cutoff_hz": cutoff}, False, "1.15"),
+    ]
+
+
+def test_keys_are_stable_and_chained():
+    audio = np.zeros(480, dtype=np.float32)
+    keys = stage_cache_keys(audio, 48000, _stages())
+    assert keys == stage_cache_keys(audio.copy(), 48000, _stages())
+    assert len(keys) == 2 and keys[0] != keys[1]
+
+
+def test_changing_a_later_stage_keeps_the_earlier_prefix():
+    audio = np.zeros(480, dtype=np.float32)
+    a = stage_cache_keys(audio, 48000, _stages(cutoff=8000))
+    b = stage_cache_keys(audio, 48000, _stages(cutoff=6000))
+    assert a[0] == b[0]
+    assert a[1] != b[1]
+
+
+def test_runtime_params_do_not_change_keys():
+    audio = np.zeros(480, dtype=np.float32)
+    assert stage_cache_keys(audio, 48000, _stages(workers=1)) == stage_cache_keys(audio, 48000, _stages(workers=4))
+
+
+def test_input_audio_and_rate_change_every_key():
+    audio = np.zeros(480, dtype=np.float32)
+    base = stage_cache_keys(audio, 48000, _stages())
+    louder = audio.copy()
+    louder[0] = 0.5
+    for other in (stage_cache_keys(louder, 48000, _stages()), stage_cache_keys(audio, 44100, _stages())):
+        assert all(x != y for x, y in zip(base, other))
+
+
+def _flac_cache(tmp_path, monkeypatch, max_mb):
+    monkeypatch.setattr(WordLight, "get_cache_folder", lambda name: str(tmp_path))
+    return DiskCache("StageCache", "stages", max_mb, ".flac", WordLight._read_stage_artifact,
+                     WordLight._write_stage_artifact, estimate_size=WordLight._estimate_stage_artifact_size)
+
+
+def test_stage_artifact_round_trips_loud_audio(tmp_path, monkeypatch):
+    cache = _flac_cache(tmp_path, monkeypatch, max_mb=16)
+    audio = np.random.default_rng(0).normal(0, 0.8, (4800, 2)).astype(np.float32)
+    cache.store("k", (audio, 48000))
+    got, sr = cache.load("k")
+    assert sr == 48000 and got.shape == audio.shape
+    assert np.abs(got - audio).max() < np.abs(audio).max() * 2 ** -22
+
+
+def test_only_cacheable_stages_are_stored_and_reused(tmp_path, monkeypatch):
+    cache = _flac_cache(tmp_path, monkeypatch, max_mb=16)
+    calls = []
+
+    def stage(name, cacheable):
+        def run(audio, sr, **params):
+            calls.append(name)
+            return audio * 0.5, sr
+        return AudioStage(name, run, {}, True, "1", cacheable=cacheable)
+
+    stages = [stage("demucs", True), stage("lowpass", False)]
+    audio = np.full(4800, 0.5, dtype=np.float32)
+    first, _ = run_audio_stages(audio, 48000, stages, cache=cache)
+    assert len(list(tmp_path.glob("*.flac"))) == 1
+    again, _ = run_audio_stages(audio, 48000, stages, cache=cache)
+    assert calls == ["demucs", "lowpass", "lowpass"]
+    assert np.allclose(first, again, atol=1e-6)
+
+
+def test_entries_over_the_per_entry_limit_are_not_written(tmp_path, monkeypatch):
+    cache = _flac_cache(tmp_path, monkeypatch, max_mb=1)
+    big = np.zeros(1024 * 1024, dtype=np.float32)  # estimated at 1.5 MB, over half the quota
+    cache.store("big", (big, 48000))
+    assert list(tmp_path.iterdir()) == []
+    cache.store("small", (big[:1000], 48000))
+    assert cache.load("small") is not None
+
+
+def test_long_audio_streams_through_file_stages(tmp_path, monkeypatch):
+    monkeypatch.setattr(WordLight, "STREAM_STAGE_MIN_SECONDS", 0.05)
+    seen = []
+
+    def in_memory(audio, sr, **params):
+        seen.append("memory")
+        return audio * 0.5, sr
+
+    def on_disk(input_wav, output_wav, **params):
+        seen.append("file")
+        data, sr = sf.read(input_wav, dtype="float32")
+        sf.write(output_wav, data * 0.5, sr, subtype="FLOAT")
+        return True
+
+    stages = [AudioStage("deepfilternet", in_memory, {}, False, "1", file_func=on_disk),
+              AudioStage("lowpass", _noop, {}, False, "1")]
+    audio = np.full((4800, 2), 0.5, dtype=np.float32)
+    out, sr = run_audio_stages(audio, 48000, stages, cache=None, work_dir=str(tmp_path))
+    assert seen == ["file"] and sr == 48000
+    assert np.allclose(out, 0.25)
+    assert list(tmp_path.iterdir()) == []  # streamed intermediates are cleaned up
+
+    short, _ = run_audio_stages(audio[:100], 48000, stages, cache=None, work_dir=str(tmp_path))
+    assert seen == ["file", "memory"] and np.allclose(short, 0.25)
+
+
+def test_wav_path_hashes_like_its_samples(tmp_path):
+    for audio in (np.linspace(-1, 1, 3000, dtype=np.float32), np.ones((3000, 2), dtype=np.float32) * 0.25):
+        path = str(tmp_path / "audio.wav")
+        sf.write(path, audio, 48000, subtype="FLOAT")
+        assert WordLight.hash_audio(path) == WordLight.hash_audio(audio)